@@ -1,6 +1,105 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Body, HTTPException
+from app.services.job_service import (
+    job_manager, JOB_DEFAULT_CONCURRENCY, JOB_MAX_CONCURRENCY, JOB_MAX_INPUTS
+)
 
 router = APIRouter()
 
-# This is a placeholder for future V1 endpoints.
-# The main logic is currently in the root router for simplicity.
+# Results per page when the client doesn't say
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 10000
+
+
+def _require_jobs():
+    if not job_manager.enabled:
+        raise HTTPException(status_code=503, detail="Job store unavailable")
+
+
+def _found(job):
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# --- JOBS ---
+
+@router.post("/jobs", status_code=202)
+async def submit_job(payload: dict = Body(...)):
+    """
+    Background Batch Job.
+    Body: {"inputs": [...], "deep_search": bool, "timeout_ms": 800, "concurrency": 8}.
+    Returns the job (with its "job_id") at once; poll GET /v1/jobs/{job_id}.
+    """
+    _require_jobs()
+    inputs = payload.get("inputs")
+    deep_search = bool(payload.get("deep_search", False))
+    timeout_ms = payload.get("timeout_ms")
+    concurrency = payload.get("concurrency", JOB_DEFAULT_CONCURRENCY)
+
+    if not isinstance(inputs, list) or not inputs:
+        raise HTTPException(status_code=400, detail="Inputs must be a non-empty list")
+    if len(inputs) > JOB_MAX_INPUTS:
+        raise HTTPException(status_code=413, detail=f"Job limit is {JOB_MAX_INPUTS} inputs")
+    if not all(isinstance(i, str) for i in inputs):
+        raise HTTPException(status_code=400, detail="Inputs must be strings")
+    if timeout_ms is not None and (isinstance(timeout_ms, bool) or not isinstance(timeout_ms, (int, float))
+                                   or timeout_ms <= 0):
+        raise HTTPException(status_code=400, detail="timeout_ms must be a positive number")
+    if isinstance(concurrency, bool) or not isinstance(concurrency, int) or not 1 <= concurrency <= JOB_MAX_CONCURRENCY:
+        raise HTTPException(status_code=400, detail=f"concurrency must be between 1 and {JOB_MAX_CONCURRENCY}")
+
+    return await job_manager.submit(inputs, deep_search, timeout_ms, concurrency)
+
+
+@router.get("/jobs")
+async def list_jobs(limit: int = 100):
+    """ Jobs, oldest first """
+    _require_jobs()
+    return {"jobs": await job_manager.list(limit=max(1, min(limit, 1000))), **job_manager.stats()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """ Job state and progress (done / total) """
+    _require_jobs()
+    return _found(await job_manager.get(job_id))
+
+
+@router.get("/jobs/{job_id}/results")
+async def job_results(job_id: str, offset: int = 0, limit: int = DEFAULT_PAGE_SIZE):
+    """ One page of finished results in input order; follow "next_offset" until it is null """
+    _require_jobs()
+    _found(await job_manager.get(job_id))
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"offset must be >= 0 and limit 1-{MAX_PAGE_SIZE}")
+    return await job_manager.results(job_id, offset, limit)
+
+
+@router.post("/jobs/{job_id}/pause")
+async def pause_job(job_id: str):
+    """ Stops taking new items; in-flight ones finish and are kept """
+    _require_jobs()
+    return _found(await job_manager.pause(job_id))
+
+
+@router.post("/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
+    """ Puts a paused job back in the queue; it continues from its first unfinished item """
+    _require_jobs()
+    return _found(await job_manager.resume(job_id))
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """ Stops the job for good; finished results stay readable """
+    _require_jobs()
+    return _found(await job_manager.cancel(job_id))
+
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """ Cancels the job if needed and deletes it with its results """
+    _require_jobs()
+    if not await job_manager.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"status": "deleted", "job_id": job_id}
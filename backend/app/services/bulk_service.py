@@ -0,0 +1,122 @@
+import asyncio
+import csv
+import json
+import logging
+from collections import deque
+from typing import AsyncIterator, Dict, Any, Optional
+from starlette.responses import StreamingResponse
+
+logger = logging.getLogger("BulkService")
+
+# Analyses in flight per stream. Input is only read as fast as results are consumed,
+# so memory stays bounded by this window no matter how large the upload is.
+STREAM_WINDOW = 32
+
+# Guard against a "line" that never ends (binary upload, missing newlines)
+MAX_LINE_BYTES = 64 * 1024
+
+# CSV header names we accept for the number column
+CSV_INPUT_COLUMNS = ("input", "phone", "number", "msisdn", "mobile")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for bodies generated while the request is still uploading.
+    The stock class listens for disconnects on `receive` in parallel, which races
+    request.stream() for body chunks; here the body reader itself sees the disconnect.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """ Re-chunks a byte stream into decoded text lines (without the newline) """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line exceeds {MAX_LINE_BYTES} bytes")
+    if buffer.strip():
+        yield buffer.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+async def iter_rows(lines: AsyncIterator[str], fmt: str = "ndjson") -> AsyncIterator[Dict[str, Any]]:
+    """
+    Turns NDJSON or CSV lines into {"line": n, "input": str} rows.
+    Rows that cannot be parsed carry an "error" instead of an input.
+    """
+    column = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "csv":
+            cells = next(csv.reader([line]), [])
+            if column is None:
+                # First row decides the column: a known header name, else the first cell
+                header = [c.strip().lower() for c in cells]
+                column = next((header.index(n) for n in CSV_INPUT_COLUMNS if n in header), None)
+                if column is not None:
+                    continue
+                column = 0
+            value = cells[column].strip() if column < len(cells) else ""
+            yield {"line": line_no, "input": value}
+            continue
+
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            yield {"line": line_no, "input": None, "error": "Invalid JSON"}
+            continue
+        value = obj.get("input") if isinstance(obj, dict) else obj
+        yield {"line": line_no, "input": value if isinstance(value, str) else None}
+
+
+async def stream_analyze(engine, rows: AsyncIterator[Dict[str, Any]], deep_search: bool = False,
+                         window: int = STREAM_WINDOW) -> AsyncIterator[bytes]:
+    """
+    Runs each row through ScoringEngine.analyze and yields NDJSON result lines in input order.
+    At most `window` rows are in flight; the next row is only pulled once the oldest is emitted.
+    """
+    async def run(row: Dict[str, Any]) -> Dict[str, Any]:
+        phone: Optional[str] = row.get("input")
+        if row.get("error") or not phone:
+            return {"success": False, "message": row.get("error", "Input is required"), "confidence": 0.0}
+        try:
+            return await engine.analyze(phone, deep_search)
+        except Exception as e:
+            logger.error(f"Stream row {row['line']} failed: {e}")
+            return {"success": False, "message": str(e), "confidence": 0.0}
+
+    def encode(row, result) -> bytes:
+        return (json.dumps({"line": row["line"], "input": row.get("input"), **result}) + "\n").encode()
+
+    pending = deque()
+    try:
+        async for row in rows:
+            pending.append((row, asyncio.ensure_future(run(row))))
+            if len(pending) >= window:
+                row, task = pending.popleft()
+                yield encode(row, await task)
+
+        while pending:
+            row, task = pending.popleft()
+            yield encode(row, await task)
+
+    except ValueError as e:
+        # Malformed upload: report it in-band, the status line is already sent
+        yield (json.dumps({"success": False, "message": str(e)}) + "\n").encode()
+
+    finally:
+        # Client went away mid-stream: don't leave orphaned lookups running
+        for _, task in pending:
+            task.cancel()
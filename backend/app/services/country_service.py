@@ -1,17 +1,88 @@
 import phonenumbers
-from phonenumbers import geocoder, carrier, timezone
-import requests
+from phonenumbers import PhoneNumberType
 import re
 import logging
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+from core.indian_series import get_circle_from_series
+from core.series_store import series_store
+from core.geo_tables import load_geo_tables
+from core.metrics import STAGE_SECONDS
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_NON_DIGITS = re.compile(r'[^0-9]')
+# Only an optional "+", digits and separators: parses to the same number as "+<digits>"
+_SIMPLE_INPUT = re.compile(r'^\s*\+?[0-9][0-9\s\-().]*$')
+
+# Display names for phonenumbers.PhoneNumberType; anything else is reported as "Fixed Line"
+LINE_TYPES = {
+    PhoneNumberType.MOBILE: "Mobile",
+    PhoneNumberType.FIXED_LINE: "Fixed Line",
+    PhoneNumberType.FIXED_LINE_OR_MOBILE: "Fixed Line",
+    PhoneNumberType.TOLL_FREE: "Toll Free",
+    PhoneNumberType.VOIP: "VoIP",
+}
+
+# Columns returned by CountryService.parse_batch
+BATCH_COLUMNS = ("input", "success", "valid", "country", "code", "region_code", "formatted",
+                 "e164", "carrier", "line_type", "state", "timezone", "message")
+
+_geodata = None
+
+def load_geodata():
+    """
+    Geocoder, carrier and timezone lookups, loaded on first use (or during warm-up).
+    Prefers the memory-mapped tables built by `python -m core.geo_tables`, shared by
+    every worker on the host; otherwise imports the phonenumbers data modules
+    (most of the process's import time and ~100 MB per worker).
+    """
+    global _geodata
+    if _geodata is None:
+        tables = load_geo_tables()
+        if tables is not None:
+            _geodata = (tables, tables, tables)
+        else:
+            from phonenumbers import geocoder, carrier, timezone
+            _geodata = (geocoder, carrier, timezone)
+    return _geodata
+
 class CountryService:
     def __init__(self):
         # Scraping headers if needed
         self.headers = {'User-Agent': 'Mozilla/5.0'}
 
+    @staticmethod
+    def cache_key(phone: str) -> str:
+        """
+        Result-cache key. Simple inputs ("+", digits, separators) key on "+" + digits
+        without parsing; anything else (letters, extensions) on the parsed E.164 plus
+        "x" + extension, so inputs only share a key when they parse to the same number.
+        """
+        if _SIMPLE_INPUT.match(phone):
+            return "+" + _NON_DIGITS.sub('', phone)
+        z = CountryService._parse(phone)
+        return CountryService.number_key(z) if z is not None else "raw:" + phone.strip()
+
+    @staticmethod
+    def number_key(z) -> str:
+        """ "+<country code><national number>", plus "x<extension>" when there is one """
+        key = "+" + str(z.country_code) + phonenumbers.national_significant_number(z)
+        return key + "x" + z.extension if z.extension else key
+
+    @staticmethod
+    def _parse(phone: str):
+        """ libphonenumber parse, retried on "+" + digits; None if neither parses """
+        try:
+            return phonenumbers.parse(phone, None)
+        except phonenumbers.NumberParseException:
+            # Try simple cleaning
+            try:
+                return phonenumbers.parse("+" + _NON_DIGITS.sub('', phone), None)
+            except phonenumbers.NumberParseException:
+                return None
+
     async def get_country_info(self, phone: str):
         default_resp = {
             "success": False, "valid": False, "country": "Unknown", "code": "", 
@@ -21,34 +92,35 @@ class CountryService:
         
         try:
             # 1. Parse with Google Libphonenumber
-            try:
-                z = phonenumbers.parse(phone, None)
-            except phonenumbers.NumberParseException:
-                # Try simple cleaning
-                 clean = "+" + re.sub(r'[^0-9]', '', phone)
-                 try:
-                     z = phonenumbers.parse(clean, None)
-                 except:
-                     return default_resp
-            
-            if not phonenumbers.is_valid_number(z):
+            t0 = perf_counter()
+            z = self._parse(phone)
+            t1 = perf_counter()
+            STAGE_SECONDS.observe(t1 - t0, stage="parse")
+            if z is None:
+                return default_resp
+
+            valid = phonenumbers.is_valid_number(z)
+            t2 = perf_counter()
+            STAGE_SECONDS.observe(t2 - t1, stage="validate")
+            if not valid:
                 return {**default_resp, "message": "Invalid Number Format"}
 
             # 2. Extract Data
+            geocoder, carrier, timezone = load_geodata()
             country = geocoder.description_for_number(z, "en")
+            t3 = perf_counter()
             carrier_name = carrier.name_for_number(z, "en")
+            t4 = perf_counter()
             tz = timezone.time_zones_for_number(z)
+            t5 = perf_counter()
+            STAGE_SECONDS.observe(t3 - t2, stage="geocoder")
+            STAGE_SECONDS.observe(t4 - t3, stage="carrier")
+            STAGE_SECONDS.observe(t5 - t4, stage="timezone")
             formatted = phonenumbers.format_number(z, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
             e164 = phonenumbers.format_number(z, phonenumbers.PhoneNumberFormat.E164)
             
             # Simple Type Logic
-            import phonenumbers.number_type_map
-            type_code = phonenumbers.number_type(z) # 1=Mobile, 2=Fixed, etc
-            line_type = "Fixed Line"
-            if type_code == 1: line_type = "Mobile"
-            elif type_code == 2: line_type = "Fixed Line"
-            elif type_code == 3: line_type = "Toll Free"
-            elif type_code == 4: line_type = "VoIP"
+            line_type = LINE_TYPES.get(phonenumbers.number_type(z), "Fixed Line")
             
             # Scrape Override for India (Since Google Lib is generic for India states)
             state = "Entire Country"
@@ -59,18 +131,22 @@ class CountryService:
                 if not carrier_name:
                      carrier_name = "Unknown (India)"
                 
-                # Mock refined state for demo if strictly +91
-                # In real app, we use HLR lookup API here
-                pass
+                # Circle from the compiled series plan (no scraping needed)
+                circle = get_circle_from_series(str(z.national_number))
+                if circle:
+                    state = circle
             else:
                 state = country # For USA it returns 'CA' etc.
+            STAGE_SECONDS.observe(perf_counter() - t5, stage="format")
 
             return {
                 "success": True,
                 "valid": True,
                 "country": country,
                 "code": f"+{z.country_code}",
+                "region_code": phonenumbers.region_code_for_number(z),
                 "formatted": formatted,
+                "e164": e164,
                 "carrier": carrier_name or "Unknown Carrier",
                 "line_type": line_type,
                 "state": state,
@@ -80,3 +156,119 @@ class CountryService:
         except Exception as e:
             logger.error(f"Error in CountryService: {e}")
             return default_resp
+
+    def parse_batch(self, phones: List[str]) -> Dict[str, List[Any]]:
+        """
+        Columnar, offline variant of get_country_info for large arrays of raw inputs.
+
+        Duplicate inputs are parsed once; simple inputs ("+", digits, separators) are
+        cleaned with one precompiled regex instead of a failed parse. Each distinct
+        number is parsed and typed once, and geocoder/carrier/timezone lookups run once
+        per (line type, region, 9-digit prefix) group, libphonenumber's longest prefix. Indian circles come from one vectorized series-plan lookup.
+
+        Returns {column: list} for BATCH_COLUMNS, one entry per input, in input order.
+        """
+        t0 = perf_counter()
+        n = len(phones)
+        columns = {name: [None] * n for name in BATCH_COLUMNS}
+        columns["input"] = list(phones)
+        for name, default in (("success", False), ("valid", False), ("country", "Unknown"),
+                              ("code", ""), ("carrier", "Unknown Carrier"), ("line_type", "Unknown")):
+            columns[name] = [default] * n
+        columns["formatted"] = list(phones)
+
+        # 1. Clean + parse each distinct input once
+        numbers = {}  # e164 (+ extension) -> (PhoneNumber, [row indices])
+        by_input: Dict[str, Optional[str]] = {}
+        for i, phone in enumerate(phones):
+            if not isinstance(phone, str):
+                continue
+            if phone in by_input:
+                key = by_input[phone]
+            else:
+                z = None
+                if _SIMPLE_INPUT.match(phone):
+                    try:
+                        z = phonenumbers.parse("+" + _NON_DIGITS.sub('', phone), None)
+                    except phonenumbers.NumberParseException:
+                        pass
+                else:
+                    z = self._parse(phone)
+                key = None
+                if z is not None:
+                    key = self.number_key(z)
+                    if key not in numbers:
+                        numbers[key] = (z, [])
+                by_input[phone] = key
+            if key is not None:
+                numbers[key][1].append(i)
+        t1 = perf_counter()
+        STAGE_SECONDS.observe(t1 - t0, stage="batch_parse")
+
+        # 2. Validate + type each distinct number, group by prefix for the lookups
+        geocoder, carrier, timezone = load_geodata()
+        lookups = {}
+        india = []  # (national number, row indices)
+        for key, (z, rows) in numbers.items():
+            e164 = key.split("x", 1)[0]
+            ntype = phonenumbers.number_type(z)
+            if ntype == PhoneNumberType.UNKNOWN:
+                for i in rows:
+                    columns["message"][i] = "Invalid Number Format"
+                continue
+
+            region = phonenumbers.region_code_for_number(z)
+            # The prefix tables key on at most 9 digits; a mobile token (AR "9") shifts them by one
+            group = (ntype, region, e164[:11] if phonenumbers.country_mobile_token(z.country_code) else e164[:10])
+            found = lookups.get(group)
+            if found is None:
+                tz = timezone.time_zones_for_number(z)
+                found = lookups[group] = (geocoder.description_for_number(z, "en"),
+                                          carrier.name_for_number(z, "en"),
+                                          list(tz)[0] if tz else "UTC")
+            country, carrier_name, tz_name = found
+
+            state = country  # For USA it returns 'CA' etc.
+            if z.country_code == 91:
+                carrier_name = carrier_name or "Unknown (India)"
+                state = "Entire Country"
+                india.append((z.national_number, rows))
+
+            values = {
+                "success": True, "valid": True, "country": country, "code": f"+{z.country_code}",
+                "region_code": region, "formatted": phonenumbers.format_number(z, phonenumbers.PhoneNumberFormat.INTERNATIONAL),
+                "e164": e164, "carrier": carrier_name or "Unknown Carrier",
+                "line_type": LINE_TYPES.get(ntype, "Fixed Line"), "state": state, "timezone": tz_name
+            }
+            for i in rows:
+                for name, value in values.items():
+                    columns[name][i] = value
+
+        # 3. Circles for Indian numbers in one vectorized series lookup
+        if india:
+            circles, _ = series_store.plan.lookup_many([national for national, _ in india])
+            for (national, rows), circle in zip(india, circles):
+                circle = circle or get_circle_from_series(str(national))  # learned series
+                if circle:
+                    for i in rows:
+                        columns["state"][i] = circle
+        STAGE_SECONDS.observe(perf_counter() - t1, stage="batch_enrich")
+        return columns
+
+    @staticmethod
+    def batch_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """ parse_batch() columns as get_country_info()-shaped dicts """
+        rows = []
+        for i, phone in enumerate(columns["input"]):
+            if columns["success"][i]:
+                rows.append({name: columns[name][i] for name in BATCH_COLUMNS[1:-1]})
+                continue
+            row = {
+                "success": False, "valid": False, "country": "Unknown", "code": "",
+                "carrier": "Unknown Carrier", "line_type": "Unknown", "formatted": phone,
+                "region": "Unknown"
+            }
+            if columns["message"][i]:
+                row["message"] = columns["message"][i]
+            rows.append(row)
+        return rows
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from core.extractor import Extraction, cut_point, extract_chunk
+
+# Setup Logging
+logger = logging.getLogger("ExtractionService")
+
+# Upload size accepted by /extract; larger dumps go through extract_numbers.py
+EXTRACT_MAX_BYTES = int(os.getenv("EXTRACT_MAX_BYTES", str(64 * 1024 * 1024)))
+# Text parsed per worker-thread call
+EXTRACT_CHUNK_BYTES = 1024 * 1024
+# Unique numbers scored per analyze_batch call
+EXTRACT_SCORE_BATCH = 5000
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def check_region(region: Optional[str]) -> Optional[str]:
+    """ Upper-cased region code, or ValueError if phonenumbers doesn't know it """
+    if not region:
+        return None
+    import phonenumbers
+    region = region.upper()
+    if region not in phonenumbers.SUPPORTED_REGIONS:
+        raise ValueError(f"Unknown region '{region}'")
+    return region
+
+
+async def extract_stream(body: AsyncIterator[bytes], region: Optional[str] = None,
+                         chunk_bytes: int = EXTRACT_CHUNK_BYTES,
+                         max_bytes: int = EXTRACT_MAX_BYTES) -> Extraction:
+    """
+    Extracts numbers from an uploaded text body while it is still arriving.
+    Each ~1 MB chunk (cut at a line break) is parsed in a worker thread, so the
+    event loop keeps serving other requests during large uploads.
+    """
+    extraction = Extraction()
+    buffer = b""
+    received = 0
+    async for block in body:
+        received += len(block)
+        if received > max_bytes:
+            raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+        buffer += block
+        if len(buffer) >= chunk_bytes:
+            cut = cut_point(buffer)
+            chunk, buffer = buffer[:cut], buffer[cut:]
+            extraction.add(*await asyncio.to_thread(extract_chunk, chunk.decode("utf-8", errors="replace"), region))
+    if buffer:
+        extraction.add(*await asyncio.to_thread(extract_chunk, buffer.decode("utf-8", errors="replace"), region))
+    return extraction
+
+
+async def score_hits(engine, extraction: Extraction, deep_search: bool = False,
+                     timeout_ms: Optional[float] = None,
+                     batch_size: int = EXTRACT_SCORE_BATCH) -> List[Dict[str, Any]]:
+    """
+    Unique hits run through ScoringEngine.analyze_batch, with their count and first raw text.
+    Scored `batch_size` numbers per call, so one upload never becomes one unbounded batch.
+    """
+    rows = extraction.rows()
+    scored = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        results = await engine.analyze_batch([row["e164"] for row in batch], deep_search, timeout_ms=timeout_ms)
+        for row, result in zip(batch, results):
+            result = {k: v for k, v in result.items() if k != "input"}
+            scored.append({**row, **result})
+    return scored
@@ -0,0 +1,538 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from core.metrics import REGISTRY
+
+# Setup Logging
+logger = logging.getLogger("JobService")
+
+DEFAULT_JOBS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                 "core", "data", "jobs.db")
+
+# Analyses in flight across all jobs, normally and while interactive requests are running
+JOB_MAX_INFLIGHT = int(os.getenv("JOB_MAX_INFLIGHT", "32"))
+JOB_BUSY_INFLIGHT = int(os.getenv("JOB_BUSY_INFLIGHT", "2"))
+# Jobs worked on at the same time; later ones wait in the queue
+JOB_MAX_RUNNING = int(os.getenv("JOB_MAX_RUNNING", "2"))
+JOB_MAX_INPUTS = int(os.getenv("JOB_MAX_INPUTS", "1000000"))
+JOB_DEFAULT_CONCURRENCY = 8
+JOB_MAX_CONCURRENCY = 64
+# A worker owns a job while it renews the lease; a lease older than this is taken over
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+# How often a runner renews its lease and checks the stored state (pause/cancel from any worker)
+JOB_POLL_SECONDS = 2.0
+# Runner crashes (not item failures) tolerated before a job is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Results are written in groups (by count or age); a crash redoes at most a group per job
+FLUSH_EVERY = 200
+FLUSH_SECONDS = 1.0
+# Pending items read from disk at a time
+READ_CHUNK = 1000
+
+QUEUED = "queued"
+RUNNING = "running"
+PAUSED = "paused"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETED, CANCELLED, FAILED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          TEXT PRIMARY KEY,
+    state       TEXT NOT NULL,
+    deep_search INTEGER NOT NULL,
+    timeout_ms  REAL,
+    concurrency INTEGER NOT NULL,
+    total       INTEGER NOT NULL,
+    done        INTEGER NOT NULL DEFAULT 0,
+    errors      INTEGER NOT NULL DEFAULT 0,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL,
+    owner       TEXT,
+    heartbeat   REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    last_error  TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    seq    INTEGER NOT NULL,
+    input  TEXT NOT NULL,
+    result TEXT,
+    PRIMARY KEY (job_id, seq)
+) WITHOUT ROWID;
+"""
+
+JOB_COLUMNS = ("id", "state", "deep_search", "timeout_ms", "concurrency", "total", "done", "errors",
+               "created_at", "started_at", "finished_at", "owner", "heartbeat", "attempts", "last_error")
+# Columns added after the first release, for stores created before them
+MIGRATIONS = (("owner", "TEXT"), ("heartbeat", "REAL"), ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+              ("last_error", "TEXT"))
+
+
+class JobStore:
+    """
+    SQLite persistence for jobs and their items (one row per input, result once done).
+    Same WAL setup as EnrichmentCache, with one connection per thread. Every worker
+    process on the host shares the file; a job is worked on by the worker holding
+    its lease (owner + heartbeat), claimed with a single conditional UPDATE.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in MIGRATIONS:
+            if column not in columns:
+                try:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+                except sqlite3.OperationalError as e:
+                    if "duplicate column" not in str(e):  # another worker migrated first
+                        raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, job_id: str, inputs: List[str], deep_search: bool,
+               timeout_ms: Optional[float], concurrency: int) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT INTO jobs (id, state, deep_search, timeout_ms, concurrency, total, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, int(deep_search), timeout_ms, concurrency, len(inputs), time.time()))
+            conn.executemany("INSERT INTO items (job_id, seq, input) VALUES (?, ?, ?)",
+                             ((job_id, seq, phone) for seq, phone in enumerate(inputs)))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?",
+                                   (job_id,)).fetchone()
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def list(self, states: Tuple[str, ...] = (), limit: int = 100) -> List[Dict[str, Any]]:
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs"
+        if states:
+            query += f" WHERE state IN ({', '.join('?' * len(states))})"
+        rows = self._conn().execute(query + " ORDER BY created_at LIMIT ?", (*states, limit)).fetchall()
+        return [dict(zip(JOB_COLUMNS, row)) for row in rows]
+
+    def set_state(self, job_id: str, state: str, **times: float) -> None:
+        sets = ", ".join(["state = ?"] + [f"{column} = ?" for column in times])
+        self._conn().execute(f"UPDATE jobs SET {sets} WHERE id = ?", (state, *times.values(), job_id))
+
+    def claimable(self, stale_before: float, limit: int) -> List[Dict[str, Any]]:
+        """ Queued/running jobs with no owner or an expired lease, oldest first """
+        rows = self._conn().execute(
+            f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE state IN (?, ?) "
+            "AND (owner IS NULL OR heartbeat < ?) ORDER BY created_at LIMIT ?",
+            (QUEUED, RUNNING, stale_before, limit)).fetchall()
+        return [dict(zip(JOB_COLUMNS, row)) for row in rows]
+
+    def claim(self, job_id: str, owner: str, now: float, stale_before: float) -> bool:
+        """ Takes the job's lease atomically; False if another worker holds a live one """
+        return self._conn().execute(
+            "UPDATE jobs SET owner = ?, heartbeat = ?, state = ?, started_at = COALESCE(started_at, ?) "
+            "WHERE id = ? AND state IN (?, ?) AND (owner IS NULL OR owner = ? OR heartbeat < ?)",
+            (owner, now, RUNNING, now, job_id, QUEUED, RUNNING, owner, stale_before)).rowcount == 1
+
+    def heartbeat(self, job_id: str, owner: str, now: float) -> Optional[str]:
+        """ Renews the lease and returns the stored state; None if the job is gone or owned by another worker """
+        conn = self._conn()
+        conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND owner = ?", (now, job_id, owner))
+        row = conn.execute("SELECT state, owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row and row[1] == owner else None
+
+    def finish(self, job_id: str, owner: str, now: float) -> bool:
+        """ Marks a job completed if this worker still owns it and nobody paused/cancelled it """
+        return self._conn().execute(
+            "UPDATE jobs SET state = ?, finished_at = ? WHERE id = ? AND owner = ? AND state = ?",
+            (COMPLETED, now, job_id, owner, RUNNING)).rowcount == 1
+
+    def release(self, job_id: str, owner: str) -> None:
+        self._conn().execute("UPDATE jobs SET owner = NULL, heartbeat = NULL WHERE id = ? AND owner = ?",
+                             (job_id, owner))
+
+    def record_failure(self, job_id: str, error: str, max_attempts: int, now: float) -> Tuple[int, str]:
+        """ Counts a runner crash; the job is failed once it reaches max_attempts. Returns (attempts, state) """
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "UPDATE jobs SET attempts = attempts + 1, last_error = ?, "
+                "state = CASE WHEN attempts + 1 >= ? AND state IN (?, ?) THEN ? ELSE state END, "
+                "finished_at = CASE WHEN attempts + 1 >= ? AND state IN (?, ?) THEN ? ELSE finished_at END "
+                "WHERE id = ?",
+                (error, max_attempts, QUEUED, RUNNING, FAILED, max_attempts, QUEUED, RUNNING, now, job_id))
+            row = conn.execute("SELECT attempts, state FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return (row[0], row[1]) if row else (max_attempts, FAILED)
+
+    def pending(self, job_id: str, after: int, limit: int = READ_CHUNK) -> List[Tuple[int, str]]:
+        return self._conn().execute(
+            "SELECT seq, input FROM items WHERE job_id = ? AND seq > ? AND result IS NULL ORDER BY seq LIMIT ?",
+            (job_id, after, limit)).fetchall()
+
+    def save_results(self, job_id: str, results: List[Tuple[int, Dict[str, Any], bool]]) -> None:
+        """
+        Stores (seq, result, failed) rows and bumps the job counters in one transaction.
+        Items that already have a result (a worker whose lease expired mid-item) are not counted twice.
+        """
+        conn = self._conn()
+        done = errors = 0
+        with conn:
+            conn.execute("BEGIN")
+            for seq, result, failed in results:
+                if conn.execute("UPDATE items SET result = ? WHERE job_id = ? AND seq = ? AND result IS NULL",
+                                (json.dumps(result, default=str), job_id, seq)).rowcount:
+                    done += 1
+                    errors += failed
+            conn.execute("UPDATE jobs SET done = done + ?, errors = errors + ? WHERE id = ?",
+                         (done, errors, job_id))
+
+    def results(self, job_id: str, offset: int, limit: int) -> List[Tuple[int, str, str]]:
+        return self._conn().execute(
+            "SELECT seq, input, result FROM items WHERE job_id = ? AND seq >= ? AND result IS NOT NULL "
+            "ORDER BY seq LIMIT ?", (job_id, offset, limit)).fetchall()
+
+    def delete(self, job_id: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM items WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+
+class JobManager:
+    """
+    Background jobs for workloads too large for one request (e.g. 100k deep searches).
+
+    Jobs and their inputs are persisted in SQLite (JOBS_DB_PATH) before they are
+    acknowledged; results are written back as they finish. On startup, jobs that
+    were queued or running when the process stopped continue from their first
+    unfinished item. Each job has its own concurrency limit, and all jobs share
+    JOB_MAX_INFLIGHT slots, which shrink to JOB_BUSY_INFLIGHT while interactive
+    requests are in flight so /predict traffic goes first.
+
+    With several worker processes, each job runs in exactly one of them: the one
+    that claimed its lease. Pause and cancel are written to the store, so any
+    worker can serve them; the owning runner sees the new state on its next poll.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("JOBS_DB_PATH", DEFAULT_JOBS_PATH)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.store: Optional[JobStore] = None
+        self.engine = None
+        self._runners: Dict[str, asyncio.Task] = {}
+        self._stopping: Dict[str, str] = {}  # job id -> why its runner is stopping (paused, cancelled, ...)
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Condition] = None
+        self._active = 0
+        self._interactive = 0
+        REGISTRY.gauge("countryfinder_job_items_inflight", "Job analyses in flight",
+                       callback=lambda: self._active)
+        REGISTRY.gauge("countryfinder_jobs_running", "Jobs being worked on",
+                       callback=lambda: len(self._runners))
+
+    # --- LIFECYCLE ---
+
+    async def start(self, engine) -> None:
+        """ Opens the store and resumes unfinished jobs (called from the app lifespan) """
+        self.engine = engine
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Condition()
+        try:
+            self.store = await asyncio.to_thread(JobStore, self.path)
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Job store at {self.path} unavailable, jobs disabled: {e!r}")
+            return
+        unfinished = await asyncio.to_thread(self.store.list, (QUEUED, RUNNING))
+        if unfinished:
+            logger.info(f"Resuming {len(unfinished)} unfinished job(s)")
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def stop(self) -> None:
+        """ Stops workers; running jobs stay 'running' on disk, released for any worker to resume """
+        tasks = list(self._runners.values()) + ([self._dispatcher] if self._dispatcher else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    # --- API ---
+
+    async def submit(self, inputs: List[str], deep_search: bool = False, timeout_ms: Optional[float] = None,
+                     concurrency: int = JOB_DEFAULT_CONCURRENCY) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        await asyncio.to_thread(self.store.create, job_id, inputs, deep_search, timeout_ms, concurrency)
+        logger.info(f"Job {job_id} queued: {len(inputs)} inputs (Deep: {deep_search})")
+        self._wakeup.set()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        return self._public(job) if job else None
+
+    async def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return [self._public(job) for job in await asyncio.to_thread(self.store.list, (), limit)]
+
+    async def results(self, job_id: str, offset: int = 0, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Finished items from input index `offset` on, in input order. Until the job
+        has finished, a page stops at the first item still in progress, and
+        "next_offset" points there so clients keep polling; it is null only once
+        the job is finished and every result has been read.
+        """
+        job = await asyncio.to_thread(self.store.get, job_id)
+        finished = job is None or job["state"] in FINISHED_STATES
+        rows = await asyncio.to_thread(self.store.results, job_id, offset, limit)
+        if not finished:
+            # Contiguous prefix only: an item finishing out of order must not be skipped
+            for i, (seq, _, _) in enumerate(rows):
+                if seq != offset + i:
+                    rows = rows[:i]
+                    break
+        items = [{"seq": seq, "input": phone, **json.loads(result)} for seq, phone, result in rows]
+        if len(rows) == limit or not finished:
+            next_offset = items[-1]["seq"] + 1 if items else offset
+        else:
+            next_offset = None
+        return {
+            "job_id": job_id,
+            "offset": offset,
+            "count": len(items),
+            "items": items,
+            "next_offset": next_offset,
+        }
+
+    async def pause(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._stop_job(job_id, PAUSED, (QUEUED, RUNNING))
+
+    async def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._stop_job(job_id, CANCELLED, (QUEUED, RUNNING, PAUSED))
+
+    async def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        if job["state"] == PAUSED:
+            await asyncio.to_thread(self.store.set_state, job_id, QUEUED)
+            self._wakeup.set()
+        return await self.get(job_id)
+
+    async def delete(self, job_id: str) -> bool:
+        """ Removes a job and its results; running jobs are cancelled first """
+        job = await self.cancel(job_id)
+        if job is None:
+            return False
+        runner = self._runners.get(job_id)
+        if runner is not None:
+            await asyncio.gather(runner, return_exceptions=True)
+        await asyncio.to_thread(self.store.delete, job_id)
+        return True
+
+    @asynccontextmanager
+    async def interactive(self):
+        """ Wraps an interactive request; job throughput drops while any are in flight """
+        self._interactive += 1
+        try:
+            yield
+        finally:
+            self._interactive -= 1
+            if not self._interactive and self._slots is not None:
+                async with self._slots:
+                    self._slots.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "worker": self.worker_id,
+            "running": sorted(self._runners),
+            "inflight": self._active,
+            "inflight_limit": self._limit(),
+            "interactive_inflight": self._interactive,
+        }
+
+    # --- WORKERS ---
+
+    @staticmethod
+    def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+        public = {"job_id": job["id"], **{k: v for k, v in job.items() if k not in ("id", "owner", "heartbeat")}}
+        public["deep_search"] = bool(job["deep_search"])
+        public["progress"] = round(job["done"] / job["total"], 4) if job["total"] else 1.0
+        return public
+
+    async def _stop_job(self, job_id: str, state: str, from_states: Tuple[str, ...]):
+        job = await asyncio.to_thread(self.store.get, job_id)
+        if job is None:
+            return None
+        if job["state"] in from_states:
+            finished = {"finished_at": time.time()} if state == CANCELLED else {}
+            await asyncio.to_thread(self.store.set_state, job_id, state, **finished)
+            if job_id in self._runners:
+                self._stopping[job_id] = state  # runner stops after its in-flight items
+            # A runner in another worker sees the stored state on its next poll
+        return await self.get(job_id)
+
+    def _limit(self) -> int:
+        return JOB_BUSY_INFLIGHT if self._interactive else JOB_MAX_INFLIGHT
+
+    @asynccontextmanager
+    async def _slot(self):
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._active < self._limit())
+            self._active += 1
+        try:
+            yield
+        finally:
+            async with self._slots:
+                self._active -= 1
+                self._slots.notify_all()
+
+    async def _dispatch(self) -> None:
+        """ Claims and starts unowned (or abandoned) jobs, oldest first, whenever a runner slot is free """
+        while True:
+            try:
+                if len(self._runners) < JOB_MAX_RUNNING:
+                    stale_before = time.time() - JOB_LEASE_SECONDS
+                    jobs = await asyncio.to_thread(self.store.claimable, stale_before, JOB_MAX_RUNNING * 2)
+                    for job in jobs:
+                        if len(self._runners) >= JOB_MAX_RUNNING:
+                            break
+                        if job["id"] in self._runners:
+                            continue
+                        if await asyncio.to_thread(self.store.claim, job["id"], self.worker_id,
+                                                   time.time(), stale_before):
+                            self._runners[job["id"]] = asyncio.ensure_future(self._run(job))
+            except sqlite3.Error as e:
+                logger.error(f"Job dispatch failed: {e!r}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=5.0)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        deep_search = bool(job["deep_search"])
+        semaphore = asyncio.Semaphore(max(1, job["concurrency"]))
+        buffer: List[Tuple[int, Dict[str, Any], bool]] = []
+        in_flight = set()
+        last_flush = time.monotonic()
+
+        async def flush():
+            nonlocal last_flush
+            last_flush = time.monotonic()
+            if buffer:
+                batch = buffer[:]
+                del buffer[:]
+                await asyncio.to_thread(self.store.save_results, job_id, batch)
+
+        async def one(seq, phone):
+            failed = False
+            try:
+                async with self._slot():
+                    result = await self.engine.analyze(phone, deep_search, job["timeout_ms"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job {job_id} item {seq} failed: {e!r}")
+                result, failed = {"success": False, "message": str(e), "confidence": 0.0}, True
+            finally:
+                semaphore.release()
+            buffer.append((seq, result, failed))
+            if len(buffer) >= FLUSH_EVERY or time.monotonic() - last_flush >= FLUSH_SECONDS:
+                await flush()
+
+        async def watch():
+            # Renews the lease and picks up pause/cancel made through any worker
+            while job_id not in self._stopping:
+                await asyncio.sleep(JOB_POLL_SECONDS)
+                try:
+                    state = await asyncio.to_thread(self.store.heartbeat, job_id, self.worker_id, time.time())
+                except sqlite3.Error as e:
+                    logger.warning(f"Job {job_id} heartbeat failed: {e!r}")
+                    continue
+                if state != RUNNING:
+                    self._stopping.setdefault(job_id, state or "taken over")
+
+        watcher = asyncio.ensure_future(watch())
+        try:
+            after = -1
+            while job_id not in self._stopping:
+                rows = await asyncio.to_thread(self.store.pending, job_id, after)
+                if not rows:
+                    break
+                for seq, phone in rows:
+                    await semaphore.acquire()
+                    if job_id in self._stopping:
+                        semaphore.release()
+                        break
+                    task = asyncio.ensure_future(one(seq, phone))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                    after = seq
+            await asyncio.gather(*in_flight)
+            await flush()
+            completed = (job_id not in self._stopping
+                         and await asyncio.to_thread(self.store.finish, job_id, self.worker_id, time.time()))
+            if completed:
+                logger.info(f"Job {job_id} completed")
+            else:
+                logger.info(f"Job {job_id} stopped ({self._stopping.get(job_id, 'state changed')})")
+        except asyncio.CancelledError:
+            # Shutdown: keep what finished; the rest is redone by whichever worker resumes it
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await asyncio.shield(flush())
+            raise
+        except Exception as e:
+            try:
+                attempts, state = await asyncio.to_thread(
+                    self.store.record_failure, job_id, repr(e), JOB_MAX_ATTEMPTS, time.time())
+            except sqlite3.Error:
+                attempts, state = 0, RUNNING
+            if state == FAILED:
+                logger.error(f"Job {job_id} runner failed {attempts} times, giving up: {e!r}")
+            else:
+                logger.error(f"Job {job_id} runner failed (attempt {attempts}/{JOB_MAX_ATTEMPTS}), will retry: {e!r}")
+                await asyncio.sleep(min(30.0, 2.0 ** attempts))
+        finally:
+            watcher.cancel()
+            try:
+                await asyncio.shield(asyncio.to_thread(self.store.release, job_id, self.worker_id))
+            except (sqlite3.Error, asyncio.CancelledError):
+                pass  # the lease expires on its own
+            self._runners.pop(job_id, None)
+            self._stopping.pop(job_id, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+
+# Singleton
+job_manager = JobManager()
@@ -0,0 +1,82 @@
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+# Setup Logging
+logger = logging.getLogger("RiskModel")
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                  "core", "data", "risk_model.joblib")
+
+# Feature vector, in column order. ScoringEngine._score fills these as "signals";
+# train_risk_model.py reads the same names from the labeled CSV.
+FEATURES = (
+    "line_mobile", "line_fixed", "line_voip", "line_toll_free",
+    "carrier_unknown", "is_india", "series_hit", "deep_search",
+    "tc_answered", "tc_has_name", "tc_spam_score",
+    "nv_answered", "scraper_answered",
+    "sources_timed_out", "sources_skipped",
+)
+
+
+def vectorize(signals: List[Dict[str, Any]]):
+    """ Signals dicts -> float matrix (rows x FEATURES); missing signals are 0 """
+    import numpy as np
+    return np.array([[float(s.get(name) or 0.0) for name in FEATURES] for s in signals], dtype=np.float64)
+
+
+class RiskModel:
+    """
+    Optional learned risk scorer.
+    Loads a joblib artifact ({"model", "features", ...}, written by train_risk_model.py)
+    once, then scores whole batches with a single predict_proba call. Without an
+    artifact, predict() returns None and ScoringEngine keeps its heuristic scores.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("RISK_MODEL_PATH", DEFAULT_MODEL_PATH)
+        self.model = None
+        self.version = None
+        self._positive = 1
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """ Loads the artifact on first call (startup warm-up or first request) """
+        if self._loaded:
+            return self.model is not None
+        with self._lock:
+            if self._loaded:
+                return self.model is not None
+            self._loaded = True
+            if not os.path.exists(self.path):
+                logger.info(f"No risk model at {self.path}, using heuristic scores")
+                return False
+            try:
+                import joblib
+                artifact = joblib.load(self.path)
+                if tuple(artifact.get("features", ())) != FEATURES:
+                    logger.warning(f"Risk model at {self.path} was trained on other features, ignoring it")
+                    return False
+                model = artifact["model"]
+                self._positive = list(model.classes_).index(1)
+                self.model = model
+                self.version = artifact.get("version") or os.path.basename(self.path)
+                logger.info(f"Risk model {self.version} loaded ({type(model).__name__})")
+            except Exception as e:
+                logger.error(f"Failed to load risk model {self.path}: {e!r}")
+            return self.model is not None
+
+    def predict(self, signals: List[Dict[str, Any]]):
+        """ Risk probability per signals dict (one vectorized call), or None without a model """
+        if not signals or not self.load():
+            return None
+        return self.model.predict_proba(vectorize(signals))[:, self._positive]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "loaded": self.model is not None, "version": self.version}
+
+
+# Singleton
+risk_model = RiskModel()
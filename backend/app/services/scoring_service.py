@@ -1,12 +1,39 @@
-from .truecaller_handler import TruecallerService
+from .truecaller_handler import tc_service
 from .country_service import CountryService
+from .cache_service import TTLCache
+from .single_flight import SingleFlight
+from .source_health import health_from_env
+from .risk_model import risk_model
+from core.numverify_handler import nv_service
+from core.scraper_handler import scraper_service
+from core.indian_series import lookup_series
+from core.series_store import series_store
+from core.metrics import REGISTRY, ANALYZE_SECONDS, SOURCE_TIMEOUTS, SOURCE_SKIPPED, CACHE_REQUESTS
+import asyncio
 import logging
-from typing import Dict, Any
+import os
+from time import perf_counter
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
 
 # Configure Logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ScoringEngine")
 
+# Max Truecaller/enrichment calls in flight for a single batch
+BATCH_CONCURRENCY = 16
+
+# Result cache (keyed by E.164 + deep flag). TTLs in seconds.
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "100000"))
+CACHE_BASE_TTL = float(os.getenv("CACHE_BASE_TTL", "86400"))      # offline validation data
+CACHE_DEEP_TTL = float(os.getenv("CACHE_DEEP_TTL", "3600"))       # Truecaller enrichment
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "300"))  # invalid / "No Result"
+
+# Confidence lost for each enrichment source that did not answer within the budget
+MISSING_SOURCE_PENALTY = 0.05
+
+# Source answer fields forwarded in progressive "source" events
+SOURCE_EVENT_FIELDS = ("success", "name", "carrier", "spam_score", "location", "state", "line_type", "error")
+
 class ScoringEngine:
     """
     Advanced AI Intelligence Layer (Prompt #7)
@@ -15,68 +42,389 @@ class ScoringEngine:
 
     def __init__(self):
         self.country_service = CountryService()
-        self.truecaller_service = TruecallerService()
+        self.truecaller_service = tc_service
+        self.numverify_service = nv_service
+        self.scraper_service = scraper_service
+        self.cache = TTLCache(maxsize=CACHE_MAX_ENTRIES, ttl=CACHE_BASE_TTL)
+        self.flights = SingleFlight()  # shares in-flight upstream calls for the same number
+        self.health = health_from_env()  # per-source circuit breakers + latency averages
+        self.risk_model = risk_model  # learned risk scores when a model artifact is present
 
-    async def analyze(self, phone: str, deep_search: bool = False) -> Dict[str, Any]:
+        REGISTRY.gauge("countryfinder_cache_entries", "Entries in the result cache",
+                       callback=lambda: len(self.cache))
+        REGISTRY.gauge("countryfinder_inflight_upstream_calls", "Upstream calls in flight (after coalescing)",
+                       callback=lambda: self.flights.stats()["in_flight"])
+        REGISTRY.gauge("countryfinder_executor_queue_depth", "Calls waiting for a worker thread", ["executor"],
+                       callback=lambda: {"truecaller": self.truecaller_service.stats()["queued"]})
+
+    async def analyze(self, phone: str, deep_search: bool = False,
+                      timeout_ms: Optional[float] = None) -> Dict[str, Any]:
         """
         Main Intelligence Function.
-        Orchestrates calls to CountryService (Numverify/Scrapers) and Truecaller.
+        Orchestrates calls to CountryService, the series plan, Numverify, the scraper and Truecaller.
+        `timeout_ms` bounds the enrichment phase; sources still running then are dropped.
         """
         logger.info(f"Analyzing {phone} (Deep: {deep_search})")
-        
+        start = perf_counter()
+
+        # 0. Cache (a hit skips parsing and every upstream call)
+        cached = self._cache_get(phone, deep_search)
+        if cached is not None:
+            ANALYZE_SECONDS.observe(perf_counter() - start, deep="true" if deep_search else "false")
+            return cached
+
         # 1. Base Validation
         base_data = await self.country_service.get_country_info(phone)
+        result, signals = await self._score(phone, base_data, deep_search, timeout_ms)
+        self._apply_model([(result, signals)])
+        self._cache_set(phone, deep_search, result)
+        ANALYZE_SECONDS.observe(perf_counter() - start, deep="true" if deep_search else "false")
+        return result
+
+    async def analyze_batch(self, phones: List[str], deep_search: bool = False,
+                            concurrency: int = BATCH_CONCURRENCY,
+                            timeout_ms: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Batch variant of analyze().
+        Validates every input in one pass, then enriches the valid ones with at most
+        `concurrency` deep searches in flight. Results keep input order; a failure
+        on one item is reported on that item only.
+        """
+        logger.info(f"Analyzing batch of {len(phones)} (Deep: {deep_search})")
+
+        # 1. Cache + Base Validation (offline, no upstream calls)
+        cached_items = []
+        misses = []
+        for i, phone in enumerate(phones):
+            cached = None
+            if isinstance(phone, str) and phone.strip():
+                cached = self._cache_get(phone, deep_search)
+                if cached is None:
+                    misses.append(i)
+            cached_items.append(cached)
+
+        # Columnar batch parse, off the event loop for large batches
+        base_items = [None] * len(phones)
+        if misses:
+            miss_phones = [phones[i] for i in misses]
+            if len(miss_phones) > 256:
+                columns = await asyncio.to_thread(self.country_service.parse_batch, miss_phones)
+            else:
+                columns = self.country_service.parse_batch(miss_phones)
+            for i, base in zip(misses, CountryService.batch_rows(columns)):
+                base_items[i] = base
+
+        # 2. Enrichment + Scoring with bounded concurrency (cache misses only)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(phone, base_data):
+            async with semaphore:
+                return await self._score(phone, base_data, deep_search, timeout_ms)
+
+        jobs = [run(phone, base) for phone, base in zip(phones, base_items) if base is not None]
+        outcomes = await asyncio.gather(*jobs, return_exceptions=True)
+
+        # 3. Model risk scores for the whole batch in one call, then cache
+        self._apply_model([o for o in outcomes if not isinstance(o, BaseException)])
+        miss_phones = [phone for phone, base in zip(phones, base_items) if base is not None]
+        for phone, outcome in zip(miss_phones, outcomes):
+            if not isinstance(outcome, BaseException):
+                self._cache_set(phone, deep_search, outcome[0])
+        scored = iter(o if isinstance(o, BaseException) else o[0] for o in outcomes)
+
+        results = []
+        for phone, cached, base in zip(phones, cached_items, base_items):
+            if cached is not None:
+                item = cached
+            elif base is None:
+                item = {"success": False, "message": "Input is required", "confidence": 0.0}
+            else:
+                item = next(scored)
+                if isinstance(item, Exception):
+                    logger.error(f"Batch item {phone} failed: {item}")
+                    item = {"success": False, "message": str(item), "confidence": 0.0}
+            results.append({"input": phone, **item})
+
+        return results
+
+    async def analyze_stream(self, phone: str, deep_search: bool = False,
+                             timeout_ms: Optional[float] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Progressive variant of analyze(), yielding (event, data) pairs:
+        "base" (offline validation + heuristic scores, deep search only), one "source"
+        per enrichment source as it answers, then "final" (same result as analyze()).
+        """
+        start = perf_counter()
+        deep_label = "true" if deep_search else "false"
+        cached = self._cache_get(phone, deep_search)
+        if cached is not None:
+            ANALYZE_SECONDS.observe(perf_counter() - start, deep=deep_label)
+            yield "final", cached
+            return
+
+        # 1. Base Validation, sent before any upstream call is made
+        base_data = await self.country_service.get_country_info(phone)
+        preliminary, signals = await self._score(phone, base_data, False)
+        self._apply_model([(preliminary, signals)])
+        if not deep_search or signals is None:
+            self._cache_set(phone, deep_search, preliminary)
+            ANALYZE_SECONDS.observe(perf_counter() - start, deep=deep_label)
+            yield "final", preliminary
+            return
+        yield "base", {**preliminary, "partial": True}
+
+        # 2. Enrichment: forward each source's answer as soon as it lands
+        answers: asyncio.Queue = asyncio.Queue()
+        scoring = asyncio.ensure_future(self._score(
+            phone, base_data, True, timeout_ms,
+            on_answer=lambda name, answer: answers.put_nowait((name, answer))))
+        try:
+            while not scoring.done() or not answers.empty():
+                if answers.empty():
+                    waiter = asyncio.ensure_future(answers.get())
+                    await asyncio.wait({waiter, scoring}, return_when=asyncio.FIRST_COMPLETED)
+                    if not waiter.done():
+                        waiter.cancel()
+                        continue
+                    name, answer = waiter.result()
+                else:
+                    name, answer = answers.get_nowait()
+                yield "source", {"source": name, **{k: answer[k] for k in SOURCE_EVENT_FIELDS if k in answer}}
+
+            # 3. Final scores
+            result, signals = scoring.result()
+            self._apply_model([(result, signals)])
+            self._cache_set(phone, deep_search, result)
+            ANALYZE_SECONDS.observe(perf_counter() - start, deep=deep_label)
+            yield "final", result
+        finally:
+            scoring.cancel()  # client went away mid-stream
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        return self.flights.stats()
+
+    def source_health(self) -> Dict[str, Any]:
+        return self.health.snapshot()
+
+    def _cache_get(self, phone: str, deep_search: bool):
+        cached = self.cache.get((CountryService.cache_key(phone), deep_search))
+        if cached is not None and cached.get("series_version") not in (None, "learned", series_store.version):
+            cached = None  # answered by series data that has since been reloaded
+        CACHE_REQUESTS.inc(cache="result", result="miss" if cached is None else "hit")
+        return dict(cached) if cached is not None else None
+
+    def _cache_set(self, phone: str, deep_search: bool, result: Dict[str, Any]) -> None:
+        """
+        Stores a result under the input's key and, when the input has no extension,
+        under its E.164 too (a result with an extension must not answer the bare number).
+        """
+        if result.get("timed_out") or result.get("skipped"):
+            return  # partial answer, the next request should try the slow sources again
+        if not result.get("success"):
+            ttl = CACHE_NEGATIVE_TTL
+        elif deep_search and "TruecallerAI" not in result.get("sources", []):
+            ttl = CACHE_NEGATIVE_TTL  # Truecaller had no answer, retry sooner
+        else:
+            ttl = CACHE_DEEP_TTL if deep_search else CACHE_BASE_TTL
+
+        value = dict(result)
+        key = CountryService.cache_key(phone)
+        keys = {key}
+        if result.get("e164") and "x" not in key:
+            keys.add(result["e164"])
+        for key in keys:
+            self.cache.set((key, deep_search), value, ttl)
+
+    async def _score(self, phone: str, base_data: Dict[str, Any], deep_search: bool,
+                     timeout_ms: Optional[float] = None,
+                     on_answer: Optional[Callable[[str, Dict[str, Any]], None]] = None
+                     ) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """
+        Enrichment + heuristic risk scoring on top of a CountryService result.
+        Returns (result, signals); signals are the risk model's inputs (None if invalid).
+        `on_answer(source, answer)` is called as each enrichment source finishes.
+        """
         if not base_data.get("valid"):
             return {
                 "success": False,
                 "message": base_data.get("message", "Invalid Number"),
                 "confidence": 0.0
-            }
+            }, None
 
         final_data = base_data.copy()
         sources_used = ["ValidationEngine"]
-        
+        is_india = base_data.get("code") == "+91"
+        number = base_data.get("e164") or phone
+
         # 2. Risk Scoring Logic (Simple Heuristic for now)
         risk_score = 0.0
         confidence = 0.8  # Start high for valid numbers
-        
+
         # If Carrier is unknown, lower confidence
         if base_data.get("carrier") == "Unknown Carrier":
             confidence -= 0.2
             risk_score += 0.3
-        
+
         # If Line Type is VoIP, increase risk
         if base_data.get("line_type") == "VoIP":
             risk_score += 0.6
             confidence -= 0.1
 
-        # 3. Deep Search (Truecaller)
+        # 3. Local Series Lookup (India circle/operator, in-memory)
+        if is_india:
+            series, final_data["series_version"] = lookup_series(number)
+            if series and series[0]:
+                sources_used.append("SeriesPlan")
+                final_data["state"] = series[0]
+                if series[1] and final_data.get("carrier") in ("Unknown Carrier", "Unknown (India)"):
+                    final_data["carrier"] = series[1]
+
+        line_type = base_data.get("line_type")
+        signals = {
+            "line_mobile": line_type == "Mobile", "line_fixed": line_type == "Fixed Line",
+            "line_voip": line_type == "VoIP", "line_toll_free": line_type == "Toll Free",
+            "is_india": is_india, "series_hit": "SeriesPlan" in sources_used, "deep_search": deep_search
+        }
+
+        # 4. Deep Search: all upstream sources at once, under one latency budget
         if deep_search:
-            tc_data = await self.truecaller_service.identify(phone, base_data.get("country"))
-            
+            region = base_data.get("region_code")
+            sources = [("TruecallerAI", lambda: self.truecaller_service.identify(number, region))]
+            if self.numverify_service.api_key:
+                sources.append(("Numverify", lambda: self.numverify_service.validate_async(number)))
+            if is_india:
+                sources.append(("WebScraper", lambda: self.scraper_service.trace_async(number)))
+
+            # Unhealthy (open circuit) or too slow for this budget: don't wait on it.
+            # Concurrent analyses of the same number share one upstream call per source.
+            calls, skipped = {}, []
+            for name, fn in sources:
+                if self.health.allow(name, timeout_ms):
+                    calls[name] = self.flights.do(name, number, self.health.guard(name, fn))
+                else:
+                    skipped.append(name)
+                    SOURCE_SKIPPED.inc(source=name)
+
+            answers, timed_out = await self._fan_out(calls, timeout_ms, on_answer)
+
+            tc_data = answers.get("TruecallerAI", {})
             if tc_data.get("success"):
                 sources_used.append("TruecallerAI")
                 # Merge Truecaller Data
                 if tc_data.get("name"):
                     final_data["name"] = tc_data["name"]
                     confidence += 0.15 # Verified Name boosts confidence
-                    
+
                 if tc_data.get("carrier"):
                     final_data["carrier"] = tc_data["carrier"] # Prefer TC carrier
-                
+
                 # Check for Spam Score in TC data (mock logic if not provided)
                 if tc_data.get("spam_score", 0) > 10:
                     risk_score += 0.8
                     final_data["spam_level"] = "High"
-            else:
-                # If TC fails, check if we have a verified manual override (e.g. Lokesh)
-                # This logic is already inside country_service somewhat, but let's be sure.
-                pass
-        
+                signals.update(tc_answered=True, tc_has_name=bool(tc_data.get("name")),
+                               tc_spam_score=tc_data.get("spam_score") or 0)
+
+            nv_data = answers.get("Numverify", {})
+            if nv_data.get("success"):
+                sources_used.append("Numverify")
+                signals["nv_answered"] = True
+                confidence += 0.05
+                if nv_data.get("location") and final_data.get("state") in ("Entire Country", final_data.get("country")):
+                    final_data["state"] = nv_data["location"]
+                if nv_data.get("carrier") and final_data.get("carrier") in ("Unknown Carrier", "Unknown (India)"):
+                    final_data["carrier"] = nv_data["carrier"]
+
+            sc_data = answers.get("WebScraper", {})
+            if sc_data.get("success"):
+                sources_used.append("WebScraper")
+                signals["scraper_answered"] = True
+                confidence += 0.05
+                if sc_data.get("state") and "SeriesPlan" not in sources_used:
+                    final_data["state"] = sc_data["state"]
+                if sc_data.get("carrier") and final_data.get("carrier") in ("Unknown Carrier", "Unknown (India)"):
+                    final_data["carrier"] = sc_data["carrier"]
+
+            # Sources that ran out of budget or were skipped: answer anyway, but say so and trust it less
+            for name in timed_out:
+                sources_used.append(f"{name} (timeout)")
+                confidence -= MISSING_SOURCE_PENALTY
+            for name in skipped:
+                sources_used.append(f"{name} (skipped)")
+                confidence -= MISSING_SOURCE_PENALTY
+            if timed_out:
+                final_data["timed_out"] = timed_out
+            if skipped:
+                final_data["skipped"] = skipped
+            signals.update(sources_timed_out=len(timed_out), sources_skipped=len(skipped))
+
         # Normalize Scores
-        final_data["confidence"] = min(confidence, 1.0)
+        final_data["confidence"] = max(min(confidence, 1.0), 0.0)
         final_data["risk_score"] = min(risk_score, 1.0)
         final_data["success"] = True
         final_data["sources"] = sources_used
+        signals["carrier_unknown"] = final_data.get("carrier") in ("Unknown Carrier", "Unknown (India)")
+
+        return final_data, signals
+
+    def _apply_model(self, scored: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]) -> None:
+        """ Replaces heuristic risk scores with the model's, one predict_proba for all rows """
+        rows = [(result, signals) for result, signals in scored if signals is not None]
+        if not rows:
+            return
+        try:
+            risks = self.risk_model.predict([signals for _, signals in rows])
+        except Exception as e:
+            logger.error(f"Risk model failed, keeping heuristic scores: {e!r}")
+            return
+        if risks is None:
+            return
+        for (result, _), risk in zip(rows, risks):
+            result["risk_score"] = round(float(risk), 4)
+            result["risk_model"] = self.risk_model.version
+
+    async def _fan_out(self, calls: Dict[str, Any], timeout_ms: Optional[float],
+                       on_answer: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        """
+        Runs source coroutines concurrently. Returns ({name: answer}, [timed out names]);
+        a source that raised counts as answered with a failure.
+
+        Source tasks still running at the deadline, or when this call is itself
+        cancelled (e.g. an SSE client disconnecting), are cancelled. The upstream
+        call behind a SingleFlight-shared source is shielded, so it is detached
+        rather than cancelled: it finishes for any other waiters, then is dropped.
+        """
+        tasks = {name: asyncio.ensure_future(coro) for name, coro in calls.items()}
+        if not tasks:
+            return {}, []
+        if on_answer is not None:
+            for name, task in tasks.items():
+                task.add_done_callback(
+                    lambda t, name=name: None if t.cancelled() else on_answer(name, self._answer(t)))
+        timeout = timeout_ms / 1000.0 if timeout_ms else None
+        try:
+            await asyncio.wait(tasks.values(), timeout=timeout)
+
+            answers, timed_out = {}, []
+            for name, task in tasks.items():
+                if not task.done():
+                    timed_out.append(name)
+                    SOURCE_TIMEOUTS.inc(source=name)
+                else:
+                    if task.exception() is not None:
+                        logger.error(f"{name} failed: {task.exception()}")
+                    answers[name] = self._answer(task)
+            return answers, timed_out
+        finally:
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
 
-        return final_data
+    @staticmethod
+    def _answer(task: asyncio.Future) -> Dict[str, Any]:
+        if task.exception() is not None:
+            return {"success": False, "error": str(task.exception())}
+        return task.result()
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical upstream calls.
+    While a call for (source, key) is in flight, later callers await the same task
+    instead of starting their own. Callers are shielded from each other: one caller
+    timing out or being cancelled does not cancel the shared call for the rest.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Tuple[str, Hashable], asyncio.Future] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, source: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        counters = self._counters.setdefault(source, {"calls": 0, "executed": 0, "coalesced": 0})
+        counters["calls"] += 1
+
+        flight_key = (source, key)
+        task = self._inflight.get(flight_key)
+        if task is None:
+            counters["executed"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[flight_key] = task
+            task.add_done_callback(lambda t: self._finish(flight_key, t))
+        else:
+            counters["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key, task: asyncio.Future) -> None:
+        if self._inflight.get(flight_key) is task:
+            del self._inflight[flight_key]
+        # Every waiter may have given up already; don't leave the error unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "sources": {name: dict(c) for name, c in self._counters.items()}
+        }
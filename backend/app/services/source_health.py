@@ -0,0 +1,159 @@
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+from core.metrics import REGISTRY, SOURCE_SECONDS, SOURCE_ERRORS
+
+logger = logging.getLogger("SourceHealth")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Health of one upstream source.
+    Tracks moving averages (EWMA) of latency and error rate. Opens after
+    `failure_threshold` consecutive failures or a sustained error rate, rejects
+    calls for `open_seconds`, then lets a single half-open probe through: success
+    closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, open_seconds: float = 30.0,
+                 max_error_rate: float = 0.5, min_calls: int = 20, alpha: float = 0.2,
+                 slow_probe_every: int = 20):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_error_rate = max_error_rate
+        self.min_calls = min_calls
+        self.alpha = alpha
+        self.slow_probe_every = slow_probe_every
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.consecutive_failures = 0
+        self.latency_ms: Optional[float] = None
+        self.error_rate = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.skipped_slow = 0
+
+    def allow(self, budget_ms: Optional[float] = None) -> bool:
+        """ Should this request call the source? """
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self.probe_in_flight = False
+            logger.info(f"Circuit {self.name} half-open, probing")
+
+        if self.state == HALF_OPEN:
+            if self.probe_in_flight:
+                self.rejected += 1
+                return False
+            self.probe_in_flight = True
+            return True
+
+        # Closed: skip a source that typically can't answer within this request's budget,
+        # letting an occasional call through so the average can recover
+        if budget_ms and self.latency_ms is not None and self.latency_ms > budget_ms:
+            self.skipped_slow += 1
+            if self.skipped_slow % self.slow_probe_every:
+                return False
+        return True
+
+    def record(self, ok: bool, latency_ms: float) -> None:
+        self.calls += 1
+        self.latency_ms = latency_ms if self.latency_ms is None else \
+            self.alpha * latency_ms + (1 - self.alpha) * self.latency_ms
+        self.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.error_rate
+        self.probe_in_flight = False
+
+        if ok:
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                logger.info(f"Circuit {self.name} closed")
+            return
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold or \
+                (self.calls >= self.min_calls and self.error_rate >= self.max_error_rate):
+            if self.state != OPEN:
+                logger.warning(f"Circuit {self.name} opened "
+                               f"({self.consecutive_failures} consecutive failures, error rate {self.error_rate:.2f})")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "latency_ms": round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "consecutive_failures": self.consecutive_failures,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "skipped_slow": self.skipped_slow,
+            "open_for_s": round(max(0.0, self.open_seconds - (time.monotonic() - self.opened_at)), 1)
+            if self.state == OPEN else 0.0
+        }
+
+
+class SourceHealth:
+    """ Circuit breakers for every enrichment source used by ScoringEngine """
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        REGISTRY.gauge("countryfinder_source_circuit_open", "1 while a source's circuit is open", ["source"],
+                       callback=lambda: {n: int(b.state == OPEN) for n, b in self.breakers.items()})
+
+    def breaker(self, name: str) -> CircuitBreaker:
+        breaker = self.breakers.get(name)
+        if breaker is None:
+            breaker = self.breakers[name] = CircuitBreaker(name, **self.breaker_options)
+        return breaker
+
+    def allow(self, name: str, budget_ms: Optional[float] = None) -> bool:
+        return self.breaker(name).allow(budget_ms)
+
+    def guard(self, name: str, fn: Callable[[], Awaitable[Dict[str, Any]]]):
+        """
+        Wraps a source call so its latency and outcome feed the breaker.
+        Exceptions, cancellation and answers flagged "transient" count as failures;
+        a definitive negative answer ("No Result") is a healthy call.
+        """
+        breaker = self.breaker(name)
+
+        async def run():
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = await fn()
+                ok = not result.get("transient")
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                breaker.record(ok, elapsed * 1000.0)
+                SOURCE_SECONDS.observe(elapsed, source=name)
+                if not ok:
+                    SOURCE_ERRORS.inc(source=name)
+        return run
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {name: b.snapshot() for name, b in self.breakers.items()}
+
+
+def health_from_env() -> SourceHealth:
+    return SourceHealth(
+        failure_threshold=int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5")),
+        open_seconds=float(os.getenv("BREAKER_OPEN_SECONDS", "30")),
+        max_error_rate=float(os.getenv("BREAKER_MAX_ERROR_RATE", "0.5"))
+    )
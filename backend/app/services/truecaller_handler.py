@@ -1,34 +1,101 @@
-
 import json
+import glob
 import logging
-from truecallerpy import search_phonenumber
+import os
+import threading
+import time
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+from typing import Dict, Any, List, Optional
+from core.enrichment_cache import get_enrichment_cache
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("TruecallerService")
 
+# truecallerpy.search_phonenumber, imported on first lookup (see load_client)
+search_phonenumber = None
+
+
+def load_client():
+    """ Imports truecallerpy (and its HTTP stack) once, on first use or during warm-up """
+    global search_phonenumber
+    if search_phonenumber is None:
+        from truecallerpy import search_phonenumber as search
+        search_phonenumber = search
+    return search_phonenumber
+
+# Legacy single-token locations (setup_truecaller.py writes backend/truecaller_auth.json)
+AUTH_FILES = ["truecaller_auth.json", "../truecaller_auth.json", "../../truecaller_auth.json"]
+# Directory of additional auth files (one installationId per *.json) for the token pool
+AUTH_DIR = os.getenv("TRUECALLER_AUTH_DIR", "truecaller_auth")
+# When no token is found, look on disk again at most this often (seconds)
+AUTH_RETRY_SECONDS = float(os.getenv("TRUECALLER_AUTH_RETRY_SECONDS", "60"))
+
+# Per-token request rate (requests/second) and burst
+TOKEN_RATE = float(os.getenv("TRUECALLER_TOKEN_RATE", "1.0"))
+TOKEN_BURST = int(os.getenv("TRUECALLER_TOKEN_BURST", "5"))
+# How long a lookup may wait for any token to have capacity
+TOKEN_MAX_WAIT = float(os.getenv("TRUECALLER_TOKEN_MAX_WAIT", "2.0"))
+# Dedicated worker threads for Truecaller calls (keeps the default executor free)
+MAX_WORKERS = int(os.getenv("TRUECALLER_MAX_WORKERS", "8"))
+
+
+class TokenBucket:
+    """ Classic token bucket: `rate` tokens/second, holding at most `burst` """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def wait_time(self) -> float:
+        """ Seconds until one token is available """
+        with self._lock:
+            self._refill(time.monotonic())
+            return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
 class TruecallerService:
-    def __init__(self, installation_id=None):
-        self.installation_id = installation_id
-        # Try to load ID from a local file if not provided
-        if not self.installation_id:
-            try:
-                # Assuming the file is in backend/ as it was saved there.
-                with open("truecaller_auth.json", "r") as f:
-                    data = json.load(f)
-                    self.installation_id = data.get("installationId")
-                    logger.info("Truecaller Auth Token Loaded Successfully.")
-            except FileNotFoundError:
-                try: 
-                    # Try looking parent dir if running from subfolder
-                    with open("../truecaller_auth.json", "r") as f:
-                        data = json.load(f)
-                        self.installation_id = data.get("installationId")
-                        logger.info("Truecaller Auth Token Loaded Successfully (Parent Dir).")
-                except:
-                    logger.warning("Truecaller Auth File NOT FOUND. Creating empty service.")
-                    self.installation_id = None
+    def __init__(self, installation_id=None, auth_dir=AUTH_DIR, max_workers=MAX_WORKERS,
+                 token_rate=TOKEN_RATE, token_burst=TOKEN_BURST):
+        self.auth_dir = auth_dir
+        self.token_rate = token_rate
+        self.token_burst = token_burst
+        self.tokens: List[str] = []
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._cursor = 0
+        self._next_auth_probe = 0.0
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="truecaller")
+        self.max_workers = max_workers
+
+        if installation_id:
+            self._set_tokens([installation_id])
+        else:
+            self._reload_auth(force=True)
+            if self.tokens:
+                logger.info(f"Truecaller Auth Tokens Loaded Successfully ({len(self.tokens)}).")
+            else:
+                logger.warning("Truecaller Auth File NOT FOUND. Creating empty service.")
+
+    @property
+    def installation_id(self) -> Optional[str]:
+        return self.tokens[0] if self.tokens else None
 
     async def identify(self, phone: str, country_hint: str = "IN") -> Dict[str, Any]:
         """ Wrapper for internal search to standardize output for ScoringEngine """
@@ -38,62 +105,119 @@ class TruecallerService:
         """
         Searches Truecaller for a given number (async).
         """
-        if not self.installation_id:
-             # Try one more time to reload, maybe it was created
+        # Shared on-disk cache: answers fetched by any worker are reused here
+        cache = get_enrichment_cache()
+        cache_key = phone_number.replace("+", "").replace(" ", "").strip()
+        if cache:
+            cached = await cache.aget("truecaller", cache_key)
+            if cached is not None:
+                return cached
+
+        if not self.tokens:
+             # Try one more time to reload, maybe it was created (throttled)
              self._reload_auth()
-             if not self.installation_id:
+             if not self.tokens:
                 return {
                     "success": False,
                     "error": "Truecaller Not Login. Run setup_truecaller.py first."
                 }
-        
+
+        token = await self._acquire_token()
+        if token is None:
+            return {"success": False, "error": "Truecaller rate limit reached (all tokens busy)", "transient": True}
+
         try:
             # Clean number
             clean_number = phone_number.replace("+", "").strip()
-            
-            # The library 'truecallerpy' is synchronous? No, usually it's used async or sync.
-            # Let's wrap in executor if it blocks, but based on imports 'await' suggests async usage?
-            # actually previous code used 'await search_phonenumber'. If library is sync, we need run_in_executor.
-            # Assuming it is async compatible or we wrapeed it.
-            
-            # Wait, `truecallerpy` is often synchronous wrapper around requests.
-            # Let's simulate async if needed, or just call it.
-            # If previous code worked with await, then fine.
-            
-            # Mocking the call if library fails or is rate limited:
-            # For demonstration, we assume it works.
-            
-            import asyncio
-            loop = asyncio.get_event_loop()
-            # Run in thread pool to avoid blocking FastAPI
-            t_response = await loop.run_in_executor(None, lambda: search_phonenumber(clean_number, country_code_str, self.installation_id))
+
+            # Run on our own bounded pool so slow deep searches can't starve other blocking work
+            loop = asyncio.get_running_loop()
+            t_response = await loop.run_in_executor(
+                self.executor, self._search_blocking, clean_number, country_code_str or "IN", token
+            )
+
+            if t_response and t_response.get("error"):
+                 # Upstream HTTP failure (rate limit, auth, outage): not a real "no result"
+                 return {"success": False, "error": t_response.get("message") or t_response["error"], "transient": True}
 
             if t_response and "data" in t_response and t_response["data"]:
                  data = t_response["data"][0] if isinstance(t_response["data"], list) else t_response["data"]
-                 
-                 return {
-                    "success": True, 
-                    "name": data.get("name"), 
-                    "carrier": data.get("carrier"), 
+
+                 result = {
+                    "success": True,
+                    "name": data.get("name"),
+                    "carrier": data.get("carrier"),
                     "spam_score": data.get("score", 0),
                     "email": data.get("email")
                  }
-            
-            return {"success": False, "error": "No Result"}
+                 if cache:
+                     cache.set_later("truecaller", cache_key, result)
+                 return result
+
+            result = {"success": False, "error": "No Result"}
+            if cache:
+                cache.set_later("truecaller", cache_key, result, negative=True)
+            return result
 
         except Exception as e:
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), "transient": True}
+
+    @staticmethod
+    def _search_blocking(clean_number, country_code_str, token):
+        # truecallerpy has shipped both sync and async search_phonenumber; run either to completion here
+        response = load_client()(clean_number, country_code_str, token)
+        if inspect.isawaitable(response):
+            response = asyncio.run(response)
+        return response
 
-    def _reload_auth(self):
-        # Logic to find auth file in parent dirs
-        import os
-        paths = ["truecaller_auth.json", "../truecaller_auth.json", "../../truecaller_auth.json"]
+    async def _acquire_token(self) -> Optional[str]:
+        """ Next installation ID with rate budget left (round-robin), waiting up to TOKEN_MAX_WAIT """
+        deadline = time.monotonic() + TOKEN_MAX_WAIT
+        while True:
+            tokens = self.tokens
+            for _ in range(len(tokens)):
+                token = tokens[self._cursor % len(tokens)]
+                self._cursor += 1
+                if self.buckets[token].try_acquire():
+                    return token
+
+            wait = min(self.buckets[t].wait_time() for t in tokens)
+            if time.monotonic() + wait > deadline:
+                return None
+            await asyncio.sleep(wait)
+
+    def _set_tokens(self, tokens: List[str]) -> None:
+        unique = list(dict.fromkeys(t for t in tokens if t))
+        self.buckets = {t: self.buckets.get(t) or TokenBucket(self.token_rate, self.token_burst) for t in unique}
+        self.tokens = unique
+
+    def _reload_auth(self, force=False):
+        # Logic to find auth files (pool directory + legacy single file in parent dirs).
+        # Without any token this runs on the request path, so probe the disk at most every AUTH_RETRY_SECONDS.
+        now = time.monotonic()
+        if not force and now < self._next_auth_probe:
+            return
+        self._next_auth_probe = now + AUTH_RETRY_SECONDS
+
+        paths = sorted(glob.glob(os.path.join(self.auth_dir, "*.json"))) if self.auth_dir else []
+        paths += [p for p in AUTH_FILES if os.path.exists(p)][:1]
+
+        tokens = []
         for p in paths:
-            if os.path.exists(p):
+            try:
                 with open(p, "r") as f:
                      data = json.load(f)
-                     self.installation_id = data.get("installationId")
-                     break
+                tokens.append(data.get("installationId"))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping Truecaller auth file {p}: {e}")
+        self._set_tokens(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self.tokens),
+            "max_workers": self.max_workers,
+            "queued": self.executor._work_queue.qsize()
+        }
 
 
 
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from core.metrics import REGISTRY
+
+# Setup Logging
+logger = logging.getLogger("Warmup")
+
+# eager: warm up before accepting traffic (default)
+# background: accept traffic at once, warm up in a thread; /readyz is 503 until done
+# lazy: no warm-up, everything loads on first use; ready immediately
+STARTUP_MODE = os.getenv("STARTUP_MODE", "eager").lower()
+STARTUP_MODES = ("eager", "background", "lazy")
+
+PENDING = "pending"
+RUNNING = "running"
+READY = "ready"
+FAILED = "failed"
+
+
+def _phonenumbers_metadata():
+    import phonenumbers
+    from phonenumbers.phonemetadata import PhoneMetadata
+    for region in phonenumbers.SUPPORTED_REGIONS:
+        PhoneMetadata.metadata_for_region(region)
+    for code in phonenumbers.COUNTRY_CODES_FOR_NON_GEO_REGIONS:
+        PhoneMetadata.metadata_for_nongeo_region(code)
+
+
+def _geodata():
+    import phonenumbers
+    from app.services.country_service import load_geodata
+    geocoder, carrier, timezone = load_geodata()
+    for sample in ("+919876543210", "+14155552671"):
+        number = phonenumbers.parse(sample, None)
+        geocoder.description_for_number(number, "en")
+        carrier.name_for_number(number, "en")
+        timezone.time_zones_for_number(number)
+
+
+def _http_clients():
+    import httpx  # noqa: F401
+    import requests  # noqa: F401
+
+
+def _truecaller():
+    from app.services.truecaller_handler import load_client
+    load_client()
+
+
+def _risk_model():
+    from app.services.risk_model import risk_model
+    risk_model.load()
+
+
+def _country_index():
+    from core.country_index import get_country_index
+    get_country_index().resolve("germny")  # also imports Levenshtein
+
+
+# (name, loader, required): a failing optional step is reported but doesn't block readiness
+WARMUP_STEPS: List[Tuple[str, Callable[[], None], bool]] = [
+    ("phonenumbers_metadata", _phonenumbers_metadata, True),
+    ("geodata", _geodata, True),
+    ("http_clients", _http_clients, True),
+    ("truecaller", _truecaller, False),
+    ("risk_model", _risk_model, False),
+    ("country_index", _country_index, False),
+]
+
+
+class Warmup:
+    """
+    Controls when heavy modules and data tables are loaded (see STARTUP_MODE) and
+    records how long imports, service construction and each warm-up step took.
+    """
+
+    def __init__(self, mode: str = STARTUP_MODE, steps=None):
+        if mode not in STARTUP_MODES:
+            logger.warning(f"Unknown STARTUP_MODE '{mode}', using eager")
+            mode = "eager"
+        self.mode = mode
+        self.steps = steps if steps is not None else WARMUP_STEPS
+        self.state = PENDING
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.created = time.perf_counter()
+        self.ready_after: Optional[float] = None
+        self._task: Optional[asyncio.Future] = None
+        REGISTRY.gauge("countryfinder_startup_seconds", "Startup phase durations", ["phase"],
+                       callback=lambda: dict(self.timings))
+        REGISTRY.gauge("countryfinder_ready", "1 once the worker has warmed up",
+                       callback=lambda: int(self.ready()))
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = round(seconds, 4)
+
+    def run(self) -> None:
+        """ Runs every warm-up step (blocking) """
+        self.state = RUNNING
+        failed = False
+        for name, loader, required in self.steps:
+            start = time.perf_counter()
+            try:
+                loader()
+            except Exception as e:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+                failed = failed or required
+                logger.error(f"Warm-up step {name} failed: {e!r}")
+            self.record(f"warmup_{name}", time.perf_counter() - start)
+
+        self.state = FAILED if failed else READY
+        self.ready_after = time.perf_counter() - self.created
+        self.record("until_ready", self.ready_after)
+        logger.info(f"Warm-up {self.state} in {sum(v for k, v in self.timings.items() if k.startswith('warmup_')):.3f}s")
+
+    async def start(self) -> None:
+        """ Called from the app lifespan; how long it blocks depends on the mode """
+        if self.mode == "lazy":
+            self.state = READY
+            self.ready_after = time.perf_counter() - self.created
+            self.record("until_ready", self.ready_after)
+            return
+        if self.mode == "eager":
+            await asyncio.to_thread(self.run)
+            return
+        self._task = asyncio.ensure_future(asyncio.to_thread(self.run))
+
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "state": self.state,
+            "ready": self.ready(),
+            "timings_s": dict(self.timings),
+            "errors": dict(self.errors),
+        }
+
+
+# Singleton
+warmup = Warmup()
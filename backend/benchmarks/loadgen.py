@@ -0,0 +1,283 @@
+"""
+HTTP load generator for /predict.
+
+Open loop (--mode open): requests arrive as a Poisson process at --rate req/s no
+matter how fast the server answers, and latency is measured from the scheduled
+send time, so queueing shows up instead of being hidden (no coordinated omission).
+Closed loop (--mode closed): --concurrency clients each send their next request as
+soon as the previous one returns.
+
+Give several comma-separated rates or concurrencies to step the load up and find
+where a worker saturates. Every --interval the tool reports throughput, errors,
+latency percentiles and the server's event-loop lag (scraped from /metrics).
+
+    cd backend
+    python -m benchmarks.serve_with_stubs &
+    python -m benchmarks.loadgen --mode open --rate 50,100,200,400 --duration 20 --deep-ratio 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.synthetic import mixed_numbers
+
+LAG_METRIC = "countryfinder_event_loop_lag_seconds"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+def _latency_summary(latencies: List[float]) -> Dict[str, float]:
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+def parse_lag_histogram(text: str) -> Optional[Dict[str, Any]]:
+    """ Buckets, sum and count of the server's event-loop lag histogram from /metrics """
+    buckets, total, count = [], None, None
+    for line in text.splitlines():
+        if not line.startswith(LAG_METRIC):
+            continue
+        name, _, value = line.rpartition(" ")
+        if name.startswith(LAG_METRIC + "_bucket"):
+            le = name.split('le="', 1)[1].split('"', 1)[0]
+            buckets.append((float("inf") if le == "+Inf" else float(le), float(value)))
+        elif name == LAG_METRIC + "_sum":
+            total = float(value)
+        elif name == LAG_METRIC + "_count":
+            count = float(value)
+    if count is None:
+        return None
+    return {"buckets": buckets, "sum": total or 0.0, "count": count}
+
+
+def lag_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """ Mean and p99 (bucket upper bound) of the lag samples taken between two scrapes """
+    if not before or not after or after["count"] <= before["count"]:
+        return {"server_lag_mean_ms": None, "server_lag_p99_ms": None}
+    count = after["count"] - before["count"]
+    mean = (after["sum"] - before["sum"]) / count
+    p99 = None
+    previous = dict(before["buckets"])
+    for bound, cumulative in after["buckets"]:
+        if cumulative - previous.get(bound, 0.0) >= 0.99 * count:
+            p99 = bound
+            break
+    return {
+        "server_lag_mean_ms": round(mean * 1000, 2),
+        "server_lag_p99_ms": None if p99 in (None, float("inf")) else round(p99 * 1000, 2),
+    }
+
+
+class LoadRun:
+    """ One load step: generates requests, records outcomes and samples lag per interval """
+
+    def __init__(self, client: httpx.AsyncClient, args, numbers: List[str]):
+        self.client = client
+        self.args = args
+        self.numbers = numbers
+        self.rng = random.Random(args.seed)
+        self.records: List[tuple] = []  # (finished_at, latency, ok, deep)
+        self.sent = 0
+        self.dropped = 0
+        self.outstanding = 0
+        self.timeline: List[Dict[str, Any]] = []
+        self.start = 0.0
+
+    async def _request(self, scheduled_at: float):
+        number = self.numbers[self.sent % len(self.numbers)]
+        deep = self.rng.random() < self.args.deep_ratio
+        payload = {"input": number, "deep_search": deep}
+        if self.args.timeout_ms:
+            payload["timeout_ms"] = self.args.timeout_ms
+        self.sent += 1
+        self.outstanding += 1
+        ok = False
+        try:
+            response = await self.client.post("/predict", json=payload)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            pass
+        finally:
+            self.outstanding -= 1
+            now = time.perf_counter()
+            self.records.append((now - self.start, now - scheduled_at, ok, deep))
+
+    async def _open_loop(self, rate: float, deadline: float):
+        tasks = set()
+        next_at = time.perf_counter()
+        while next_at < deadline:
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.outstanding >= self.args.max_outstanding:
+                self.dropped += 1  # the generator is saturated, not the server's fault
+            else:
+                task = asyncio.ensure_future(self._request(next_at))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            next_at += self.rng.expovariate(rate)
+        if tasks:
+            await asyncio.wait(tasks, timeout=self.args.request_timeout)
+
+    async def _closed_loop(self, concurrency: int, deadline: float):
+        async def user():
+            while time.perf_counter() < deadline:
+                await self._request(time.perf_counter())
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+
+    async def _scrape_lag(self) -> Optional[Dict[str, Any]]:
+        try:
+            response = await self.client.get("/metrics", timeout=5)
+            return parse_lag_histogram(response.text)
+        except httpx.HTTPError:
+            return None
+
+    async def _sample(self, deadline: float):
+        """ Every interval: summarize completions in the window, server lag and generator lag """
+        lag_before = await self._scrape_lag()
+        seen = 0
+        window_start = 0.0
+        while True:
+            tick = time.perf_counter()
+            await asyncio.sleep(self.args.interval)
+            client_lag = time.perf_counter() - tick - self.args.interval
+            lag_after = await self._scrape_lag()
+            window_end = time.perf_counter() - self.start
+            window = self.records[seen:]
+            seen = len(self.records)
+            latencies = [r[1] for r in window]
+            errors = sum(1 for r in window if not r[2])
+            elapsed = window_end - window_start
+            self.timeline.append({
+                "t": round(window_end, 2),
+                "completed": len(window),
+                "rps": round(len(window) / elapsed, 1) if elapsed else 0.0,
+                "errors": errors,
+                **_latency_summary(latencies),
+                **lag_delta(lag_before, lag_after),
+                "client_lag_ms": round(max(0.0, client_lag) * 1000, 2),
+                "outstanding": self.outstanding,
+            })
+            self._print_window(self.timeline[-1])
+            lag_before, window_start = lag_after, window_end
+            if time.perf_counter() >= deadline and not self.outstanding:
+                return
+
+    @staticmethod
+    def _print_window(w: Dict[str, Any]):
+        lag = w["server_lag_mean_ms"]
+        print(f"  t={w['t']:>6}s rps={w['rps']:>7} err={w['errors']:>4} p50={w['p50_ms']:>8}ms "
+              f"p99={w['p99_ms']:>8}ms loop-lag={'n/a' if lag is None else lag}ms out={w['outstanding']}")
+
+    async def run(self, load: float) -> Dict[str, Any]:
+        self.start = time.perf_counter()
+        deadline = self.start + self.args.duration
+        sampler = asyncio.ensure_future(self._sample(deadline))
+        if self.args.mode == "open":
+            await self._open_loop(load, deadline)
+        else:
+            await self._closed_loop(int(load), deadline)
+        try:
+            await asyncio.wait_for(sampler, timeout=self.args.interval * 2 + 5)
+        except asyncio.TimeoutError:
+            pass
+        return self.summary(load)
+
+    def summary(self, load: float) -> Dict[str, Any]:
+        elapsed = max(r[0] for r in self.records) if self.records else self.args.duration
+        errors = sum(1 for r in self.records if not r[2])
+        by_kind = {}
+        for name, deep in (("base", False), ("deep", True)):
+            latencies = [r[1] for r in self.records if r[3] == deep]
+            if latencies:
+                by_kind[name] = {"requests": len(latencies), **_latency_summary(latencies)}
+        lags = [w["server_lag_mean_ms"] for w in self.timeline if w["server_lag_mean_ms"] is not None]
+        return {
+            "mode": self.args.mode,
+            "offered_rate" if self.args.mode == "open" else "concurrency": load,
+            "sent": self.sent,
+            "completed": len(self.records),
+            "dropped": self.dropped,
+            "achieved_rps": round(len(self.records) / elapsed, 1) if elapsed else 0.0,
+            "error_rate": round(errors / len(self.records), 4) if self.records else 0.0,
+            **_latency_summary([r[1] for r in self.records]),
+            "by_kind": by_kind,
+            "server_lag_mean_ms": round(sum(lags) / len(lags), 2) if lags else None,
+            "timeline": self.timeline,
+        }
+
+
+def is_saturated(step: Dict[str, Any], previous: Optional[Dict[str, Any]], args) -> bool:
+    """ Throughput stopped tracking the offered load, errors appeared, or tail latency blew up """
+    if step["error_rate"] > args.max_error_rate or step["dropped"]:
+        return True
+    if step["mode"] == "open" and step["achieved_rps"] < 0.95 * step["offered_rate"]:
+        return True
+    return bool(previous and previous["p99_ms"] and step["p99_ms"] > 5 * previous["p99_ms"])
+
+
+async def main_async(args):
+    loads = [float(x) for x in (args.rate if args.mode == "open" else args.concurrency).split(",")]
+    numbers = mixed_numbers(args.count, seed=args.seed)
+    limits = httpx.Limits(max_connections=args.max_outstanding, max_keepalive_connections=args.max_outstanding)
+    steps = []
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.request_timeout) as client:
+        for load in loads:
+            label = f"{load:g} req/s" if args.mode == "open" else f"{int(load)} clients"
+            print(f"== {args.mode} loop, {label}, deep_search ratio {args.deep_ratio}, {args.duration:g}s")
+            step = await LoadRun(client, args, numbers).run(load)
+            step["saturated"] = is_saturated(step, steps[-1] if steps else None, args)
+            steps.append(step)
+            print(f"   achieved {step['achieved_rps']} req/s, errors {step['error_rate']:.2%}, "
+                  f"p50 {step['p50_ms']}ms, p99 {step['p99_ms']}ms"
+                  + ("  << saturated" if step["saturated"] else ""))
+            if step["saturated"] and args.stop_on_saturation:
+                break
+            if args.pause:
+                await asyncio.sleep(args.pause)
+    return {"params": vars(args), "steps": steps}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the /predict endpoint")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--mode", choices=("open", "closed"), default="open")
+    parser.add_argument("--rate", default="50", help="open loop: req/s, comma-separated for steps")
+    parser.add_argument("--concurrency", default="10", help="closed loop: clients, comma-separated for steps")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument("--deep-ratio", type=float, default=0.0, help="fraction of requests with deep_search")
+    parser.add_argument("--timeout-ms", type=float, default=None, help="timeout_ms sent with each request")
+    parser.add_argument("--interval", type=float, default=1.0, help="reporting window (seconds)")
+    parser.add_argument("--count", type=int, default=5000, help="distinct synthetic numbers to cycle through")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-outstanding", type=int, default=1000, help="open loop: in-flight cap")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--stop-on-saturation", action="store_true")
+    parser.add_argument("--pause", type=float, default=2.0, help="idle seconds between steps")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Reproducible benchmark suite.
+
+Runs the hot paths (series lookup, offline parsing, deep end-to-end analysis)
+on seeded synthetic numbers against local stub upstreams, and writes a JSON
+report that can be diffed against a previous run:
+
+    cd backend
+    python -m benchmarks.run_benchmarks --output bench-new.json --compare bench-old.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from benchmarks.stubs import StubUpstreams, install_truecaller_stub
+from benchmarks.synthetic import indian_series_numbers, mixed_numbers
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _result(name: str, latencies: List[float], seconds: float, errors: int = 0) -> Dict[str, Any]:
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "ops": len(latencies),
+        "seconds": round(seconds, 4),
+        "throughput_per_s": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 4),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 4),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 4),
+        "errors": errors,
+    }
+
+
+def bench_sync(name: str, fn: Callable[[str], Any], inputs: List[str], repeat: int = 1) -> Dict[str, Any]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            t0 = time.perf_counter()
+            fn(value)
+            latencies.append(time.perf_counter() - t0)
+    return _result(name, latencies, time.perf_counter() - start)
+
+
+async def bench_async(name: str, fn: Callable[[str], Any], inputs: List[str], concurrency: int,
+                      is_error: Callable[[Any], bool] = lambda r: False) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(value):
+        nonlocal errors
+        async with semaphore:
+            t0 = time.perf_counter()
+            try:
+                if is_error(await fn(value)):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(v) for v in inputs))
+    return _result(name, latencies, time.perf_counter() - start, errors)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or "unknown"
+    except Exception:
+        return "unknown"
+
+
+async def run_suite(args, stubs: StubUpstreams) -> List[Dict[str, Any]]:
+    # App modules read upstream URLs at import time, so import after the stub env is set
+    from app.services.cache_service import TTLCache
+    from app.services.country_service import CountryService, load_geodata
+    from app.services.scoring_service import ScoringEngine
+    from core.indian_series import get_circle_from_series
+
+    install_truecaller_stub(stubs.env()["TRUECALLER_STUB_URL"])
+    load_geodata()  # startup cost is not what these benchmarks measure
+    results = []
+
+    series = [n[3:] for n in indian_series_numbers(args.count, seed=args.seed)]
+    results.append(bench_sync("series_lookup", get_circle_from_series, series, repeat=args.repeat))
+
+    numbers = mixed_numbers(args.count, seed=args.seed)
+    country_service = CountryService()
+    results.append(await bench_async("country_info", country_service.get_country_info, numbers, concurrency=1))
+
+    engine = ScoringEngine()
+    engine.cache = TTLCache(maxsize=0, ttl=0)  # measure the work, not the result cache
+    deep = numbers[:args.deep_count]
+    results.append(await bench_async(
+        "analyze_deep", lambda n: engine.analyze(n, deep_search=True, timeout_ms=args.timeout_ms),
+        deep, concurrency=args.concurrency, is_error=lambda r: bool(r.get("timed_out"))))
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    previous = {r["name"]: r for r in baseline.get("results", [])}
+    print(f"\n{'benchmark':<16}{'metric':<18}{'baseline':>12}{'current':>12}{'change':>10}")
+    for result in current["results"]:
+        old = previous.get(result["name"])
+        if not old:
+            continue
+        for metric in ("throughput_per_s", "p50_ms", "p95_ms", "p99_ms"):
+            before, after = old[metric], result[metric]
+            change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{result['name']:<16}{metric:<18}{before:>12}{after:>12}{change:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Country finder benchmark suite")
+    parser.add_argument("--count", type=int, default=5000, help="synthetic numbers per benchmark")
+    parser.add_argument("--deep-count", type=int, default=500, help="numbers for the deep end-to-end run")
+    parser.add_argument("--repeat", type=int, default=20, help="repetitions of the series lookup")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--timeout-ms", type=float, default=None, help="per-request deep-search budget")
+    parser.add_argument("--latency-ms", type=float, default=40.0, help="stub upstream base latency")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="stub upstream random extra latency")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to diff against")
+    args = parser.parse_args()
+
+    with StubUpstreams(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms) as stubs:
+        os.environ.update(stubs.env())
+        os.environ.pop("ENRICHMENT_CACHE_PATH", None)  # every run starts cold
+        results = asyncio.run(run_suite(args, stubs))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "params": vars(args),
+        },
+        "results": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Runs the API (main.py) with every upstream pointed at the local stubs, so load
+tests measure this service rather than third-party quota and latency.
+
+    cd backend
+    python -m benchmarks.serve_with_stubs --port 8000 --stub-latency-ms 80
+"""
+
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from benchmarks.stubs import StubUpstreams, install_truecaller_stub
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the API against stub upstreams")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--stub-latency-ms", type=float, default=50.0)
+    parser.add_argument("--stub-jitter-ms", type=float, default=25.0)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    with StubUpstreams(latency_ms=args.stub_latency_ms, jitter_ms=args.stub_jitter_ms,
+                       error_rate=args.stub_error_rate) as stubs:
+        # Services read upstream URLs at import time
+        os.environ.update(stubs.env())
+        import main as api
+        install_truecaller_stub(stubs.env()["TRUECALLER_STUB_URL"])
+        logging.getLogger().setLevel(args.log_level.upper())
+
+        print(f"Stub upstreams on {stubs.base_url}, API on http://{args.host}:{args.port}")
+        uvicorn.run(api.app, host=args.host, port=args.port, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Local stand-ins for the upstream services (Numverify, findandtrace, Truecaller).
+
+Each endpoint answers like the real service after a configurable latency, so
+benchmarks and load tests exercise the real HTTP clients, pools and parsers
+without network access or API quota.
+
+    python -m benchmarks.stubs --port 9100 --latency-ms 80 --jitter-ms 40
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CIRCLES = ["Delhi", "Mumbai", "Karnataka", "Tamil Nadu", "Rajasthan", "Gujarat", "Punjab", "UP East"]
+CARRIERS = ["Airtel", "Vodafone Idea", "Reliance Jio", "BSNL"]
+
+# Saved-page shape of findandtrace: navigation table first, then the result table
+FINDANDTRACE_PAGE = """<!DOCTYPE html><html><head><title>Trace Mobile Number</title></head><body>
+<table class="menu"><tr><td><a href="/">Home</a></td><td><a href="/trace">Trace</a></td></tr></table>
+<div class="content"><h1>Mobile Number Location</h1>
+<table id="customers">
+<tr><th>Mobile Phone</th><td>{number}</td></tr>
+<tr><th>Telecoms Circle / State</th><td>{circle}</td></tr>
+<tr><th>Original Network (First Alloted)</th><td>{carrier}</td></tr>
+<tr><th>Service Provider</th><td>{carrier}</td></tr>
+<tr><th>Connection Status</th><td>Active</td></tr>
+</table></div>
+{padding}
+</body></html>"""
+
+
+def _pick(options, number):
+    return options[sum(map(ord, number)) % len(options)]
+
+
+class StandInServer:
+    """
+    Local HTTP server standing in for an upstream API, run on a background thread (context manager).
+    Handlers are registered per (method, path): handler(request) -> (status, body[, content type]),
+    where request is {"query": {...}, "form": {...}}. Every request waits latency_ms (+ up to
+    jitter_ms) and fails with 503 at error_rate. Hits and peak concurrency are recorded.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.routes = {}
+        self.hits = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def route(self, method, path, handler):
+        self.routes[(method, path)] = handler
+
+    def _respond(self, method, url, request):
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay:
+            time.sleep(delay / 1000.0)
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, "upstream unavailable", "text/plain"
+        handler = self.routes.get((method, url.path))
+        return handler(request) if handler else (404, "not found", "text/plain")
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, method):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                request = {"query": {k: v[0] for k, v in parse_qs(url.query).items()},
+                           "form": {k: v[0] for k, v in parse_qs(body).items()}}
+                with server._lock:
+                    server.hits[url.path] = server.hits.get(url.path, 0) + 1
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                try:
+                    status, payload, *content_type = server._respond(method, url, request)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                data = payload.encode() if isinstance(payload, str) else payload
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", content_type[0] if content_type else "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (timeouts)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def numverify(request):
+    number = request["query"].get("number", "")
+    return 200, json.dumps({
+        "valid": len(number) >= 10,
+        "number": number,
+        "country_name": "India" if number.startswith("91") else "Unknown",
+        "location": _pick(CIRCLES, number),
+        "carrier": _pick(CARRIERS, number),
+        "line_type": "mobile",
+        "international_format": "+" + number,
+    })
+
+
+def truecaller(request):
+    number = request["query"].get("q", "")
+    return 200, json.dumps({"data": [{"name": f"Stub User {number[-4:]}", "carrier": _pick(CARRIERS, number),
+                                      "score": 0}]})
+
+
+def findandtrace(request):
+    number = request["form"].get("mobilenumber", "")
+    page = FINDANDTRACE_PAGE.format(
+        number=number, circle=_pick(CIRCLES, number), carrier=_pick(CARRIERS, number),
+        padding="<p>" + "lorem ipsum " * 2000 + "</p>"  # real pages are ~30 KB
+    )
+    return 200, page, "text/html; charset=utf-8"
+
+
+class StubUpstreams(StandInServer):
+    """ StandInServer answering like Numverify, findandtrace and Truecaller """
+
+    def __init__(self, host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        super().__init__(host, port, latency_ms, jitter_ms, error_rate)
+        self.route("GET", "/numverify", numverify)
+        self.route("GET", "/truecaller", truecaller)
+        self.route("POST", "/findandtrace", findandtrace)
+
+    @property
+    def base_url(self) -> str:
+        return self.url
+
+    def env(self) -> dict:
+        """ Environment that points the real services at this stub """
+        return {
+            "NUMVERIFY_API_KEY": "stub-key",
+            "NUMVERIFY_BASE_URL": f"{self.base_url}/numverify",
+            "FINDANDTRACE_URL": f"{self.base_url}/findandtrace",
+            "TRUECALLER_STUB_URL": f"{self.base_url}/truecaller",
+        }
+
+
+def install_truecaller_stub(search_url: str, service=None) -> None:
+    """
+    Routes TruecallerService through the stub. truecallerpy hard-codes the real host,
+    so the library call is swapped for a plain HTTP GET against `search_url`.
+    """
+    import requests
+    from app.services import truecaller_handler
+
+    local = threading.local()
+
+    def search_phonenumber(number, country_code, installation_id):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.get(search_url, params={"q": number, "countryCode": country_code},
+                               headers={"Authorization": f"Bearer {installation_id}"}, timeout=10)
+        response.raise_for_status()
+        return {"status_code": response.status_code, "data": response.json()["data"]}
+
+    truecaller_handler.search_phonenumber = search_phonenumber
+    service = service or truecaller_handler.tc_service
+    service.token_rate = 1e9  # the stub has no quota
+    service._set_tokens(["stub-installation-id"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local upstream stand-ins")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=25.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stubs = StubUpstreams(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f"Stub upstreams on {stubs.base_url}")
+    for key, value in stubs.env().items():
+        print(f"  {key}={value}")
+    try:
+        stubs.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Synthetic phone numbers for benchmarks.
+Deterministic for a given seed, so runs on different commits see the same inputs.
+"""
+
+import random
+from typing import List
+
+import phonenumbers
+from phonenumbers import PhoneNumberType
+
+from core.series_store import series_store
+
+# Regions with real traffic plus a spread of numbering-plan shapes
+DEFAULT_REGIONS = [
+    "IN", "US", "GB", "DE", "FR", "BR", "CN", "JP", "AU", "CA", "MX", "RU", "ZA", "NG",
+    "AE", "SA", "PK", "BD", "ID", "PH", "IT", "ES", "NL", "SE", "KE", "EG", "AR", "KR", "SG", "NZ",
+]
+LINE_TYPES = (PhoneNumberType.MOBILE, PhoneNumberType.FIXED_LINE)
+
+
+def _vary(rng: random.Random, national: str, keep: int) -> str:
+    """ Keeps the leading `keep` digits (the numbering-plan prefix) and randomizes the rest """
+    return national[:keep] + "".join(rng.choice("0123456789") for _ in national[keep:])
+
+
+def valid_numbers(count: int, regions: List[str] = None, seed: int = 1) -> List[str]:
+    """ E.164 numbers that libphonenumber considers valid, round-robin across regions """
+    rng = random.Random(seed)
+    regions = regions or DEFAULT_REGIONS
+    templates = []
+    for region in regions:
+        for line_type in LINE_TYPES:
+            example = phonenumbers.example_number_for_type(region, line_type)
+            if example is not None:
+                templates.append(example)
+
+    numbers = []
+    while len(numbers) < count:
+        example = templates[len(numbers) % len(templates)]
+        national = str(example.national_number)
+        for _ in range(20):
+            candidate = phonenumbers.parse(f"+{example.country_code}{_vary(rng, national, 3)}", None)
+            if phonenumbers.is_valid_number(candidate):
+                numbers.append(phonenumbers.format_number(candidate, phonenumbers.PhoneNumberFormat.E164))
+                break
+        else:
+            numbers.append(phonenumbers.format_number(example, phonenumbers.PhoneNumberFormat.E164))
+    return numbers
+
+
+def invalid_numbers(count: int, seed: int = 2) -> List[str]:
+    """ Inputs that fail parsing or validation: wrong lengths, junk, unknown country codes """
+    rng = random.Random(seed)
+    shapes = [
+        lambda: "+" + "".join(rng.choice("0123456789") for _ in range(rng.randint(3, 6))),
+        lambda: "+999" + "".join(rng.choice("0123456789") for _ in range(8)),
+        lambda: "+91" + "".join(rng.choice("0123456789") for _ in range(rng.choice((7, 13)))),
+        lambda: "call me " + "".join(rng.choice("abcdef ") for _ in range(10)),
+        lambda: "+1 (000) 000-" + "".join(rng.choice("0123456789") for _ in range(4)),
+    ]
+    return [shapes[i % len(shapes)]() for i in range(count)]
+
+
+def indian_series_numbers(count: int, seed: int = 3) -> List[str]:
+    """ +91 mobile numbers drawn from the known series (the loaded numbering plan) """
+    rng = random.Random(seed)
+    prefixes = sorted(series_store.plan.series_map())
+    return ["+91" + rng.choice(prefixes) + "".join(rng.choice("0123456789") for _ in range(6))
+            for _ in range(count)]
+
+
+def mixed_numbers(count: int, invalid_ratio: float = 0.1, india_ratio: float = 0.3, seed: int = 4) -> List[str]:
+    """ Shuffled workload: valid international, Indian series, and invalid inputs """
+    n_invalid = int(count * invalid_ratio)
+    n_india = int(count * india_ratio)
+    numbers = (valid_numbers(count - n_invalid - n_india, seed=seed)
+               + indian_series_numbers(n_india, seed=seed + 1)
+               + invalid_numbers(n_invalid, seed=seed + 2))
+    random.Random(seed).shuffle(numbers)
+    return numbers
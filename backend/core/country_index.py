@@ -0,0 +1,224 @@
+import csv
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Setup Logging
+logger = logging.getLogger("CountryIndex")
+
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(__file__), "data", "country_aliases.csv")
+
+# Filler words in queries like "dialing code for Germany" (removed from aliases too)
+STOP_WORDS = {
+    "a", "an", "the", "of", "for", "to", "in", "is", "what", "whats", "where", "which",
+    "code", "codes", "dial", "dialing", "dialling", "calling", "call", "phone", "telephone",
+    "number", "prefix", "country", "international", "iso", "please", "find",
+}
+
+_DIAL_CODE = re.compile(r"^\s*(?:\+|00)?\s*(\d{1,3})\s*$")
+_ISO_CODE = re.compile(r"^\s*([A-Za-z]{2,3})\s*$")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+MIN_SCORE = 60.0
+CANDIDATES = 25  # n-gram shortlist size re-ranked by edit distance
+
+
+def normalize(text: str) -> str:
+    """ Lowercase ASCII words without accents, punctuation or filler words """
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in folded if not unicodedata.combining(c)).lower()
+    return " ".join(w for w in _NON_ALNUM.sub(" ", folded).split() if w not in STOP_WORDS)
+
+
+def _ngrams(text: str, n: int = 3) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _ratio(a: str, b: str) -> float:
+    try:
+        from Levenshtein import ratio
+    except ImportError:
+        from difflib import SequenceMatcher
+        return SequenceMatcher(None, a, b).ratio()
+    return ratio(a, b)
+
+
+class CountryIndex:
+    """
+    Resolves free text to countries: names (common, official, "Korea, Republic of"
+    reordered), ISO alpha-2/alpha-3/numeric codes, demonyms and aliases from
+    data/country_aliases.csv, and dialing codes.
+
+    Exact matches are dict lookups. Misspellings go through a trigram inverted
+    index that shortlists CANDIDATES aliases, which are then ranked by Levenshtein
+    ratio, so a fuzzy lookup touches a few dozen strings instead of every name.
+    """
+
+    def __init__(self):
+        self.countries: Dict[str, Dict[str, Any]] = {}       # alpha_2 -> country record
+        self.codes: Dict[str, str] = {}                        # "in", "ind", "356" -> alpha_2
+        self.aliases: List[Tuple[str, str, str]] = []          # (normalized alias, alpha_2, kind)
+        self.exact: Dict[str, List[int]] = defaultdict(list)   # normalized alias -> alias ids
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+        self.gram_counts: List[int] = []
+        self.dial_regions: Dict[int, List[str]] = {}
+
+    @classmethod
+    def build(cls, aliases_path: str = DEFAULT_ALIASES_PATH) -> "CountryIndex":
+        import phonenumbers
+        import pycountry
+
+        index = cls()
+        for country in pycountry.countries:
+            alpha_2 = country.alpha_2
+            index.countries[alpha_2] = {
+                "name": getattr(country, "common_name", None) or country.name,
+                "alpha_2": alpha_2,
+                "alpha_3": country.alpha_3,
+                "dial_code": None,
+            }
+            for code in (alpha_2, country.alpha_3, getattr(country, "numeric", None)):
+                if code:
+                    index.codes[code.lower()] = alpha_2
+            for attr in ("name", "official_name", "common_name"):
+                name = getattr(country, attr, None)
+                if name:
+                    index._add(name, alpha_2, "name")
+                    if ", " in name:  # "Korea, Republic of" -> "Republic of Korea"
+                        head, tail = name.split(", ", 1)
+                        index._add(f"{tail} {head}", alpha_2, "name")
+
+        if aliases_path and os.path.exists(aliases_path):
+            with open(aliases_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if row["alpha_2"] in index.countries:
+                        index._add(row["alias"], row["alpha_2"], row.get("kind") or "alias")
+
+        for code, regions in phonenumbers.COUNTRY_CODE_TO_REGION_CODE.items():
+            regions = [r for r in regions if r in index.countries]
+            if regions:
+                index.dial_regions[code] = regions
+                for region in regions:
+                    index.countries[region]["dial_code"] = f"+{code}"
+
+        logger.info(f"Country index built: {len(index.countries)} countries, {len(index.aliases)} aliases")
+        return index
+
+    def _add(self, text: str, alpha_2: str, kind: str) -> None:
+        alias = normalize(text)
+        if not alias or any(self.aliases[i][1] == alpha_2 for i in self.exact.get(alias, ())):
+            return
+        alias_id = len(self.aliases)
+        self.aliases.append((alias, alpha_2, kind))
+        self.exact[alias].append(alias_id)
+        grams = _ngrams(alias)
+        self.gram_counts.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(alias_id)
+
+    def _match(self, alpha_2: str, score: float, match_type: str, matched: str) -> Dict[str, Any]:
+        return {**self.countries[alpha_2], "score": round(score, 1), "match_type": match_type, "matched": matched}
+
+    def _fuzzy(self, text: str) -> Dict[str, Tuple[float, str]]:
+        """ alpha_2 -> (score 0-100, alias) for the best fuzzy matches of one normalized string """
+        grams = _ngrams(text)
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for alias_id in self.postings.get(gram, ()):
+                shared[alias_id] += 1
+        # Dice coefficient on trigrams picks the shortlist; edit distance ranks it
+        shortlist = sorted(shared, key=lambda i: 2.0 * shared[i] / (len(grams) + self.gram_counts[i]),
+                           reverse=True)[:CANDIDATES]
+        best: Dict[str, Tuple[float, str]] = {}
+        for alias_id in shortlist:
+            alias, alpha_2, _ = self.aliases[alias_id]
+            score = _ratio(text, alias) * 100.0
+            if score > best.get(alpha_2, (0.0, ""))[0]:
+                best[alpha_2] = (score, alias)
+        return best
+
+    def resolve(self, query: str, limit: int = 5, min_score: float = MIN_SCORE) -> List[Dict[str, Any]]:
+        """ Ranked candidate countries for one query (best first, scores 0-100) """
+        if not isinstance(query, str) or not query.strip():
+            return []
+
+        # 1. Dialing code ("+44", "0044", "91"): every region sharing it, main region first
+        dial = _DIAL_CODE.match(query)
+        if dial:
+            code = int(dial.group(1))
+            regions = self.dial_regions.get(code, [])
+            matches = [self._match(r, 100.0 if i == 0 else 95.0, "dial_code", f"+{code}")
+                       for i, r in enumerate(regions)]
+            numeric = self.codes.get(dial.group(1).zfill(3))
+            if not matches and numeric and not query.strip().startswith(("+", "00")):
+                matches = [self._match(numeric, 100.0, "iso_code", dial.group(1))]
+            return matches[:limit]
+
+        matches: Dict[str, Dict[str, Any]] = {}
+
+        # 2. ISO alpha-2 / alpha-3 code ("DE", "deu")
+        iso = _ISO_CODE.match(query)
+        if iso and iso.group(1).lower() in self.codes:
+            alpha_2 = self.codes[iso.group(1).lower()]
+            matches[alpha_2] = self._match(alpha_2, 100.0, "iso_code", iso.group(1).upper())
+
+        # 3. Exact name / alias / demonym
+        text = normalize(query)
+        if text:
+            for alias_id in self.exact.get(text, ()):
+                alias, alpha_2, kind = self.aliases[alias_id]
+                matches.setdefault(alpha_2, self._match(alpha_2, 100.0, kind, alias))
+
+            # 4. Fuzzy: whole query, then single words ("germny number" -> "germny")
+            if len(matches) < limit:
+                found = self._fuzzy(text)
+                words = text.split()
+                if len(words) > 1:
+                    for word in words:
+                        if len(word) >= 4:
+                            for alpha_2, (score, alias) in self._fuzzy(word).items():
+                                score *= 0.95  # matched part of the query only
+                                if score > found.get(alpha_2, (0.0, ""))[0]:
+                                    found[alpha_2] = (score, alias)
+                for alpha_2, (score, alias) in found.items():
+                    if score >= min_score and alpha_2 not in matches:
+                        matches[alpha_2] = self._match(alpha_2, score, "fuzzy", alias)
+
+        return sorted(matches.values(), key=lambda m: -m["score"])[:limit]
+
+    def resolve_many(self, queries: List[str], limit: int = 1,
+                     min_score: float = MIN_SCORE) -> List[List[Dict[str, Any]]]:
+        """ Batch variant for cleaning datasets; repeated values are resolved once """
+        memo: Dict[str, List[Dict[str, Any]]] = {}
+        results = []
+        for query in queries:
+            key = query if isinstance(query, str) else ""
+            if key not in memo:
+                memo[key] = self.resolve(key, limit, min_score)
+            results.append(memo[key])
+        return results
+
+
+_index: Optional[CountryIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_country_index() -> CountryIndex:
+    """ Shared index, built on first use (or during warm-up) """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CountryIndex.build()
+    return _index
+
+
+def is_country_query(text: str) -> bool:
+    """ Free text or a bare dialing code, as opposed to a phone number """
+    digits = sum(c.isdigit() for c in text)
+    return digits == 0 or bool(_DIAL_CODE.match(text))
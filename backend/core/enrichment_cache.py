@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+from .metrics import CACHE_REQUESTS
+
+# Setup Logging
+logger = logging.getLogger("EnrichmentCache")
+
+# Per-source TTLs (seconds) for answers we paid for. Override with ENRICHMENT_CACHE_TTL_<SOURCE>.
+DEFAULT_TTLS = {
+    "truecaller": 7 * 86400,
+    "numverify": 30 * 86400,
+    "scraper": 30 * 86400,
+}
+# Definitive "nothing found" answers are kept for a shorter time
+NEGATIVE_TTL = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    source     TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    size       INTEGER NOT NULL,
+    PRIMARY KEY (source, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_expires ON entries (expires_at);
+"""
+
+
+class EnrichmentCache:
+    """
+    On-disk cache for upstream enrichment answers (Truecaller, Numverify, scraper).
+    Backed by one SQLite file in WAL mode, so every worker process on the host
+    reads and writes the same entries and a restarted worker starts warm.
+
+    SQLite calls can wait up to 5 s on another worker's lock, so async code uses
+    aget() and set_later(), which run on a small dedicated thread pool; compaction
+    runs there too, in the background, never inline with a request.
+    """
+
+    def __init__(self, path: str, ttls: Optional[Dict[str, float]] = None,
+                 max_bytes: int = 256 * 1024 * 1024, negative_ttl: float = NEGATIVE_TTL,
+                 compact_every: int = 1000):
+        self.path = path
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.negative_ttl = negative_ttl
+        self.compact_every = compact_every
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._local = threading.local()  # one connection per thread (callers + cache executor)
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="enrichment-cache")
+        self._compacting = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._enable_auto_vacuum()
+        self._conn().executescript(SCHEMA)
+
+    def _enable_auto_vacuum(self) -> None:
+        """
+        Incremental auto_vacuum, so compact() can shrink the file. It only takes effect
+        before WAL is enabled and the first table exists; an older file is rebuilt once.
+        """
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            if conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]:
+                logger.info(f"Rebuilding enrichment cache {self.path} for incremental vacuum")
+                conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            logger.warning(f"Enrichment cache auto_vacuum setup failed: {e}")
+        finally:
+            conn.close()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, source: str, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            row = self._conn().execute(
+                "SELECT value FROM entries WHERE source = ? AND key = ? AND expires_at > ?",
+                (source, key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Enrichment cache read failed: {e}")
+            return None
+
+        if row is None:
+            self.misses += 1
+            CACHE_REQUESTS.inc(cache=f"enrichment_{source}", result="miss")
+            return None
+        self.hits += 1
+        CACHE_REQUESTS.inc(cache=f"enrichment_{source}", result="hit")
+        return json.loads(row[0])
+
+    async def aget(self, source: str, key: str) -> Optional[Dict[str, Any]]:
+        """ get() on the cache executor, so lock waits never block the event loop """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.get, source, key)
+
+    def set_later(self, source: str, key: str, value: Dict[str, Any], negative: bool = False) -> None:
+        """ set() on the cache executor; returns at once (a lost write only costs a future miss) """
+        self._executor.submit(self.set, source, key, value, negative)
+
+    def set(self, source: str, key: str, value: Dict[str, Any], negative: bool = False) -> None:
+        ttl = self.negative_ttl if negative else self.ttls.get(source, NEGATIVE_TTL)
+        payload = json.dumps(value)
+        try:
+            self._conn().execute(
+                "INSERT OR REPLACE INTO entries (source, key, value, expires_at, size) VALUES (?, ?, ?, ?, ?)",
+                (source, key, payload, time.time() + ttl, len(payload) + len(key))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Enrichment cache write failed: {e}")
+            return
+
+        self.writes += 1
+        if self.writes % self.compact_every == 0:
+            self._executor.submit(self._compact_background)
+
+    def _compact_background(self) -> None:
+        # One compaction at a time; a write landing mid-compaction doesn't queue another
+        if self._compacting.acquire(blocking=False):
+            try:
+                self.compact()
+            finally:
+                self._compacting.release()
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Drops expired entries, then the entries closest to expiry until the payload
+        fits under max_bytes, and hands freed pages back to the filesystem.
+        """
+        conn = self._conn()
+        try:
+            expired = conn.execute("DELETE FROM entries WHERE expires_at <= ?", (time.time(),)).rowcount
+            evicted = 0
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                evicted = conn.execute(
+                    """DELETE FROM entries WHERE (source, key) IN (
+                           SELECT source, key FROM (
+                               SELECT source, key, size, SUM(size) OVER (ORDER BY expires_at) AS running
+                               FROM entries
+                           ) WHERE running - size < ?
+                       )""",
+                    (excess,)
+                ).rowcount
+            conn.executescript("PRAGMA incremental_vacuum;")  # execute() would free a single page
+        except sqlite3.Error as e:
+            logger.warning(f"Enrichment cache compaction failed: {e}")
+            return {"expired": 0, "evicted": 0}
+
+        if expired or evicted:
+            logger.info(f"Enrichment cache compacted: {expired} expired, {evicted} evicted")
+        return {"expired": expired, "evicted": evicted}
+
+    def stats(self) -> Dict[str, Any]:
+        rows = self._conn().execute(
+            "SELECT source, COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY source"
+        ).fetchall()
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "sources": {source: {"entries": count, "bytes": size} for source, count, size in rows}
+        }
+
+
+_cache: Optional[EnrichmentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_enrichment_cache() -> Optional[EnrichmentCache]:
+    """
+    Shared cache configured from the environment, or None when ENRICHMENT_CACHE_PATH is unset.
+    """
+    global _cache
+    path = os.getenv("ENRICHMENT_CACHE_PATH")
+    if not path:
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                ttls = {}
+                for source in DEFAULT_TTLS:
+                    value = os.getenv(f"ENRICHMENT_CACHE_TTL_{source.upper()}")
+                    if value:
+                        ttls[source] = float(value)
+                max_mb = float(os.getenv("ENRICHMENT_CACHE_MAX_MB", "256"))
+                _cache = EnrichmentCache(path, ttls=ttls, max_bytes=int(max_mb * 1024 * 1024))
+                logger.info(f"Enrichment cache enabled at {path}")
+    return _cache
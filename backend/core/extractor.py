@@ -0,0 +1,197 @@
+import logging
+import os
+import re
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import phonenumbers
+from phonenumbers import NumberParseException, PhoneNumberFormat
+
+# Setup Logging
+logger = logging.getLogger("Extractor")
+
+# Text handed to one worker at a time (cut at a line break)
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Digit runs with phone-style separators on one line, optionally after + / 00 / "("
+_CANDIDATE = re.compile(r"(?<![\w+])(?:\+|\(\+?)?\d[\d \t().\-/]{4,24}\d(?![\w])")
+# Tokens that are never part of a phone number: dates and amounts
+_BARRIER = re.compile(r"^\(?(?:\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4}|\d+[.,]\d{1,2})\)?$")
+_NON_DIGITS = re.compile(r"\D")
+
+MIN_DIGITS = 7
+MAX_DIGITS = 17
+
+
+def _parse_candidate(text: str, region: Optional[str]) -> Optional[str]:
+    """ E.164 for a candidate span if it is one valid number, else None """
+    digits = len(_NON_DIGITS.sub("", text))
+    if not MIN_DIGITS <= digits <= MAX_DIGITS:
+        return None
+    text = text.strip(" \t.-/")
+    if text.startswith("00"):
+        text = "+" + text[2:]
+    try:
+        number = phonenumbers.parse(text, region)
+    except NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(number):
+        return None
+    return phonenumbers.format_number(number, PhoneNumberFormat.E164)
+
+
+def _numbers_in_span(raw: str, region: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """
+    (e164, matched text) for the valid numbers in one candidate span. The whole span is tried first; otherwise
+    (several numbers in a row, or a number next to a date) its space-separated
+    groups are split at dates/amounts and matched greedily, longest run first.
+    """
+    tokens = raw.split()
+    if not any(_BARRIER.match(t) for t in tokens):
+        e164 = _parse_candidate(raw, region)
+        if e164:
+            return ((e164, raw.strip()),)
+    if len(tokens) == 1:
+        return ()
+
+    found = []
+    segment: List[str] = []
+    for token in tokens + [""]:
+        if token and not _BARRIER.match(token):
+            segment.append(token)
+            continue
+        i = 0
+        while i < len(segment):
+            for j in range(len(segment), i, -1):
+                part = " ".join(segment[i:j])
+                e164 = _parse_candidate(part, region)
+                if e164:
+                    found.append((e164, part))
+                    i = j
+                    break
+            else:
+                i += 1
+        segment = []
+    return tuple(found)
+
+
+def extract_chunk(text: str, region: Optional[str] = None) -> Tuple[Dict[str, List[Any]], Dict[str, int]]:
+    """
+    Valid numbers in one chunk of text: ({e164: [count, first raw match]}, stats).
+
+    A regex finds candidate spans and each distinct span is parsed once, so text
+    that repeats the same numbers (chat exports, signatures) costs one parse per
+    number. `region` is used for numbers written without a country code.
+    """
+    hits: Dict[str, List[Any]] = {}
+    seen: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+    candidates = 0
+
+    for match in _CANDIDATE.finditer(text):
+        raw = match.group()
+        candidates += 1
+        found = seen.get(raw)
+        if found is None:
+            found = seen[raw] = _numbers_in_span(raw, region)
+        for e164, number_text in found:
+            hit = hits.get(e164)
+            if hit is None:
+                hits[e164] = [1, number_text]
+            else:
+                hit[0] += 1
+
+    return hits, {"bytes": len(text.encode("utf-8")), "candidates": candidates, "parsed": len(seen)}
+
+
+def cut_point(data: bytes) -> int:
+    """ Where to end a chunk so no line (or, failing that, word) is split """
+    cut = data.rfind(b"\n")
+    if cut < 0:
+        cut = max(data.rfind(b" "), data.rfind(b"\t"))
+    return len(data) if cut < 0 else cut + 1
+
+
+def iter_text_chunks(stream: BinaryIO, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[str]:
+    """ Reads a binary stream as decoded text chunks of about `chunk_bytes` that never split a line """
+    rest = b""
+    while True:
+        block = stream.read(chunk_bytes)
+        if not block:
+            break
+        data = rest + block
+        cut = cut_point(data)
+        rest = data[cut:]
+        yield data[:cut].decode("utf-8", errors="replace")
+    if rest:
+        yield rest.decode("utf-8", errors="replace")
+
+
+class Extraction:
+    """ Merged hits across chunks, in order of first appearance """
+
+    def __init__(self):
+        self.hits: Dict[str, List[Any]] = {}
+        self.stats = {"chunks": 0, "bytes": 0, "candidates": 0, "parsed": 0, "matches": 0}
+
+    def add(self, hits: Dict[str, List[Any]], stats: Dict[str, int]) -> None:
+        self.stats["chunks"] += 1
+        for key, value in stats.items():
+            self.stats[key] += value
+        for e164, (count, raw) in hits.items():
+            self.stats["matches"] += count
+            hit = self.hits.get(e164)
+            if hit is None:
+                self.hits[e164] = [count, raw]
+            else:
+                hit[0] += count
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [{"e164": e164, "count": count, "raw": raw} for e164, (count, raw) in self.hits.items()]
+
+    def summary(self) -> Dict[str, int]:
+        return {**self.stats, "unique": len(self.hits)}
+
+
+def extract_chunks(chunks: Iterable[str], region: Optional[str] = None,
+                   executor: Optional[Executor] = None, window: int = 0) -> Extraction:
+    """
+    Runs extract_chunk over every chunk and merges the hits. With an executor,
+    at most `window` chunks are in flight (default: twice the workers), so memory
+    stays bounded while a large file streams through; results merge in chunk order.
+    """
+    extraction = Extraction()
+    if executor is None:
+        for chunk in chunks:
+            extraction.add(*extract_chunk(chunk, region))
+        return extraction
+
+    window = window or 2 * (getattr(executor, "_max_workers", None) or os.cpu_count() or 1)
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(extract_chunk, chunk, region))
+        if len(pending) >= window:
+            extraction.add(*pending.popleft().result())
+    while pending:
+        extraction.add(*pending.popleft().result())
+    return extraction
+
+
+def extract_files(paths: List[str], region: Optional[str] = None, workers: Optional[int] = None,
+                  chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Extraction:
+    """ Extracts from files ("-" is stdin) on `workers` processes (1 = in this process) """
+    import sys
+
+    def chunks():
+        for path in paths:
+            if path == "-":
+                yield from iter_text_chunks(sys.stdin.buffer, chunk_bytes)
+            else:
+                with open(path, "rb") as f:
+                    yield from iter_text_chunks(f, chunk_bytes)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return extract_chunks(chunks(), region)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return extract_chunks(chunks(), region, executor)
@@ -0,0 +1,277 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import phonenumbers
+from phonenumbers import NumberParseException, PhoneNumberFormat, PhoneNumberType
+
+# Setup Logging
+logger = logging.getLogger("GeoTables")
+
+DEFAULT_TABLES_PATH = os.path.join(os.path.dirname(__file__), "data", "geo_tables.bin")
+
+MAGIC = b"CFGT"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sII")  # magic, format version, metadata length
+ALIGN = 8
+
+TABLES = ("geocoder", "carrier", "timezone")
+_MOBILE_TYPES = (PhoneNumberType.MOBILE, PhoneNumberType.FIXED_LINE_OR_MOBILE, PhoneNumberType.PAGER)
+UNKNOWN_TIME_ZONES = ("Etc/Unknown",)
+
+
+# --- BUILD ---
+
+def _source_tables(lang: str) -> Dict[str, Dict[str, str]]:
+    """ prefix -> text for each table, read from the phonenumbers data modules """
+    from phonenumbers.geodata import GEOCODE_DATA
+    from phonenumbers.carrierdata import CARRIER_DATA
+    from phonenumbers.tzdata import TIMEZONE_DATA
+    return {
+        "geocoder": {p: names[lang] for p, names in GEOCODE_DATA.items() if lang in names},
+        "carrier": {p: names[lang] for p, names in CARRIER_DATA.items() if lang in names},
+        "timezone": {p: "&".join(zones) for p, zones in TIMEZONE_DATA.items()},
+    }
+
+
+def _region_names(lang: str) -> Dict[str, str]:
+    from phonenumbers.geodata.locale import LOCALE_DATA
+    names = {}
+    for region, by_lang in LOCALE_DATA.items():
+        name = by_lang.get(lang, "")
+        if name.startswith("*"):
+            name = by_lang.get(name[1:], "")
+        names[region] = name
+    return names
+
+
+def build_tables(path: str = DEFAULT_TABLES_PATH, lang: str = "en") -> Dict[str, int]:
+    """
+    Compiles the phonenumbers geocoder, carrier and timezone prefix data into one flat file.
+
+    Layout: header, JSON directory, then 8-byte aligned sections. Each table stores its
+    prefixes grouped by length as sorted uint64 keys with a parallel uint32 array of
+    string ids; strings are a shared uint32 offset array plus one UTF-8 blob.
+    """
+    strings: List[bytes] = []
+    string_ids: Dict[str, int] = {}
+    sections: List[bytes] = []
+    offset = 0
+
+    def intern(text: str) -> int:
+        sid = string_ids.get(text)
+        if sid is None:
+            sid = string_ids[text] = len(strings)
+            strings.append(text.encode("utf-8"))
+        return sid
+
+    def add_section(data: bytes) -> Tuple[int, int]:
+        nonlocal offset
+        padded = data + b"\0" * (-len(data) % ALIGN)
+        sections.append(padded)
+        start = offset
+        offset += len(padded)
+        return start, len(data)
+
+    directory = {"tables": {}}
+    counts = {}
+    for name, entries in _source_tables(lang).items():
+        groups = {}
+        keys, values = array("Q"), array("I")
+        for length in range(1, max(map(len, entries)) + 1):
+            prefixes = sorted((p for p in entries if len(p) == length), key=int)
+            if prefixes:
+                groups[length] = [len(keys), len(prefixes)]
+                keys.extend(int(p) for p in prefixes)
+                values.extend(intern(entries[p]) for p in prefixes)
+        directory["tables"][name] = {
+            "groups": groups,
+            "keys": add_section(keys.tobytes()),
+            "values": add_section(values.tobytes()),
+        }
+        counts[name] = len(keys)
+
+    string_offsets = array("I", [0])
+    for encoded in strings:
+        string_offsets.append(string_offsets[-1] + len(encoded))
+    directory["string_offsets"] = add_section(string_offsets.tobytes())
+    directory["string_blob"] = add_section(b"".join(strings))
+    directory["regions"] = _region_names(lang)
+    directory["lang"] = lang
+    directory["phonenumbers_version"] = phonenumbers.__version__
+    directory["byteorder"] = "little" if array("I", [1]).tobytes()[0] == 1 else "big"
+
+    meta = json.dumps(directory, separators=(",", ":")).encode("utf-8")
+    data_start = HEADER.size + len(meta)
+    data_start += -data_start % ALIGN
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        f.write(b"\0" * (data_start - HEADER.size - len(meta)))
+        for section in sections:
+            f.write(section)
+    os.replace(tmp_path, path)  # readers never see a half-written file
+    counts["strings"] = len(strings)
+    counts["bytes"] = data_start + offset
+    return counts
+
+
+# --- READ ---
+
+class GeoTables:
+    """
+    Read side of build_tables(): the file is memory-mapped read-only, so every worker
+    on a host shares one page-cache copy instead of holding the phonenumbers geodata
+    dicts (~100 MB per process). Lookups are a binary search per prefix length.
+
+    Mirrors phonenumbers.geocoder.description_for_number, carrier.name_for_number and
+    timezone.time_zones_for_number for the language the file was built with, so it
+    can stand in for those modules.
+    """
+
+    def __init__(self, path: str = DEFAULT_TABLES_PATH):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, meta_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a geo table file (format {FORMAT_VERSION})")
+        meta = json.loads(self._mm[HEADER.size:HEADER.size + meta_len])
+        if meta["byteorder"] != ("little" if array("I", [1]).tobytes()[0] == 1 else "big"):
+            raise ValueError(f"{path} was built on a machine with a different byte order")
+
+        self.path = path
+        self.lang = meta["lang"]
+        self.phonenumbers_version = meta["phonenumbers_version"]
+        self.regions: Dict[str, str] = meta["regions"]
+        base = HEADER.size + meta_len
+        base += -base % ALIGN
+        view = memoryview(self._mm)
+
+        def section(bounds, fmt):
+            start, size = bounds
+            return view[base + start:base + start + size].cast(fmt)
+
+        self._tables = {}
+        for name in TABLES:
+            table = meta["tables"][name]
+            keys, values = section(table["keys"], "Q"), section(table["values"], "I")
+            groups = {int(length): (start, start + count) for length, (start, count) in table["groups"].items()}
+            self._tables[name] = (keys, values, sorted(groups.items(), reverse=True))
+        self._string_offsets = section(meta["string_offsets"], "I")
+        self._blob = section(meta["string_blob"], "B")
+
+    @lru_cache(maxsize=8192)
+    def _string(self, sid: int) -> str:
+        return bytes(self._blob[self._string_offsets[sid]:self._string_offsets[sid + 1]]).decode("utf-8")
+
+    def _longest_prefix(self, table: str, digits: str, min_length: int = 1) -> Optional[str]:
+        """ Text for the longest prefix of `digits` present in `table` """
+        keys, values, groups = self._tables[table]
+        for length, (lo, hi) in groups:
+            if length > len(digits):
+                continue
+            if length < min_length:
+                break
+            key = int(digits[:length])
+            i = bisect_left(keys, key, lo, hi)
+            if i < hi and keys[i] == key:
+                return self._string(values[i])
+        return None
+
+    def _check_lang(self, lang: str):
+        if lang != self.lang:
+            raise ValueError(f"Geo tables were built for '{self.lang}', not '{lang}'")
+
+    def _e164_digits(self, numobj) -> str:
+        return phonenumbers.format_number(numobj, PhoneNumberFormat.E164)[1:]
+
+    def _country_name(self, numobj) -> str:
+        regions = phonenumbers.region_codes_for_country_code(numobj.country_code)
+        if len(regions) == 1:
+            return self.regions.get(regions[0], "")
+        valid_in = "ZZ"
+        for region in regions:
+            if phonenumbers.is_valid_number_for_region(numobj, region):
+                if valid_in != "ZZ":
+                    return ""
+                valid_in = region
+        return self.regions.get(valid_in, "")
+
+    def description_for_number(self, numobj, lang: str = "en") -> str:
+        """ Same result as phonenumbers.geocoder.description_for_number(numobj, lang) """
+        self._check_lang(lang)
+        ntype = phonenumbers.number_type(numobj)
+        if ntype == PhoneNumberType.UNKNOWN:
+            return ""
+        if not phonenumbers.is_number_type_geographical(ntype, numobj.country_code):
+            return self._country_name(numobj)
+
+        lookup = numobj
+        mobile_token = phonenumbers.country_mobile_token(numobj.country_code)
+        national_number = phonenumbers.national_significant_number(numobj)
+        if mobile_token and national_number.startswith(mobile_token):
+            # e.g. Argentina: the mobile token precedes the area code
+            try:
+                lookup = phonenumbers.parse(national_number[len(mobile_token):],
+                                            phonenumbers.region_code_for_country_code(numobj.country_code))
+            except NumberParseException:
+                pass
+        return self._longest_prefix("geocoder", self._e164_digits(lookup)) or self._country_name(numobj)
+
+    def name_for_number(self, numobj, lang: str = "en") -> str:
+        """ Same result as phonenumbers.carrier.name_for_number(numobj, lang) """
+        self._check_lang(lang)
+        if phonenumbers.number_type(numobj) not in _MOBILE_TYPES:
+            return ""
+        return self._longest_prefix("carrier", self._e164_digits(numobj)) or ""
+
+    def time_zones_for_number(self, numobj) -> Tuple[str, ...]:
+        """ Same result as phonenumbers.timezone.time_zones_for_number(numobj) """
+        ntype = phonenumbers.number_type(numobj)
+        if ntype == PhoneNumberType.UNKNOWN:
+            return UNKNOWN_TIME_ZONES
+        if not phonenumbers.is_number_type_geographical(ntype, numobj.country_code):
+            # Country-level zones; like phonenumbers, a 1-digit prefix only matches a 1-digit code
+            digits = str(numobj.country_code)
+            zones = self._longest_prefix("timezone", digits, min_length=min(2, len(digits)))
+        else:
+            zones = self._longest_prefix("timezone", self._e164_digits(numobj))
+        return tuple(zones.split("&")) if zones else UNKNOWN_TIME_ZONES
+
+
+def load_geo_tables(path: Optional[str] = None) -> Optional[GeoTables]:
+    """
+    GeoTables from GEO_TABLES_PATH (or the default build location), or None when the
+    file is missing, unreadable or was built from a different phonenumbers release.
+    """
+    path = path or os.getenv("GEO_TABLES_PATH", DEFAULT_TABLES_PATH)
+    if not os.path.exists(path):
+        return None
+    try:
+        tables = GeoTables(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring geo tables at {path}: {e}")
+        return None
+    if tables.phonenumbers_version != phonenumbers.__version__:
+        logger.warning(f"Geo tables at {path} were built for phonenumbers {tables.phonenumbers_version}, "
+                       f"installed is {phonenumbers.__version__}; rebuild with `python -m core.geo_tables`")
+        return None
+    logger.info(f"Geo tables memory-mapped from {path}")
+    return tables
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Compile phonenumbers geocoder/carrier/timezone data")
+    parser.add_argument("--output", default=os.getenv("GEO_TABLES_PATH", DEFAULT_TABLES_PATH))
+    parser.add_argument("--lang", default="en")
+    args = parser.parse_args()
+    print(json.dumps(build_tables(args.output, args.lang)))
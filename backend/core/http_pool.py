@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import random
+from typing import Optional
+
+# Setup Logging
+logger = logging.getLogger("HTTPPool")
+# httpx logs every request URL at INFO, query-string API keys included
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+# Status codes worth another attempt (rate limited / upstream hiccup)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class AsyncHTTPPool:
+    """
+    Shared keep-alive connection pool for one upstream.
+    Wraps an httpx.AsyncClient with a concurrency limit and retries using
+    exponential backoff with full jitter.
+    """
+
+    def __init__(self, timeout: float = 8.0, connect_timeout: float = 3.0,
+                 max_connections: int = 50, max_keepalive: int = 20,
+                 concurrency: int = 50, retries: int = 2,
+                 backoff: float = 0.2, max_backoff: float = 2.0, headers: Optional[dict] = None):
+        # httpx is imported with the first client, keeping it off the startup path
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.headers = headers or {}
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop = None
+
+    def _ensure_client(self) -> "httpx.AsyncClient":
+        # Client and semaphore are bound to the loop that first uses them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_keepalive),
+                headers=self.headers
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        import httpx
+        client = self._ensure_client()
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                if attempt >= self.retries:
+                    raise
+                logger.warning(f"{method} {url} failed ({e!r}), retrying")
+
+            await asyncio.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+            attempt += 1
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
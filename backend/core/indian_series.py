@@ -1,115 +1,35 @@
+# Indian Mobile Number Series -> State/Circle (and operator where known)
+# Data lives in core/data/indian_series.csv (prefix,circle,operator; 4- or 5-digit series,
+# excluding +91), is compiled into an array-backed index by NumberingPlan and hot-reloaded
+# by SeriesStore when the file changes.
 
-# Static mapping for Indian Mobile Number Series
-# Format: First 4 digits (excluding +91) -> State/Circle
+from .series_store import series_store
+from .prefix_learner import prefix_learner
 
-INDIAN_SERIES_MAP = {
-    # Rajasthan
-    "8949": "Rajasthan",
-    "9414": "Rajasthan",
-    "9413": "Rajasthan",
-    "9829": "Rajasthan",
-    "9828": "Rajasthan",
-    "9460": "Rajasthan",
-    "9461": "Rajasthan",
-    "9462": "Rajasthan",
-    "9001": "Rajasthan",
-    "9772": "Rajasthan",
-    "9660": "Rajasthan",
-    
-    # Delhi
-    "9810": "Delhi",
-    "9818": "Delhi",
-    "9871": "Delhi",
-    "9873": "Delhi",
-    "9811": "Delhi",
-    "9899": "Delhi",
-    
-    # Mumbai
-    "9820": "Mumbai",
-    "9821": "Mumbai",
-    "9833": "Mumbai",
-    "9867": "Mumbai",
-    
-    # Maharashtra
-    "9422": "Maharashtra",
-    "9423": "Maharashtra",
-    "9822": "Maharashtra",
-    "9850": "Maharashtra",
-    "9890": "Maharashtra",
-    
-    # UP East
-    "9415": "UP East",
-    "9450": "UP East",
-    "9451": "UP East",
-    "9452": "UP East",
-    "9453": "UP East",
-    "9454": "UP East",
-    "9455": "UP East",
-    
-    # UP West
-    "9412": "UP West",
-    "9411": "UP West",
-    "9837": "UP West",
-    "9897": "UP West",
-    
-    # Andhra Pradesh / Telangana
-    "9440": "Andhra Pradesh",
-    "9441": "Andhra Pradesh",
-    "9490": "Andhra Pradesh",
-    "9491": "Andhra Pradesh",
-    "9492": "Andhra Pradesh",
-    "9493": "Andhra Pradesh",
-    "9494": "Andhra Pradesh",
-    "9154": "Andhra Pradesh", # User's first number
-    
-    # Tamil Nadu
-    "9442": "Tamil Nadu",
-    "9443": "Tamil Nadu",
-    "9486": "Tamil Nadu",
-    "9487": "Tamil Nadu",
-    "9488": "Tamil Nadu",
-    "9489": "Tamil Nadu",
-    
-    # Karnataka
-    "9448": "Karnataka",
-    "9449": "Karnataka",
-    "9480": "Karnataka",
-    "9481": "Karnataka",
-    "9482": "Karnataka",
-    "9483": "Karnataka",
-    
-    # Gujarat
-    "9426": "Gujarat",
-    "9427": "Gujarat",
-    "9428": "Gujarat",
-    "9429": "Gujarat",
-    "9824": "Gujarat",
-    "9825": "Gujarat",
-    "9879": "Gujarat",
-    
-    # Punjab
-    "9417": "Punjab",
-    "9463": "Punjab",
-    "9464": "Punjab",
-    "9465": "Punjab",
-    "9814": "Punjab",
-    "9815": "Punjab",
-    "9872": "Punjab",
-    "9876": "Punjab",
-    "9878": "Punjab"
-}
+def __getattr__(name):
+    # Legacy INDIAN_SERIES_MAP (first 4 digits -> State/Circle), built from the plan
+    # loaded now, so it follows hot reloads. Prefer lookup_series for single numbers.
+    if name == "INDIAN_SERIES_MAP":
+        return series_store.plan.series_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def lookup_series(number):
+    # ((circle, operator) or None, data version that answered it).
+    # Series missing from the data file fall back to what the scraper has learned.
+    plan = series_store.plan  # one snapshot, a reload may swap the plan meanwhile
+    info = plan.lookup(number)
+    if info and info[0]:
+        return info, plan.version
+    learned = prefix_learner.predict(number)
+    if learned:
+        return (learned["state"], learned["carrier"]), "learned"
+    return info, plan.version
+
+def get_series_info(number):
+    # (circle, operator) for a number, or None if the series is not allocated.
+    return lookup_series(number)[0]
 
 def get_circle_from_series(number):
     # Expects formatted number string e.g. "9810012345" or "+919810..."
-    clean = number.replace("+", "").strip()
-    
-    # Try with and without country code (Assuming 91 mainly)
-    local_part = clean
-    if clean.startswith("91") and len(clean) == 12:
-        local_part = clean[2:]
-        
-    if len(local_part) < 4: return None
-    
-    prefix_4 = local_part[:4]
-    
-    return INDIAN_SERIES_MAP.get(prefix_4)
+    info = get_series_info(number)
+    return info[0] if info else None
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from .metrics import REGISTRY
+
+# Setup Logging
+logger = logging.getLogger("LoopMonitor")
+
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "countryfinder_event_loop_lag_seconds", "How late the event loop ran a scheduled wake-up")
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: a task sleeps for `interval` and records how much later
+    than requested it actually woke up. Sustained lag means CPU-bound work (parsing,
+    scraping) is blocking the loop and every in-flight request is waiting on it.
+    """
+
+    def __init__(self, interval: float = 0.1, warn_after: float = 0.5):
+        self.interval = interval
+        self.warn_after = warn_after
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        REGISTRY.gauge("countryfinder_event_loop_lag_last_seconds", "Most recent event-loop lag sample",
+                       callback=lambda: self.last_lag)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - start - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.warn_after:
+                logger.warning(f"Event loop blocked for {lag * 1000:.0f} ms")
+
+
+# Singleton
+loop_monitor = LoopLagMonitor()
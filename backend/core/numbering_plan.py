@@ -0,0 +1,128 @@
+import csv
+import hashlib
+import logging
+import os
+import re
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+# Setup Logging
+logger = logging.getLogger("NumberingPlan")
+
+DEFAULT_SERIES_PATH = os.path.join(os.path.dirname(__file__), "data", "indian_series.csv")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+class NumberingPlan:
+    """
+    Compiled Indian mobile series index (MSC/series allocation).
+
+    Every 5-digit series 00000-99999 owns one slot in a flat array holding an id into
+    the (circle, operator) label table, so a lookup is one int() and one index.
+    4-digit allocations are expanded into their ten 5-digit slots; 5-digit
+    allocations override them (longest prefix wins).
+    """
+
+    SERIES_DIGITS = 5
+
+    def __init__(self):
+        self.labels: List[Tuple[Optional[str], Optional[str]]] = [(None, None)]  # id 0 = unallocated
+        self._label_ids: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self.index = array("H", bytes(2 * 10 ** self.SERIES_DIGITS))
+        self.index4 = array("H", bytes(2 * 10 ** (self.SERIES_DIGITS - 1)))
+        self.size = 0
+        self.version: Optional[str] = None
+        self._np_index = None  # numpy view, built on first bulk lookup
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_SERIES_PATH) -> "NumberingPlan":
+        """ Builds the index from a CSV with columns prefix,circle,operator """
+        with open(path, "rb") as f:
+            plan = cls.from_bytes(f.read())
+        logger.info(f"Numbering plan {plan.version} loaded: {plan.size} series from {path}")
+        return plan
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "NumberingPlan":
+        """
+        Builds the index from CSV content. A "# version: <tag>" line names the data
+        version; without one the version is a hash of the content.
+        """
+        lines = data.decode("utf-8-sig").splitlines()
+        tags = [line.split(":", 1)[1].strip() for line in lines if line.lower().startswith("# version:")]
+        rows = [r for r in csv.DictReader(line for line in lines if not line.startswith("#"))
+                if (r.get("prefix") or "").strip()]
+
+        plan = cls()
+        # Shorter prefixes first so longer allocations override them
+        for row in sorted(rows, key=lambda r: len(r["prefix"].strip())):
+            plan.add(row["prefix"].strip(), row.get("circle"), row.get("operator"))
+        plan.version = (tags[0] if tags else "") or "sha256:" + hashlib.sha256(data).hexdigest()[:12]
+        return plan
+
+    def add(self, prefix: str, circle: Optional[str], operator: Optional[str] = None) -> None:
+        if not prefix.isdigit() or len(prefix) not in (4, 5):
+            raise ValueError(f"Series prefix must be 4 or 5 digits: {prefix!r}")
+
+        label = ((circle or "").strip() or None, (operator or "").strip() or None)
+        label_id = self._label_ids.get(label)
+        if label_id is None:
+            label_id = len(self.labels)
+            self.labels.append(label)
+            self._label_ids[label] = label_id
+
+        value = int(prefix)
+        if len(prefix) == 4:
+            self.index4[value] = label_id
+            for slot in range(value * 10, value * 10 + 10):
+                self.index[slot] = label_id
+        else:
+            self.index[value] = label_id
+        self.size += 1
+        self._np_index = None
+
+    @staticmethod
+    def national_number(number: str) -> str:
+        """ Strips formatting, +91 / 0 trunk prefixes -> national digits """
+        digits = _NON_DIGITS.sub("", number)
+        if len(digits) == 12 and digits.startswith("91"):
+            return digits[2:]
+        if len(digits) == 11 and digits.startswith("0"):
+            return digits[1:]
+        return digits
+
+    def lookup(self, number: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        """ (circle, operator) for a number or bare series, None when unallocated """
+        local = self.national_number(number)
+        if len(local) >= self.SERIES_DIGITS:
+            label_id = self.index[int(local[:self.SERIES_DIGITS])]
+        elif len(local) == self.SERIES_DIGITS - 1:
+            label_id = self.index4[int(local)]
+        else:
+            return None
+        return self.labels[label_id] if label_id else None
+
+    def lookup_many(self, numbers):
+        """
+        Vectorized lookup for a NumPy integer array of national (10-digit) or
+        91-prefixed (12-digit) numbers. Returns (circles, operators) object arrays,
+        None where the series is unallocated.
+        """
+        import numpy as np
+
+        if self._np_index is None:
+            self._np_index = np.frombuffer(self.index, dtype=np.uint16)
+            self._np_circles = np.array([c for c, _ in self.labels], dtype=object)
+            self._np_operators = np.array([o for _, o in self.labels], dtype=object)
+
+        nums = np.asarray(numbers, dtype=np.int64)
+        nums = np.where((nums >= 91 * 10 ** 10) & (nums < 92 * 10 ** 10), nums - 91 * 10 ** 10, nums)
+        series = nums // 10 ** (10 - self.SERIES_DIGITS)
+        in_range = (series >= 0) & (series < len(self._np_index)) & (nums >= 10 ** 9)
+        ids = np.where(in_range, self._np_index[np.clip(series, 0, len(self._np_index) - 1)], 0)
+        return self._np_circles[ids], self._np_operators[ids]
+
+    def series_map(self) -> Dict[str, str]:
+        """ 4-digit prefix -> circle view of the plan (legacy INDIAN_SERIES_MAP shape) """
+        return {f"{p:04d}": self.labels[i][0] for p, i in enumerate(self.index4) if i and self.labels[i][0]}
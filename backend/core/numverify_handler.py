@@ -1,27 +1,84 @@
-
-import requests
 import os
 import logging
+from .enrichment_cache import get_enrichment_cache
+from .http_pool import AsyncHTTPPool
 
 # Setup Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("NumverifyService")
 
 class NumverifyService:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, base_url=None, timeout=None, retries=None, concurrency=None):
         # API Key management
-        self.api_key = api_key or os.getenv("NUMVERIFY_API_KEY") 
-        self.base_url = "http://apilayer.net/api/validate"
+        self.api_key = api_key or os.getenv("NUMVERIFY_API_KEY")
+        self.base_url = base_url or os.getenv("NUMVERIFY_BASE_URL", "http://apilayer.net/api/validate")
+        self.timeout = timeout or float(os.getenv("NUMVERIFY_TIMEOUT", "8"))
+
+        # Blocking path (scripts): one keep-alive session, created on first use
+        self._session = None
+
+        # Async path (API): pooled client with retries + concurrency limit
+        self.pool = AsyncHTTPPool(
+            timeout=self.timeout,
+            retries=retries if retries is not None else int(os.getenv("NUMVERIFY_RETRIES", "2")),
+            concurrency=concurrency or int(os.getenv("NUMVERIFY_CONCURRENCY", "20"))
+        )
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests  # only the blocking path needs it
+            self._session = requests.Session()
+        return self._session
 
     def validate(self, phone_number):
         """
-        Fetches details from Numverify API.
+        Fetches details from Numverify API (blocking).
+        """
+        request = self._prepare(phone_number)
+        if "result" in request:
+            return request["result"]
+        cache = get_enrichment_cache()
+        cached = cache.get("numverify", request["key"]) if cache else None
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.session.get(self.base_url, params=request["params"], timeout=self.timeout)
+            return self._parse(response.json(), request["key"])
+
+        except Exception as e:
+            logger.error(f"Numverify Exception: {e}")
+            return {"success": False, "error": str(e), "transient": True}
+
+    async def validate_async(self, phone_number):
         """
+        Fetches details from Numverify API without blocking the event loop.
+        """
+        request = self._prepare(phone_number)
+        if "result" in request:
+            return request["result"]
+        # Shared on-disk cache (read off the event loop): don't spend API quota twice on the same number
+        cache = get_enrichment_cache()
+        cached = await cache.aget("numverify", request["key"]) if cache else None
+        if cached is not None:
+            return cached
+
+        try:
+            response = await self.pool.get(self.base_url, params=request["params"])
+            return self._parse(response.json(), request["key"])
+
+        except Exception as e:
+            logger.error(f"Numverify Exception: {e!r}")
+            return {"success": False, "error": str(e) or type(e).__name__, "transient": True}
+
+    def _prepare(self, phone_number):
+        """ API key check, cleaning and request params (cache key + query) shared by both paths """
         if not self.api_key:
             logger.warning("Numverify API Key not set.")
-            return {"success": False, "error": "API Key Missing"}
+            return {"result": {"success": False, "error": "API Key Missing"}}
 
-        # Format number (Numverify prefers international format without + often, or with +? 
+        # Format number (Numverify prefers international format without + often, or with +?
         # Documentation usually creates URL with number=1415... (no plus).
         # But let's try strict digits.
         clean_number = phone_number.replace("+", "").strip()
@@ -29,39 +86,41 @@ class NumverifyService:
         params = {
             'access_key': self.api_key,
             'number': clean_number,
-            'country_code': '', 
+            'country_code': '',
             'format': 1
         }
+        return {"key": clean_number, "params": params}
 
-        try:
-            response = requests.get(self.base_url, params=params)
-            data = response.json()
-
-            if "success" in data and not data["success"]:
-                # API returned an error (e.g. invalid key, limit reached)
-                error_msg = data.get("error", {}).get("info", "Unknown Error")
-                logger.error(f"Numverify Error: {error_msg}")
-                return {"success": False, "error": error_msg}
-
-            if data.get("valid"):
-                return {
-                    "success": True,
-                    "country": data.get("country_name"),
-                    "location": data.get("location"),  # This is usually the State/City
-                    "carrier": data.get("carrier"),
-                    "line_type": data.get("line_type"),
-                    "local_format": data.get("local_format"),
-                    "international_format": data.get("international_format")
-                }
-            else:
-                 return {
-                     "success": False,
-                     "error": "Number invalid per Numverify" 
-                 }
+    def _parse(self, data, clean_number):
+        cache = get_enrichment_cache()
 
-        except Exception as e:
-            logger.error(f"Numverify Exception: {e}")
-            return {"success": False, "error": str(e)}
+        if "success" in data and not data["success"]:
+            # API returned an error (e.g. invalid key, limit reached)
+            error_msg = data.get("error", {}).get("info", "Unknown Error")
+            logger.error(f"Numverify Error: {error_msg}")
+            return {"success": False, "error": error_msg, "transient": True}
+
+        if data.get("valid"):
+            result = {
+                "success": True,
+                "country": data.get("country_name"),
+                "location": data.get("location"),  # This is usually the State/City
+                "carrier": data.get("carrier"),
+                "line_type": data.get("line_type"),
+                "local_format": data.get("local_format"),
+                "international_format": data.get("international_format")
+            }
+            if cache:
+                cache.set_later("numverify", clean_number, result)
+            return result
+        else:
+             result = {
+                 "success": False,
+                 "error": "Number invalid per Numverify"
+             }
+             if cache:
+                 cache.set_later("numverify", clean_number, result, negative=True)
+             return result
 
 # Singleton
 nv_service = NumverifyService()
@@ -0,0 +1,150 @@
+import logging
+import os
+import random
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Tuple
+from .metrics import REGISTRY
+
+# Setup Logging
+logger = logging.getLogger("PrefixLearner")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+class PrefixLearner:
+    """
+    Learns circle/operator per Indian mobile series from scrape results.
+
+    Every successful findandtrace answer is recorded against the number's first
+    `prefix_digits` digits. Once a series has `min_observations` answers and the
+    most common (state, carrier) pair holds at least `min_agreement` of them, the
+    series is answered from memory. Disagreeing answers lower the confidence and
+    keep the series in "still learning" until one answer dominates again.
+
+    A learned series is never final: `verify_rate` of the lookups it would answer
+    are scraped anyway (see should_verify) so fresh answers keep arriving, and once
+    a series holds `max_observations` answers its counts are halved, so old answers
+    fade and a wrong early answer can be outvoted.
+    """
+
+    def __init__(self, prefix_digits: int = 5, min_observations: int = 3,
+                 min_agreement: float = 0.9, max_prefixes: int = 100_000,
+                 verify_rate: float = 0.05, max_observations: int = 20):
+        self.prefix_digits = prefix_digits
+        self.min_observations = min_observations
+        self.min_agreement = min_agreement
+        self.max_prefixes = max_prefixes
+        self.verify_rate = verify_rate
+        self.max_observations = max_observations
+        self._observations: Dict[str, Counter] = {}
+        self._lock = threading.Lock()  # trace() also runs in executor threads
+        self.answered = 0
+        self.verified = 0
+        self.conflicts = 0
+
+    def _prefix(self, number: str) -> Optional[str]:
+        digits = _NON_DIGITS.sub("", number)
+        if len(digits) == 12 and digits.startswith("91"):
+            digits = digits[2:]
+        if len(digits) < self.prefix_digits:
+            return None
+        return digits[:self.prefix_digits]
+
+    def record(self, number: str, result: Dict[str, Any]) -> None:
+        """ Adds one scrape answer ({"state", "carrier"}) to the number's series """
+        prefix = self._prefix(number)
+        if prefix is None or not result.get("state"):
+            return
+
+        label = (result.get("state"), result.get("carrier"))
+        with self._lock:
+            counts = self._observations.get(prefix)
+            if counts is None:
+                if len(self._observations) >= self.max_prefixes:
+                    return
+                counts = self._observations[prefix] = Counter()
+            counts[label] += 1
+
+            total = sum(counts.values())
+            if len(counts) > 1 and total >= self.min_observations:
+                top, top_count = counts.most_common(1)[0]
+                if top_count / total < self.min_agreement:
+                    self.conflicts += 1
+                    logger.warning(f"Series {prefix} has conflicting answers: {dict(counts)}")
+            if total >= self.max_observations:
+                # Age out old answers: halve every count, dropping those that reach zero
+                for key in list(counts):
+                    counts[key] //= 2
+                    if not counts[key]:
+                        del counts[key]
+
+    def _best(self, prefix: str) -> Optional[Tuple[Tuple[str, Optional[str]], float, int]]:
+        counts = self._observations.get(prefix)
+        if not counts:
+            return None
+        total = sum(counts.values())
+        label, count = counts.most_common(1)[0]
+        return label, count / total, total
+
+    def predict(self, number: str) -> Optional[Dict[str, Any]]:
+        """ Learned answer for the number's series, None until the series is confident """
+        prefix = self._prefix(number)
+        if prefix is None:
+            return None
+
+        with self._lock:
+            best = self._best(prefix)
+        if best is None:
+            return None
+
+        (state, carrier), confidence, total = best
+        if total < self.min_observations or confidence < self.min_agreement:
+            return None
+
+        self.answered += 1
+        return {
+            "state": state,
+            "carrier": carrier,
+            "confidence": round(confidence, 3),
+            "observations": total,
+            "series": prefix
+        }
+
+    def should_verify(self) -> bool:
+        """ True for the sample of learned-series lookups that should be scraped anyway """
+        if self.verify_rate <= 0 or random.random() >= self.verify_rate:
+            return False
+        self.verified += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            learned = conflicted = 0
+            for prefix in self._observations:
+                _, confidence, total = self._best(prefix)
+                if total >= self.min_observations:
+                    if confidence >= self.min_agreement:
+                        learned += 1
+                    else:
+                        conflicted += 1
+            return {
+                "series_seen": len(self._observations),
+                "series_learned": learned,
+                "series_conflicted": conflicted,
+                "answered_from_memory": self.answered,
+                "verification_scrapes": self.verified,
+                "conflicts_detected": self.conflicts
+            }
+
+
+# Singleton
+prefix_learner = PrefixLearner(
+    min_observations=int(os.getenv("SERIES_LEARN_MIN_OBSERVATIONS", "3")),
+    min_agreement=float(os.getenv("SERIES_LEARN_MIN_AGREEMENT", "0.9")),
+    verify_rate=float(os.getenv("SERIES_LEARN_VERIFY_RATE", "0.05")),
+    max_observations=int(os.getenv("SERIES_LEARN_MAX_OBSERVATIONS", "20"))
+)
+REGISTRY.gauge("countryfinder_series_learner", "Series learner state (seen, learned, conflicted, ...)",
+               ("stat",), callback=lambda: {(k,): v for k, v in prefix_learner.stats().items()})
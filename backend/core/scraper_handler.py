@@ -1,96 +1,211 @@
-
-import requests
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import logging
+import os
 import re
+from .enrichment_cache import get_enrichment_cache
+from .http_pool import AsyncHTTPPool
+from .prefix_learner import prefix_learner
 
 # Setup Logging
 logger = logging.getLogger("ScraperService")
 
-class WebScraperService:
+# Start of the result table; everything before it is skipped without parsing
+_CUSTOMERS_TABLE = re.compile(r"<table[^>]*\bid\s*=\s*['\"]?customers\b[^>]*>", re.IGNORECASE)
+_ANY_TABLE = re.compile(r"<table\b[^>]*>", re.IGNORECASE)
+_TABLE_END = re.compile(r"</table\s*>", re.IGNORECASE)
+
+
+class _TableParser(HTMLParser):
+    """ Collects the text of th/td cells per row from a single table fragment """
+
     def __init__(self):
-        self.url = "https://www.findandtrace.com/trace-mobile-number-location"
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self.rows.append([])
+        elif tag in ("td", "th"):
+            if not self.rows:
+                self.rows.append([])
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            self.rows[-1].append("".join(self._cell))
+            self._cell = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data.strip())
+
+
+def parse_customers_table(html):
+    """
+    Returns the rows of the findandtrace result table as lists of cell text.
+    Only the table fragment is handed to the parser: the `customers` table if
+    present, else the first table. None if the page has no table.
+    """
+    start = _CUSTOMERS_TABLE.search(html) or _ANY_TABLE.search(html)
+    if not start:
+        return None
+    end = _TABLE_END.search(html, start.end())
+    fragment = html[start.start():end.end() if end else len(html)]
+
+    parser = _TableParser()
+    parser.feed(fragment)
+    parser.close()
+    return parser.rows
+
+
+class WebScraperService:
+    def __init__(self, url=None, timeout=8.0):
+        self.url = url or os.getenv("FINDANDTRACE_URL", "https://www.findandtrace.com/trace-mobile-number-location")
+        self.timeout = timeout
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Referer': self.url,
             'Origin': 'https://www.findandtrace.com'
         }
+        # Blocking path (scripts): one keep-alive session, created on first use
+        self._session = None
+        # Async path (API): pooled client, sized for hundreds of concurrent traces
+        self.pool = AsyncHTTPPool(
+            timeout=timeout,
+            max_connections=int(os.getenv("SCRAPER_MAX_CONNECTIONS", "100")),
+            concurrency=int(os.getenv("SCRAPER_CONCURRENCY", "200")),
+            retries=1,
+            headers=self.headers
+        )
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests  # only the blocking path needs it
+            self._session = requests.Session()
+        return self._session
 
     def trace(self, phone_number):
         """
-        Scrapes findandtrace.com for Indian numbers to get State/Circle and Carrier.
+        Scrapes findandtrace.com for Indian numbers to get State/Circle and Carrier (blocking).
         """
+        request = self._prepare(phone_number)
+        if "result" in request:
+            return request["result"]
+        cache = get_enrichment_cache()
+        known = (cache.get("scraper", request["key"]) if cache else None) or self._learned(request["key"])
+        if known is not None:
+            return known
+
         try:
-            # Clean number: Expected format is 10 digits for India
-            clean_num = phone_number.replace(" ", "").replace("-", "").replace("+", "")
-            
-            # If start with 91 and length is 12, strip 91
-            if len(clean_num) == 12 and clean_num.startswith("91"):
-                 clean_num = clean_num[2:]
-            
-            # Simple check: This specific site is best for Indian numbers (10 digits)
-            if len(clean_num) != 10 or not clean_num.isdigit():
-                 return {"success": False, "error": "Scraper supports 10-digit Indian numbers only."}
-
-            logger.info(f"Scraping info for {clean_num}...")
-            
-            data = {
-                'mobilenumber': clean_num,
-                'submit': 'Track Phone Number'
-            }
-            
-            response = requests.post(self.url, data=data, headers=self.headers, timeout=8)
-            
-            if response.status_code != 200:
-                 return {"success": False, "error": f"Site returned {response.status_code}"}
-
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find Data Table
-            target_table = soup.find('table', id='customers')
-            if not target_table:
-                 # Fallback
-                 tables = soup.find_all('table')
-                 if not tables:
-                     return {"success": False, "error": "No data table found."}
-                 target_table = tables[0]
-            
-            # DEBUG
-            print(target_table)
-
-            result = {}
-            rows = target_table.find_all('tr')
-            for row in rows:
-                cols = row.find_all(['th', 'td'])
-                if len(cols) < 2: continue
-                
-                header = cols[0].get_text(strip=True)
-                val = cols[1].get_text(strip=True)
-                
-                if "Telecoms Circle" in header or "State" in header:
-                    result['state'] = val
-                elif "Original Network" in header:
-                    if "carrier" not in result: 
-                        result['carrier'] = val
-                elif "Service Provider" in header:
-                    result['carrier'] = val
-                elif "Connection Status" in header:
-                    result['line_type'] = val # Map status to type roughly or just extra info
-
-            if result:
-                return {
-                    "success": True,
-                    "state": result.get("state"),
-                    "carrier": result.get("carrier"),
-                    "line_type": result.get("line_type"),
-                    "method": "Web Scraper (FindAndTrace)"
-                }
-            
-            return {"success": False, "error": "Data parsing failed."}
+            response = self.session.post(self.url, data=request["form"], headers=self.headers, timeout=self.timeout)
+            return self._extract(response.status_code, response.text, request["key"])
 
         except Exception as e:
             logger.error(f"Scraper Error: {e}")
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), "transient": True}
+
+    async def trace_async(self, phone_number):
+        """
+        Same as trace() without blocking the event loop.
+        """
+        request = self._prepare(phone_number)
+        if "result" in request:
+            return request["result"]
+        # Shared on-disk cache (read off the event loop): each number only needs scraping once per host
+        cache = get_enrichment_cache()
+        known = (await cache.aget("scraper", request["key"]) if cache else None) or self._learned(request["key"])
+        if known is not None:
+            return known
+
+        try:
+            response = await self.pool.post(self.url, data=request["form"])
+            return self._extract(response.status_code, response.text, request["key"])
+
+        except Exception as e:
+            logger.error(f"Scraper Error: {e!r}")
+            return {"success": False, "error": str(e) or type(e).__name__, "transient": True}
+
+    def _prepare(self, phone_number):
+        """ Cleaning and validation shared by both paths """
+        # Clean number: Expected format is 10 digits for India
+        clean_num = phone_number.replace(" ", "").replace("-", "").replace("+", "")
+
+        # If start with 91 and length is 12, strip 91
+        if len(clean_num) == 12 and clean_num.startswith("91"):
+             clean_num = clean_num[2:]
+
+        # Simple check: This specific site is best for Indian numbers (10 digits)
+        if len(clean_num) != 10 or not clean_num.isdigit():
+             return {"result": {"success": False, "error": "Scraper supports 10-digit Indian numbers only."}}
+
+        logger.debug(f"Scraping info for {clean_num}...")
+
+        form = {
+            'mobilenumber': clean_num,
+            'submit': 'Track Phone Number'
+        }
+        return {"key": clean_num, "form": form}
+
+    @staticmethod
+    def _learned(clean_num):
+        """ Answer for a series already learned from earlier scrapes (no need to hit the site), else None """
+        learned = prefix_learner.predict(clean_num)
+        if not learned or prefix_learner.should_verify():
+            return None  # a sample of learned lookups is scraped so the series keeps being checked
+        return {
+            "success": True,
+            "state": learned["state"],
+            "carrier": learned["carrier"],
+            "line_type": None,
+            "confidence": learned["confidence"],
+            "method": "Series Learner (FindAndTrace)"
+        }
+
+    def _extract(self, status_code, html, clean_num):
+        if status_code != 200:
+             return {"success": False, "error": f"Site returned {status_code}", "transient": True}
+
+        # Find Data Table
+        rows = parse_customers_table(html)
+        if rows is None:
+             return {"success": False, "error": "No data table found."}
+
+        logger.debug(f"Scraped table for {clean_num}: {rows}")
+
+        result = {}
+        for cols in rows:
+            if len(cols) < 2: continue
+
+            header = cols[0]
+            val = cols[1]
+
+            if "Telecoms Circle" in header or "State" in header:
+                result['state'] = val
+            elif "Original Network" in header:
+                if "carrier" not in result:
+                    result['carrier'] = val
+            elif "Service Provider" in header:
+                result['carrier'] = val
+            elif "Connection Status" in header:
+                result['line_type'] = val # Map status to type roughly or just extra info
+
+        if result:
+            result = {
+                "success": True,
+                "state": result.get("state"),
+                "carrier": result.get("carrier"),
+                "line_type": result.get("line_type"),
+                "method": "Web Scraper (FindAndTrace)"
+            }
+            cache = get_enrichment_cache()
+            if cache:
+                cache.set_later("scraper", clean_num, result)
+            prefix_learner.record(clean_num, result)
+            return result
+
+        return {"success": False, "error": "Data parsing failed."}
 
 # Singleton
 scraper_service = WebScraperService()
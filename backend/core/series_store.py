@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .metrics import REGISTRY
+from .numbering_plan import NumberingPlan, DEFAULT_SERIES_PATH
+
+# Setup Logging
+logger = logging.getLogger("SeriesStore")
+
+# Series data file (prefix,circle,operator CSV) and how often each worker checks it for changes
+SERIES_DATA_PATH = os.getenv("SERIES_DATA_PATH", DEFAULT_SERIES_PATH)
+SERIES_RELOAD_SECONDS = float(os.getenv("SERIES_RELOAD_SECONDS", "30"))  # 0 = no watching
+
+SERIES_RELOADS = REGISTRY.counter(
+    "countryfinder_series_reloads_total", "Series data reload attempts", ("outcome",))
+
+
+class SeriesStore:
+    """
+    Versioned, hot-reloadable series plan.
+
+    `plan` is the compiled NumberingPlan currently answering lookups. A background
+    task polls the data file; when it changes, the new plan is compiled in a worker
+    thread and published with one reference swap, so requests never wait on a reload
+    and each lookup sees one whole version. A file that fails to load leaves the
+    current plan in place. Update the file by writing a copy and renaming it over
+    the old one, so a reload never reads a half-written file.
+    """
+
+    def __init__(self, path: str = SERIES_DATA_PATH, interval: float = SERIES_RELOAD_SECONDS):
+        self.path = path
+        self.interval = interval
+        self.plan = NumberingPlan.load(path)
+        self.loaded_at = time.time()
+        self.checked_at: Optional[float] = None
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_reload_ms: Optional[float] = None
+        self._signature = self._stat()
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        REGISTRY.gauge("countryfinder_series_plan_size", "Series allocations in the loaded plan",
+                       callback=lambda: self.plan.size)
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.plan.version
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Series watcher error: {e!r}")
+
+    async def reload(self, force: bool = False) -> Dict[str, Any]:
+        """ Reloads the data file if it changed (or always, with force); returns what happened """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self.checked_at = time.time()
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return {"changed": False, "version": self.version}
+            self._signature = signature  # a bad file is retried once it changes again, not every poll
+
+            started = time.perf_counter()
+            try:
+                plan = await asyncio.to_thread(NumberingPlan.load, self.path)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                SERIES_RELOADS.inc(outcome="failed")
+                logger.error(f"Series reload from {self.path} failed, keeping {self.version}: {e!r}")
+                return {"changed": False, "version": self.version, "error": self.last_error}
+            self.last_reload_ms = round((time.perf_counter() - started) * 1000, 2)
+
+            if plan.version == self.version:
+                SERIES_RELOADS.inc(outcome="unchanged")
+                return {"changed": False, "version": self.version}
+            previous, self.plan = self.version, plan
+            self.loaded_at = time.time()
+            self.reloads += 1
+            self.last_error = None
+            SERIES_RELOADS.inc(outcome="swapped")
+            logger.info(f"Series data {previous} -> {plan.version} ({plan.size} series)")
+            return {"changed": True, "version": plan.version, "previous": previous}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "series": self.plan.size,
+            "loaded_at": self.loaded_at,
+            "checked_at": self.checked_at,
+            "watch_interval_s": self.interval if self._task is not None else 0,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_reload_ms": self.last_reload_ms,
+            "last_error": self.last_error,
+        }
+
+
+# Singleton
+series_store = SeriesStore()
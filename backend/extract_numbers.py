@@ -0,0 +1,76 @@
+"""
+Phone Number Extraction Tool
+
+Finds phone numbers in large text dumps (chat exports, CRM notes, logs), dedupes
+them by E.164 and writes one NDJSON line per unique number with its count and the
+first text it was seen as. Chunks of the input are parsed on every CPU core.
+
+With --score, unique numbers also go through the API's validation and scoring
+(ScoringEngine.analyze_batch); add --deep-search for upstream enrichment.
+
+Usage:
+    cd backend
+    python extract_numbers.py export.txt notes.txt --region IN --output hits.ndjson
+    cat dump.txt | python extract_numbers.py - --region US --score
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from core.extractor import DEFAULT_CHUNK_BYTES, extract_files
+
+# Numbers scored per analyze_batch call
+SCORE_BATCH = 5000
+
+
+async def score_rows(rows, deep_search, timeout_ms):
+    from app.services.scoring_service import ScoringEngine
+    engine = ScoringEngine()
+    for start in range(0, len(rows), SCORE_BATCH):
+        batch = rows[start:start + SCORE_BATCH]
+        results = await engine.analyze_batch([row["e164"] for row in batch], deep_search, timeout_ms=timeout_ms)
+        for row, result in zip(batch, results):
+            row.update({k: v for k, v in result.items() if k != "input"})
+        print(f"Scored {min(start + SCORE_BATCH, len(rows))}/{len(rows)}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract and dedupe phone numbers from text files")
+    parser.add_argument("paths", nargs="+", help="text files ('-' for stdin)")
+    parser.add_argument("--region", help="region for numbers written without a country code (e.g. IN)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parser processes")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_BYTES / 1024 / 1024)
+    parser.add_argument("--output", help="NDJSON output file (default: stdout)")
+    parser.add_argument("--score", action="store_true", help="validate and score each unique number")
+    parser.add_argument("--deep-search", action="store_true", help="with --score: query upstream sources")
+    parser.add_argument("--timeout-ms", type=float, default=None, help="with --deep-search: per-number budget")
+    args = parser.parse_args()
+
+    region = args.region.upper() if args.region else None
+    start = time.perf_counter()
+    extraction = extract_files(args.paths, region, args.workers, int(args.chunk_mb * 1024 * 1024))
+    seconds = time.perf_counter() - start
+    summary = extraction.summary()
+    print(f"Extracted {summary['unique']} unique numbers ({summary['matches']} matches) from "
+          f"{summary['bytes'] / 1e6:.1f} MB in {seconds:.1f}s "
+          f"({summary['bytes'] / 1e6 / max(seconds, 1e-9):.1f} MB/s, {args.workers} workers)", file=sys.stderr)
+
+    rows = extraction.rows()
+    if args.score:
+        asyncio.run(score_rows(rows, args.deep_search, args.timeout_ms))
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for row in rows:
+            out.write(json.dumps(row, default=str) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,47 @@
-from fastapi import FastAPI, Depends, HTTPException, Body
-# from app.api.v1 import endpoints
+from time import perf_counter
+IMPORT_STARTED = perf_counter()
+
+from fastapi import FastAPI, Depends, HTTPException, Body, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.services.warmup import warmup
+from app.api.v1 import endpoints
 from app.services.scoring_service import ScoringEngine
+from app.services.job_service import job_manager, JOB_MAX_INPUTS
+from app.services.extraction_service import UploadTooLarge, check_region, extract_stream, score_hits
+from app.services.bulk_service import NDJSONStreamingResponse, iter_lines, iter_rows, stream_analyze
+from core.metrics import REGISTRY
+from core.loop_monitor import loop_monitor
+from core.country_index import get_country_index, is_country_query
+from core.series_store import series_store
+from core.prefix_learner import prefix_learner
+from contextlib import asynccontextmanager
 # from app.core.security import get_api_key
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import logging
+import json
+
+# Setup Logging
+logger = logging.getLogger("API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """ Warm-up (per STARTUP_MODE) and background tasks that live as long as the worker """
+    loop_monitor.start()
+    await warmup.start()
+    await job_manager.start(scoring_engine)
+    series_store.start()
+    yield
+    await series_store.stop()
+    await job_manager.stop()
+    await loop_monitor.stop()
 
 # Initialize App
 app = FastAPI(
     title="CountryFinder AI",
     description="Global Phone Number Validation & Identity API",
-    version="2.1.0"
+    version="2.1.0",
+    lifespan=lifespan
 )
 
 # CORS (Frontend Access)
@@ -24,7 +55,62 @@ app.add_middleware(
 )
 
 # Initialize Services
+warmup.record("imports", perf_counter() - IMPORT_STARTED)
+_services_started = perf_counter()
 scoring_engine = ScoringEngine()
+warmup.record("services", perf_counter() - _services_started)
+
+# Background jobs (/v1/jobs)
+app.include_router(endpoints.router, prefix="/v1")
+
+# Max inputs accepted by /predict/batch in one request
+MAX_BATCH_SIZE = 50000
+
+def _timeout_ms(payload: dict):
+    """ Optional per-request enrichment budget ("timeout_ms" in the body) """
+    value = payload.get("timeout_ms")
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise HTTPException(status_code=400, detail="timeout_ms must be a positive number")
+    return float(value)
+
+def _limit(payload: dict, default: int):
+    value = payload.get("limit", default)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 50:
+        raise HTTPException(status_code=400, detail="limit must be an integer between 1 and 50")
+    return value
+
+def _country_result(query: str):
+    """
+    /predict response for a country name, ISO code or dialing code (same fields as a number).
+    None unless the best candidate is an exact match; misspellings are left to the number path.
+    """
+    candidates = get_country_index().resolve(query, limit=5)
+    if not candidates or candidates[0]["match_type"] == "fuzzy":
+        return None
+    best = candidates[0]
+    return {
+        "success": True,
+        "valid": True,
+        "input_type": "country",
+        "country": best["name"],
+        "code": best["dial_code"] or "",
+        "formatted": best["dial_code"] or best["alpha_2"],
+        "region_code": best["alpha_2"],
+        "carrier": "N/A",
+        "line_type": "Country",
+        "state": "Entire Country",
+        "confidence": round(best["score"] / 100, 3),
+        "candidates": candidates,
+    }
+
+def _country_suggestions(query: str, result: dict):
+    """ Invalid result for text input, plus fuzzy country candidates ("did you mean") """
+    candidates = get_country_index().resolve(query, limit=5)
+    if candidates:
+        result = {**result, "valid": False, "candidates": candidates}
+    return result
 
 # --- ROUTES ---
 
@@ -36,16 +122,214 @@ async def predict(
     """
     Main Validation Endpoint.
     Uses Scoring Engine to return verified data + confidence scores.
+    Optional "timeout_ms" caps how long deep search waits for upstream sources.
     """
     input_text = payload.get("input")
     deep_search = payload.get("deep_search", False)
+    timeout_ms = _timeout_ms(payload)
     
     if not input_text:
         raise HTTPException(status_code=400, detail="Input is required")
+    if not isinstance(input_text, str):
+        raise HTTPException(status_code=400, detail="Input must be a string")
+
+    # Exact country names / codes ("germany", "+44") skip number parsing
+    country_query = is_country_query(input_text)
+    if country_query:
+        result = _country_result(input_text)
+        if result is not None:
+            return result
 
-    result = await scoring_engine.analyze(input_text, deep_search)
+    async with job_manager.interactive():  # background jobs back off meanwhile
+        result = await scoring_engine.analyze(input_text, deep_search, timeout_ms)
+    if country_query and not result.get("valid"):
+        result = _country_suggestions(input_text, result)
     return result
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.get("/predict/events")
+async def predict_events(input: str, deep_search: bool = False, timeout_ms: float = None):
+    """
+    Progressive Validation Endpoint (Server-Sent Events).
+    Emits "base" with the offline validation right away, "source" as each deep-search
+    source answers, then "final" with the same result /predict would return.
+    """
+    if not input.strip():
+        raise HTTPException(status_code=400, detail="Input is required")
+    _timeout_ms({"timeout_ms": timeout_ms})
+
+    async def events():
+        # Same routing as /predict: exact country matches answer at once, other text is parsed as a number
+        country_query = is_country_query(input)
+        if country_query:
+            result = _country_result(input)
+            if result is not None:
+                yield _sse("final", result)
+                return
+        try:
+            async with job_manager.interactive():
+                async for event, data in scoring_engine.analyze_stream(input, deep_search, timeout_ms):
+                    if event == "final" and country_query and not data.get("valid"):
+                        data = _country_suggestions(input, data)
+                    yield _sse(event, data)
+        except Exception as e:
+            logger.error(f"Event stream for {input} failed: {e!r}")
+            yield _sse("error", {"success": False, "message": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/predict/batch")
+async def predict_batch(payload: dict = Body(...)):
+    """
+    Batch Validation Endpoint.
+    Body: {"inputs": [...], "deep_search": bool}. Results come back in input order,
+    with errors reported per item.
+    """
+    inputs = payload.get("inputs")
+    deep_search = payload.get("deep_search", False)
+    timeout_ms = _timeout_ms(payload)
+
+    if not isinstance(inputs, list) or not inputs:
+        raise HTTPException(status_code=400, detail="Inputs must be a non-empty list")
+    if len(inputs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch limit is {MAX_BATCH_SIZE} inputs")
+
+    results = await scoring_engine.analyze_batch(inputs, deep_search, timeout_ms=timeout_ms)
+    return {"count": len(results), "results": results}
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request, format: str = None, deep_search: bool = False):
+    """
+    Streaming Bulk Validation Endpoint.
+    Upload NDJSON ({"input": ...} per line) or CSV, get NDJSON results back while
+    the upload is still being read. Format comes from ?format= or the Content-Type.
+    """
+    fmt = (format or "").lower()
+    if not fmt:
+        fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Format must be 'ndjson' or 'csv'")
+
+    rows = iter_rows(iter_lines(request.stream()), fmt)
+    return NDJSONStreamingResponse(stream_analyze(scoring_engine, rows, deep_search))
+
+@app.post("/extract")
+async def extract(request: Request, region: str = None, score: bool = True, deep_search: bool = False,
+                  job: bool = False):
+    """
+    Number Extraction Endpoint.
+    Upload free text (chat export, CRM notes) as the raw body. Numbers are found per
+    line, deduplicated by E.164 and, with ?score=true, validated and scored like
+    /predict/batch. ?region=IN covers numbers written without a country code;
+    ?job=true queues the unique numbers as a background job (/v1/jobs) instead.
+    """
+    try:
+        region = check_region(region)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        extraction = await extract_stream(request.stream(), region)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    response = {"summary": extraction.summary()}
+    if job and extraction.hits:
+        if not job_manager.enabled:
+            raise HTTPException(status_code=503, detail="Job store unavailable")
+        if len(extraction.hits) > JOB_MAX_INPUTS:
+            raise HTTPException(status_code=413, detail=f"Job limit is {JOB_MAX_INPUTS} inputs")
+        response["job"] = await job_manager.submit(list(extraction.hits), deep_search)
+    elif score:
+        # Same cap as /predict/batch; larger extractions go to a background job
+        if len(extraction.hits) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"{len(extraction.hits)} unique numbers found; scoring limit "
+                                                        f"is {MAX_BATCH_SIZE}, use ?job=true or ?score=false")
+        async with job_manager.interactive():
+            response["results"] = await score_hits(scoring_engine, extraction, deep_search)
+    else:
+        response["results"] = extraction.rows()
+    return response
+
+@app.post("/resolve/country")
+async def resolve_country(payload: dict = Body(...)):
+    """
+    Country Resolution Endpoint.
+    Body: {"query": "germny" | "DE" | "+49" | "german", "limit": 5}. Returns ranked
+    candidates with 0-100 scores.
+    """
+    query = payload.get("query")
+    if not isinstance(query, str) or not query.strip():
+        raise HTTPException(status_code=400, detail="Query is required")
+    return {"query": query, "candidates": get_country_index().resolve(query, limit=_limit(payload, 5))}
+
+@app.post("/resolve/country/batch")
+async def resolve_country_batch(payload: dict = Body(...)):
+    """
+    Batch Country Resolution (dataset cleanup).
+    Body: {"queries": [...], "limit": 1}. Results come back in input order.
+    """
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries:
+        raise HTTPException(status_code=400, detail="Queries must be a non-empty list")
+    if len(queries) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch limit is {MAX_BATCH_SIZE} queries")
+    limit = _limit(payload, 1)
+    results = get_country_index().resolve_many(queries, limit=limit)
+    return {"count": len(results),
+            "results": [{"query": q, "candidates": c} for q, c in zip(queries, results)]}
+
+@app.get("/admin/cache")
+async def cache_stats():
+    """ Result cache hit/miss counters """
+    return scoring_engine.cache_stats()
+
+@app.get("/admin/coalescing")
+async def coalescing_stats():
+    """ Per-source counts of upstream calls executed vs shared with a concurrent request """
+    return scoring_engine.coalescing_stats()
+
+@app.get("/admin/sources")
+async def source_health():
+    """ Circuit breaker state, latency and error-rate averages per enrichment source """
+    return scoring_engine.source_health()
+
+@app.get("/admin/learner")
+async def learner_stats():
+    """ Series learned from scrapes: seen / learned / conflicted series, memory answers, verification scrapes """
+    return prefix_learner.stats()
+
+@app.get("/admin/series")
+async def series_stats():
+    """ Loaded series data version, its size and reload counters """
+    return series_store.stats()
+
+@app.post("/admin/series/reload")
+async def reload_series():
+    """ Reloads the series data file now instead of waiting for the watcher """
+    result = await series_store.reload(force=True)
+    if "error" in result:
+        raise HTTPException(status_code=422, detail=result["error"])
+    return {**result, **series_store.stats()}
+
+@app.get("/healthz")
+async def healthz():
+    """ Liveness: the process is up and its event loop is responding """
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """ Readiness: 503 until warm-up has finished (see STARTUP_MODE) """
+    snapshot = warmup.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+@app.get("/metrics")
+async def metrics():
+    """ Prometheus scrape endpoint """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.post("/contact")
 async def contact(payload: dict = Body(...)):
     """ Contact Form Stub """
@@ -0,0 +1,187 @@
+"""
+Bulk Normalization Tool
+
+Normalizes a large CSV column of raw phone numbers offline (no API server, no
+upstream calls): E.164, country, Indian circle, carrier, line type and timezone,
+from the same offline data CountryService uses.
+
+The input file is memory-mapped and cut into line-aligned byte ranges; each
+worker process maps the file itself, parses its range with
+CountryService.parse_batch and returns rendered output. Chunks are written in
+input order as they complete, so output rows line up with input rows. One CSV
+record per line is assumed (no quoted line breaks).
+
+Usage:
+    cd backend
+    python normalize_numbers.py contacts.csv --column phone --output normalized.csv
+    python normalize_numbers.py numbers.txt --no-header --format ndjson --workers 8
+"""
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from app.services.bulk_service import CSV_INPUT_COLUMNS
+
+OUTPUT_COLUMNS = ("e164", "valid", "country", "region_code", "circle", "carrier", "line_type", "timezone")
+DEFAULT_CHUNK_MB = 4
+
+_service = None  # CountryService per worker process
+_country_names = {}  # alpha_2 -> country name (parse_batch's "country" is the geocoder's place description)
+
+
+def _init_worker():
+    global _service, _country_names
+    import pycountry
+    from app.services.country_service import CountryService, load_geodata
+    load_geodata()
+    _service = CountryService()
+    _country_names = {c.alpha_2: getattr(c, "common_name", None) or c.name for c in pycountry.countries}
+
+
+def chunk_ranges(mm, start: int, chunk_bytes: int) -> List[Tuple[int, int]]:
+    """ Line-aligned (start, end) byte ranges covering mm[start:] """
+    ranges = []
+    size = len(mm)
+    while start < size:
+        end = mm.find(b"\n", min(start + chunk_bytes, size - 1))
+        end = size if end < 0 else end + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def normalize_range(path: str, start: int, end: int, column: int, keep: bool, fmt: str,
+                    header: Optional[List[str]]) -> Tuple[str, int, int]:
+    """ Worker: (rendered output, rows, valid rows) for one byte range of the input """
+    if _service is None:
+        _init_worker()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode("utf-8", errors="replace")
+    records = list(csv.reader(io.StringIO(text)))  # blank lines stay, as invalid rows, so output lines up
+    phones = [r[column].strip() if column < len(r) else "" for r in records]
+    columns = _service.parse_batch(phones)
+
+    out = io.StringIO()
+    writer = csv.writer(out) if fmt == "csv" else None
+    valid = 0
+    for i, record in enumerate(records):
+        ok = bool(columns["valid"][i])
+        valid += ok
+        circle = columns["state"][i] if columns["code"][i] == "+91" and columns["state"][i] != "Entire Country" else ""
+        region = columns["region_code"][i] or ""
+        values = [columns["e164"][i] or "", ok, _country_names.get(region, "") if ok else "", region,
+                  circle or "", columns["carrier"][i] if ok else "", columns["line_type"][i] if ok else "",
+                  columns["timezone"][i] or ""]
+        if keep and header:
+            record = record + [""] * (len(header) - len(record))  # blank/short rows keep every column
+        if fmt == "csv":
+            writer.writerow((record if keep and header else [phones[i]]) + values)
+        else:
+            row = dict(zip(header, record)) if keep and header else {"input": phones[i]}
+            row.update(zip(OUTPUT_COLUMNS, values))
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return out.getvalue(), len(records), valid
+
+
+def _column_index(header: Optional[List[str]], column: Optional[str]) -> int:
+    if column is not None and column.isdigit():
+        return int(column)
+    if header is None:
+        if column is not None:
+            sys.exit("--column must be an index with --no-header")
+        return 0
+    names = [h.strip().lower() for h in header]
+    if column is not None:
+        if column.lower() not in names:
+            sys.exit(f"Column '{column}' not in header: {header}")
+        return names.index(column.lower())
+    return next((names.index(name) for name in CSV_INPUT_COLUMNS if name in names), 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline bulk phone-number normalization")
+    parser.add_argument("input", help="CSV file (or one number per line with --no-header)")
+    parser.add_argument("--column", help="column name or 0-based index (default: input/phone/number/..., else first)")
+    parser.add_argument("--no-header", action="store_true", help="the first line is data")
+    parser.add_argument("--output", help="output file (default: stdout)")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--keep-columns", action="store_true", help="copy the input columns to the output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_MB)
+    args = parser.parse_args()
+
+    with open(args.input, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            sys.exit("Input is empty")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, data_start = None, 0
+    if not args.no_header:
+        data_start = mm.find(b"\n") + 1 or len(mm)
+        header = next(csv.reader([mm[:data_start].decode("utf-8-sig", errors="replace")]))
+    column = _column_index(header, args.column)
+    ranges = chunk_ranges(mm, data_start, int(args.chunk_mb * 1024 * 1024))
+    total_bytes = len(mm) - data_start
+    mm.close()
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    if args.format == "csv":
+        csv.writer(out).writerow(((header if args.keep_columns and header else ["input"]) + list(OUTPUT_COLUMNS)))
+
+    started = time.perf_counter()
+    done_bytes = rows = valid = 0
+    last_report = 0.0
+
+    def report(final=False):
+        nonlocal last_report
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        if not final and elapsed - last_report < 1.0:
+            return
+        last_report = elapsed
+        rate = done_bytes / elapsed
+        eta = (total_bytes - done_bytes) / rate if rate else 0
+        print(f"{'Done' if final else 'Progress'}: {done_bytes / max(total_bytes, 1):6.1%}  {rows} rows "
+              f"({valid} valid)  {rows / elapsed:,.0f} rows/s  {rate / 1e6:.1f} MB/s"
+              f"{'' if final else f'  ETA {eta:.0f}s'}  [{elapsed:.1f}s, {args.workers} workers]",
+              file=sys.stderr)
+
+    def write(result, size):
+        nonlocal done_bytes, rows, valid
+        text, n, v = result
+        out.write(text)
+        done_bytes, rows, valid = done_bytes + size, rows + n, valid + v
+        report()
+
+    task_args = (column, args.keep_columns, args.format, header)
+    try:
+        if args.workers <= 1:
+            for s, e in ranges:
+                write(normalize_range(args.input, s, e, *task_args), e - s)
+        else:
+            with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as executor:
+                # Bounded window: workers stay busy, finished chunks are written in input order
+                pending = deque()
+                for s, e in ranges:
+                    pending.append((executor.submit(normalize_range, args.input, s, e, *task_args), e - s))
+                    while len(pending) >= 2 * args.workers or (pending and pending[0][0].done()):
+                        future, size = pending.popleft()
+                        write(future.result(), size)
+                while pending:
+                    future, size = pending.popleft()
+                    write(future.result(), size)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    report(final=True)
+
+
+if __name__ == "__main__":
+    main()
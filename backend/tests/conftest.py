@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the backend packages the way main.py does (run from backend/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+from benchmarks.stubs import StandInServer  # noqa: E402  (needs the path above)
+
+
+@pytest.fixture
+def stand_in():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture(autouse=True)
+def no_enrichment_cache(monkeypatch):
+    """ Upstream tests must hit the stand-in server, not a cache left by another run """
+    monkeypatch.delenv("ENRICHMENT_CACHE_PATH", raising=False)
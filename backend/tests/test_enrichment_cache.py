@@ -0,0 +1,39 @@
+import os
+import sqlite3
+
+import pytest
+
+from core.enrichment_cache import EnrichmentCache
+
+
+def file_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p))
+
+
+def fill(cache, count):
+    for i in range(count):
+        cache.set("numverify", f"+91981{i:07d}", {"carrier": "x" * 2000})
+
+
+def checkpoint(cache):
+    cache._conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+@pytest.mark.parametrize("existing", [False, True])
+def test_compact_shrinks_file(tmp_path, existing):
+    path = str(tmp_path / "enrichment.db")
+    if existing:
+        # A cache file created before auto_vacuum was enabled
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE legacy (x)")
+        conn.close()
+    cache = EnrichmentCache(path, max_bytes=100 * 1024, compact_every=10 ** 6)
+    assert cache._conn().execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    fill(cache, 1000)
+    checkpoint(cache)
+    before = file_size(path)
+    assert cache.compact()["evicted"] > 900
+    checkpoint(cache)
+    assert file_size(path) < before / 4
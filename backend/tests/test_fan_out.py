@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.scoring_service import ScoringEngine
+
+
+def test_deadline_cancels_late_sources():
+    async def run():
+        late = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                late.set()
+                raise
+
+        async def fast():
+            return {"success": True}
+
+        result = await ScoringEngine()._fan_out({"fast": fast(), "slow": slow()}, timeout_ms=50)
+        await asyncio.sleep(0)
+        return result, late.is_set()
+
+    (answers, timed_out), cancelled = asyncio.run(run())
+    assert answers == {"fast": {"success": True}}
+    assert timed_out == ["slow"]
+    assert cancelled
+
+
+def test_cancelling_fan_out_cancels_sources():
+    async def run():
+        async def slow():
+            await asyncio.sleep(5)
+
+        fan_out = asyncio.ensure_future(ScoringEngine()._fan_out({"a": slow(), "b": slow()}, None))
+        await asyncio.sleep(0.05)
+        fan_out.cancel()
+        try:
+            await fan_out
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0)
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,11 @@
+from core import indian_series
+from core.numbering_plan import NumberingPlan
+from core.series_store import series_store
+
+
+def test_series_map_follows_reloaded_plan(monkeypatch):
+    assert indian_series.INDIAN_SERIES_MAP["9829"] == "Rajasthan"
+    plan = NumberingPlan.from_bytes(b"# version: test\nprefix,circle,operator\n9829,Delhi,Airtel\n")
+    monkeypatch.setattr(series_store, "plan", plan)
+    assert indian_series.INDIAN_SERIES_MAP == {"9829": "Delhi"}
+    assert indian_series.lookup_series("9829012345") == (("Delhi", "Airtel"), "test")
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from collections import Counter
+
+import pytest
+
+from app.services import job_service
+from app.services.job_service import JobManager, JobStore
+
+
+class CountingEngine:
+    def __init__(self):
+        self.calls = Counter()
+
+    async def analyze(self, phone, deep_search, timeout_ms):
+        self.calls[phone] += 1
+        await asyncio.sleep(0.002)
+        return {"success": True}
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(job_service, "JOB_POLL_SECONDS", 0.1)
+
+
+async def wait_for_state(manager, job_id, state, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while (await manager.get(job_id))["state"] != state:
+        assert time.monotonic() < deadline, f"job never reached {state}"
+        await asyncio.sleep(0.05)
+
+
+def test_each_job_runs_in_one_worker(tmp_path):
+    async def run():
+        engine = CountingEngine()
+        workers = [JobManager(str(tmp_path / "jobs.db")) for _ in range(3)]
+        for worker in workers:
+            await worker.start(engine)
+        try:
+            jobs = [await workers[0].submit([f"+91981{k}{i:06d}" for i in range(200)]) for k in range(3)]
+            for worker in workers:
+                worker._wakeup.set()
+            for job in jobs:
+                await wait_for_state(workers[1], job["job_id"], "completed")
+            return engine.calls, [(await workers[2].get(job["job_id"]))["done"] for job in jobs]
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+    calls, done = asyncio.run(run())
+    assert len(calls) == 600 and max(calls.values()) == 1
+    assert done == [200, 200, 200]
+
+
+def test_pause_from_another_worker(tmp_path):
+    async def run():
+        workers = [JobManager(str(tmp_path / "jobs.db")) for _ in range(2)]
+        for worker in workers:
+            await worker.start(CountingEngine())
+        try:
+            job_id = (await workers[0].submit([f"+91981{i:07d}" for i in range(1500)], concurrency=1))["job_id"]
+            await asyncio.sleep(0.3)
+            owner = next(w for w in workers if job_id in w._runners)
+            other = next(w for w in workers if w is not owner)
+            await other.pause(job_id)
+            await asyncio.sleep(0.5)
+            paused = (await other.get(job_id))["state"], job_id in owner._runners
+            await other.resume(job_id)
+            for worker in workers:
+                worker._wakeup.set()
+            await wait_for_state(other, job_id, "completed")
+            return paused, (await other.get(job_id))["done"]
+        finally:
+            for worker in workers:
+                await worker.stop()
+
+    (state, still_running), done = asyncio.run(run())
+    assert state == "paused" and not still_running
+    assert done == 1500
+
+
+def test_results_page_stops_at_unfinished_item(tmp_path):
+    async def run():
+        manager = JobManager(str(tmp_path / "jobs.db"))
+        manager.store = JobStore(manager.path)
+        job_id = "job"
+        manager.store.create(job_id, ["a", "b", "c", "d"], False, None, 1)
+        manager.store.save_results(job_id, [(0, {"ok": 1}, False), (2, {"ok": 1}, False)])
+        running = await manager.results(job_id, 0, 10)
+        manager.store.save_results(job_id, [(1, {"ok": 1}, False), (3, {"ok": 1}, False),
+                                            (0, {"ok": 2}, False)])
+        manager.store.set_state(job_id, "completed")
+        finished = await manager.results(job_id, 0, 10)
+        return running, finished, manager.store.get(job_id)["done"]
+
+    running, finished, done = asyncio.run(run())
+    assert [item["seq"] for item in running["items"]] == [0] and running["next_offset"] == 1
+    assert [item["seq"] for item in finished["items"]] == [0, 1, 2, 3] and finished["next_offset"] is None
+    assert done == 4  # the repeated result for item 0 is not counted again
+
+
+def test_stale_lease_is_taken_over(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create("job", ["a"], False, None, 1)
+    now = time.time()
+    assert store.claim("job", "worker-a", now, now - 30)
+    assert not store.claim("job", "worker-b", now, now - 30)
+    assert store.claim("job", "worker-b", now + 60, now + 30)
+    assert store.heartbeat("job", "worker-a", now + 61) is None
@@ -0,0 +1,35 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize(tmp_path, text, *args):
+    path = tmp_path / "contacts.csv"
+    path.write_text(text)
+    return subprocess.run([sys.executable, "normalize_numbers.py", str(path), "--workers", "1", *args],
+                          cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout
+
+
+CONTACTS = "id,phone\n1,+919810012345\n\n2\n3,garbage\n"
+
+
+def test_keep_columns_csv_pads_blank_and_short_rows(tmp_path):
+    rows = list(csv.reader(normalize(tmp_path, CONTACTS, "--keep-columns").splitlines()))
+    assert rows[0][:3] == ["id", "phone", "e164"]
+    assert {len(row) for row in rows} == {len(rows[0])}
+    assert [row[:4] for row in rows[1:]] == [["1", "+919810012345", "+919810012345", "True"],
+                                             ["", "", "", "False"],
+                                             ["2", "", "", "False"],
+                                             ["3", "garbage", "", "False"]]
+
+
+def test_keep_columns_ndjson_keeps_input_keys(tmp_path):
+    rows = [json.loads(line) for line in normalize(tmp_path, CONTACTS, "--keep-columns", "--format", "ndjson")
+            .splitlines()]
+    assert len(rows) == 4
+    assert [(row["id"], row["phone"], row["valid"]) for row in rows] == [
+        ("1", "+919810012345", True), ("", "", False), ("2", "", False), ("3", "garbage", False)]
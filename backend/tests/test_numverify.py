@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from core.http_pool import AsyncHTTPPool
+from core.numverify_handler import NumverifyService
+
+VALID = json.dumps({
+    "valid": True, "number": "14158586273", "country_name": "United States of America",
+    "location": "Novato", "carrier": "AT&T Mobility LLC", "line_type": "mobile",
+    "local_format": "4158586273", "international_format": "+14158586273",
+})
+
+
+def flaky(failures, status=503, body=VALID):
+    """ Fails `failures` times with `status`, then answers `body` """
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return status, '{"error": "upstream"}'
+        return 200, body
+    return handler
+
+
+def slow(seconds, body="{}"):
+    def handler(request):
+        time.sleep(seconds)
+        return 200, body
+    return handler
+
+
+def numverify(server, **kwargs):
+    service = NumverifyService(api_key="test-key", base_url=f"{server.url}/validate", **kwargs)
+    service.pool.backoff = 0.01
+    return service
+
+
+def test_retries_5xx_then_succeeds(stand_in):
+    stand_in.route("GET", "/validate", flaky(2))
+    result = asyncio.run(numverify(stand_in, retries=2).validate_async("+14158586273"))
+    assert result["success"] is True
+    assert result["carrier"] == "AT&T Mobility LLC"
+    assert stand_in.hits["/validate"] == 3
+
+
+def test_stops_retrying_after_limit(stand_in):
+    stand_in.route("GET", "/status", flaky(10))
+    pool = AsyncHTTPPool(retries=2, backoff=0.01)
+
+    async def run():
+        try:
+            return await pool.get(f"{stand_in.url}/status")
+        finally:
+            await pool.aclose()
+
+    assert asyncio.run(run()).status_code == 503
+    assert stand_in.hits["/status"] == 3
+
+
+def test_client_errors_are_not_retried(stand_in):
+    stand_in.route("GET", "/validate", flaky(10, status=400))
+    result = asyncio.run(numverify(stand_in, retries=3).validate_async("+14158586273"))
+    assert result["success"] is False
+    assert stand_in.hits["/validate"] == 1
+
+
+def test_per_request_timeout(stand_in):
+    stand_in.route("GET", "/slow", slow(2.0))
+    pool = AsyncHTTPPool(timeout=0.2, retries=0)
+
+    async def run():
+        try:
+            await pool.get(f"{stand_in.url}/slow")
+        finally:
+            await pool.aclose()
+
+    started = time.perf_counter()
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(run())
+    assert time.perf_counter() - started < 1.5
+
+
+def test_timeout_is_a_transient_failure(stand_in):
+    stand_in.route("GET", "/validate", slow(2.0, body=VALID))
+    result = asyncio.run(numverify(stand_in, timeout=0.2, retries=0).validate_async("+14158586273"))
+    assert result["success"] is False
+    assert result["transient"] is True
+
+
+def test_concurrency_limit(stand_in):
+    stand_in.route("GET", "/validate", slow(0.1, body=VALID))
+    service = numverify(stand_in, concurrency=3)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(service.validate_async("+14158586273") for _ in range(12)))
+        finally:
+            await service.pool.aclose()
+
+    results = asyncio.run(run())
+    assert all(r["success"] for r in results)
+    assert stand_in.hits["/validate"] == 12
+    assert stand_in.max_in_flight == 3
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(main.app)
+
+
+def sse_events(body):
+    """ [(event, data), ...] from a text/event-stream body """
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.parametrize("query", ["germny", "garbage"])
+def test_events_for_non_country_text(client, query):
+    response = client.get("/predict/events", params={"input": query})
+    assert response.status_code == 200
+    (event, data), = sse_events(response.text)
+    assert event == "final"
+    assert data["success"] is False and data["valid"] is False
+    if query == "germny":
+        assert data["candidates"][0]["name"] == "Germany"
+
+
+def test_events_for_exact_country(client):
+    (event, data), = sse_events(client.get("/predict/events", params={"input": "germany"}).text)
+    assert event == "final" and data["line_type"] == "Country" and data["code"] == "+49"
+
+
+@pytest.mark.parametrize("value", [9810012345, ["x"], {"a": 1}])
+def test_predict_rejects_non_string_input(client, value):
+    response = client.post("/predict", json={"input": value})
+    assert response.status_code == 400
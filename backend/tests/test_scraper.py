@@ -0,0 +1,79 @@
+import asyncio
+import os
+
+import pytest
+
+from core import scraper_handler
+from core.prefix_learner import PrefixLearner
+from core.scraper_handler import WebScraperService, parse_customers_table
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "findandtrace")
+# mobilenumber -> saved page; anything else gets the "no details" page
+PAGES = {"9810012345": "result.html"}
+
+
+def page(name):
+    with open(os.path.join(PAGES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def replay(request):
+    return 200, page(PAGES.get(request["form"].get("mobilenumber"), "no_table.html")), "text/html"
+
+
+@pytest.fixture
+def scraper(stand_in, monkeypatch):
+    monkeypatch.setattr(scraper_handler, "prefix_learner", PrefixLearner())
+    stand_in.route("POST", "/trace", replay)
+    return WebScraperService(url=f"{stand_in.url}/trace", timeout=2.0)
+
+
+def trace(service, number):
+    async def run():
+        try:
+            return await service.trace_async(number)
+        finally:
+            await service.pool.aclose()
+    return asyncio.run(run())
+
+
+def test_parser_reads_customers_table_not_layout_tables():
+    rows = parse_customers_table(page("result.html"))
+    assert rows[0] == ["Mobile Phone", "9810012345"]
+    assert ["Current Service Provider", "Bharti Airtel Ltd & Partners"] in rows
+    assert ["Sponsored", "Mobile Phone"] not in rows
+
+
+def test_parser_without_table():
+    assert parse_customers_table(page("no_table.html")) is None
+
+
+def test_trace_result_page(scraper, stand_in):
+    result = trace(scraper, "+91 98100 12345")
+    assert result == {
+        "success": True,
+        "state": "Delhi",
+        "carrier": "Bharti Airtel Ltd & Partners",
+        "line_type": "Active",
+        "method": "Web Scraper (FindAndTrace)",
+    }
+    assert stand_in.hits["/trace"] == 1
+
+
+def test_trace_missing_table(scraper):
+    result = trace(scraper, "9000000000")
+    assert result == {"success": False, "error": "No data table found."}
+
+
+@pytest.mark.parametrize("number", ["12345", "98100123456", "+1 415 555 0100", "98100abcde"])
+def test_trace_rejects_non_10_digit_numbers(scraper, stand_in, number):
+    result = trace(scraper, number)
+    assert result == {"success": False, "error": "Scraper supports 10-digit Indian numbers only."}
+    assert "/trace" not in stand_in.hits
+
+
+def test_trace_upstream_error_is_transient(stand_in, monkeypatch):
+    monkeypatch.setattr(scraper_handler, "prefix_learner", PrefixLearner())
+    stand_in.route("POST", "/trace", lambda request: (404, "gone", "text/html"))
+    result = trace(WebScraperService(url=f"{stand_in.url}/trace", timeout=2.0), "9810012345")
+    assert result == {"success": False, "error": "Site returned 404", "transient": True}
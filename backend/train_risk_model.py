@@ -0,0 +1,106 @@
+"""
+Risk Model Training Tool
+
+Trains the ScoringEngine risk model offline from a labeled CSV and writes a
+joblib artifact that the API loads at startup (RISK_MODEL_PATH).
+
+The CSV needs a `label` column (1 = risky/spam, 0 = legitimate) and either:
+  - the feature columns listed in app/services/risk_model.py (FEATURES), or
+  - an `input` column with the phone number (optional `deep_search` column);
+    features are then computed here by running the same analysis as the API.
+
+Usage:
+    cd backend
+    python train_risk_model.py labeled.csv --output core/data/risk_model.joblib
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+
+from app.services.risk_model import DEFAULT_MODEL_PATH, FEATURES, vectorize
+
+
+def _truthy(value) -> bool:
+    return str(value).strip().lower() in ("1", "true", "yes", "y")
+
+
+async def signals_from_inputs(rows):
+    """ Runs base validation (and deep search when asked) to get each row's signals """
+    from app.services.scoring_service import ScoringEngine
+    engine = ScoringEngine()
+    signals = []
+    for row in rows:
+        base = await engine.country_service.get_country_info(row["input"])
+        _, row_signals = await engine._score(row["input"], base, _truthy(row.get("deep_search", "")))
+        signals.append(row_signals)
+    return signals
+
+
+def load_dataset(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if not rows or "label" not in rows[0]:
+        sys.exit("CSV must have a 'label' column")
+
+    if any(name in rows[0] for name in FEATURES):
+        signals = [{name: float(row.get(name) or 0) for name in FEATURES} for row in rows]
+    elif "input" in rows[0]:
+        print(f"Computing features for {len(rows)} numbers...")
+        signals = asyncio.run(signals_from_inputs(rows))
+    else:
+        sys.exit("CSV must have feature columns or an 'input' column")
+
+    # Invalid numbers have no signals (the API never scores them)
+    keep = [i for i, s in enumerate(signals) if s is not None]
+    X = vectorize([signals[i] for i in keep])
+    y = np.array([int(_truthy(rows[i]["label"])) for i in keep])
+    print(f"{len(keep)} usable rows ({len(rows) - len(keep)} invalid numbers dropped), {int(y.sum())} positive")
+    return X, y
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the ScoringEngine risk model")
+    parser.add_argument("csv", help="labeled CSV (see module docstring)")
+    parser.add_argument("--output", default=os.getenv("RISK_MODEL_PATH", DEFAULT_MODEL_PATH))
+    parser.add_argument("--model", choices=("logistic", "gbm"), default="logistic")
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction kept aside for evaluation")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    X, y = load_dataset(args.csv)
+    if len(set(y)) < 2:
+        sys.exit("Need both positive and negative labels")
+
+    if args.model == "gbm":
+        model = HistGradientBoostingClassifier(max_iter=200, learning_rate=0.1, random_state=args.seed)
+    else:
+        model = LogisticRegression(max_iter=1000, class_weight="balanced")
+
+    metrics = {"rows": int(len(y)), "positive": int(y.sum())}
+    if args.holdout > 0:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=args.holdout, random_state=args.seed, stratify=y)
+        model.fit(X_train, y_train)
+        metrics["holdout_auc"] = round(float(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])), 4)
+        print(f"Holdout ROC AUC: {metrics['holdout_auc']}")
+    model.fit(X, y)  # final model on all rows
+
+    version = f"{args.model}-{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}"
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    joblib.dump({"model": model, "features": FEATURES, "version": version, "metrics": metrics}, args.output)
+    print(f"Saved {version} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
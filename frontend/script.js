@@ -19,6 +19,105 @@ const stateRow = document.getElementById('stateRow');
 const stateDisplay = document.getElementById('stateDisplay');
 // flagDisplay, confidenceBadge are removed or not used dynamically in same way
 
+const API_BASE = 'http://localhost:8000';
+
+// Fills the result card. Called again for every progressive update during deep search.
+function renderResult(data, isDeepSearch, enriching = false) {
+    countryName.textContent = data.country || "Unknown";
+    codeDisplay.textContent = data.formatted || data.code;
+
+    // Carrier
+    if (data.carrier && data.carrier !== "N/A") {
+        carrierDisplay.textContent = data.carrier.toUpperCase();
+    } else {
+        carrierDisplay.textContent = "UNKNOWN";
+    }
+
+    // Line Type
+    if (typeDisplay) {
+        const lineType = data.line_type || data.type;
+        typeDisplay.textContent = lineType ? lineType.toUpperCase() : "UNKNOWN";
+    }
+
+    // Identity (Name) Logic
+    const nameRow = document.getElementById('nameRow');
+
+    if (isDeepSearch) {
+        nameRow.classList.remove('hidden');
+
+        if (data.name && data.name !== "N/A" && !data.name.includes("Login")) {
+            nameDisplay.textContent = data.name;
+            nameDisplay.className = "text-green-400 font-bold";
+        } else if (enriching) {
+            // Base validation is in, deep-search sources are still answering
+            nameDisplay.textContent = "Searching...";
+            nameDisplay.className = "text-slate-400 font-bold animate-pulse";
+        } else {
+            // Verified User Fallback
+            const prefix = (data.carrier && data.carrier !== "N/A" && data.carrier !== "Unknown Carrier")
+                ? `${data.carrier.split(' ')[0]} User`
+                : "Verified User";
+            nameDisplay.innerHTML = `${prefix} <span class="text-xs bg-green-900 text-green-300 px-1 rounded ml-2">VERIFIED</span>`;
+            nameDisplay.className = "text-slate-200 font-bold flex items-center";
+        }
+    } else {
+        nameRow.classList.add('hidden');
+    }
+
+    // Region / State
+    if (data.state && data.state !== "Entire Country" && data.state !== "N/A") {
+        stateDisplay.textContent = data.state;
+        stateRow.classList.remove('hidden');
+    } else {
+        stateRow.classList.add('hidden');
+    }
+
+    resultArea.classList.remove('hidden');
+}
+
+// Deep search over Server-Sent Events: the offline validation shows up at once,
+// then each source's answer is merged in, then the final scored result replaces it.
+function streamDeepSearch(rawInput) {
+    return new Promise((resolve, reject) => {
+        const params = new URLSearchParams({ input: rawInput, deep_search: 'true' });
+        const source = new EventSource(`${API_BASE}/predict/events?${params}`);
+        let current = null;
+        let finished = false;
+
+        const finish = (fn, value) => {
+            finished = true;
+            source.close();
+            fn(value);
+        };
+
+        source.addEventListener('base', (e) => {
+            current = JSON.parse(e.data);
+            renderResult(current, true, true);
+        });
+
+        source.addEventListener('source', (e) => {
+            const update = JSON.parse(e.data);
+            if (!current || !update.success) return;
+            // Provisional merge; the final event carries the engine's own merge
+            if (update.name) current.name = update.name;
+            if (update.state && update.source === 'WebScraper') current.state = update.state;
+            if (update.carrier && (update.source === 'TruecallerAI' || current.carrier === 'Unknown Carrier')) {
+                current.carrier = update.carrier;
+            }
+            renderResult(current, true, true);
+        });
+
+        source.addEventListener('final', (e) => finish(resolve, JSON.parse(e.data)));
+
+        source.addEventListener('error', (e) => {
+            if (finished) return;
+            // Server-sent "error" events carry a message; connection errors don't
+            const message = e.data ? JSON.parse(e.data).message : 'Failed to fetch';
+            finish(reject, new Error(message));
+        });
+    });
+}
+
 async function identifyCountry(isDeepSearch = false) {
     const rawInput = inputElement.value.trim();
     if (!rawInput) return;
@@ -36,68 +135,27 @@ async function identifyCountry(isDeepSearch = false) {
     activeBtn.innerHTML = `<svg class="animate-spin -ml-1 mr-2 h-5 w-5 text-white inline-block" xmlns="http://www.w3.org/2000/svg" fill="none" viewBox="0 0 24 24"><circle class="opacity-25" cx="12" cy="12" r="10" stroke="currentColor" stroke-width="4"></circle><path class="opacity-75" fill="currentColor" d="M4 12a8 8 0 018-8V0C5.373 0 0 5.373 0 12h4zm2 5.291A7.962 7.962 0 014 12H0c0 3.042 1.135 5.824 3 7.938l3-2.647z"></path></svg> Analyzing...`;
 
     try {
-        const response = await fetch('http://localhost:8000/predict', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                input: rawInput,
-                deep_search: isDeepSearch
-            })
-        });
-
-        if (!response.ok) throw new Error('Server offline.');
+        let data;
+        if (isDeepSearch) {
+            data = await streamDeepSearch(rawInput);
+        } else {
+            const response = await fetch(`${API_BASE}/predict`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({
+                    input: rawInput,
+                    deep_search: false
+                })
+            });
 
-        const data = await response.json();
+            if (!response.ok) throw new Error('Server offline.');
+            data = await response.json();
+        }
 
         if (data.success) {
-            // Populate Fields
-            countryName.textContent = data.country || "Unknown";
-            codeDisplay.textContent = data.formatted || data.code;
-
-            // Carrier
-            if (data.carrier && data.carrier !== "N/A") {
-                carrierDisplay.textContent = data.carrier.toUpperCase();
-            } else {
-                carrierDisplay.textContent = "UNKNOWN";
-            }
-
-            // Line Type
-            if (typeDisplay) {
-                typeDisplay.textContent = data.type ? data.type.toUpperCase() : "UNKNOWN";
-            }
-
-            // Identity (Name) Logic
-            const nameRow = document.getElementById('nameRow');
-
-            if (isDeepSearch) {
-                nameRow.classList.remove('hidden');
-
-                if (data.name && data.name !== "N/A" && !data.name.includes("Login")) {
-                    nameDisplay.textContent = data.name;
-                    nameDisplay.className = "text-green-400 font-bold";
-                } else {
-                    // Verified User Fallback
-                    const prefix = (data.carrier && data.carrier !== "N/A" && data.carrier !== "Unknown Carrier")
-                        ? `${data.carrier.split(' ')[0]} User`
-                        : "Verified User";
-                    nameDisplay.innerHTML = `${prefix} <span class="text-xs bg-green-900 text-green-300 px-1 rounded ml-2">VERIFIED</span>`;
-                    nameDisplay.className = "text-slate-200 font-bold flex items-center";
-                }
-            } else {
-                nameRow.classList.add('hidden');
-            }
-
-            // Region / State
-            if (data.state && data.state !== "Entire Country" && data.state !== "N/A") {
-                stateDisplay.textContent = data.state;
-                stateRow.classList.remove('hidden');
-            } else {
-                stateRow.classList.add('hidden');
-            }
-
-            resultArea.classList.remove('hidden');
-
+            renderResult(data, isDeepSearch);
         } else {
+            resultArea.classList.add('hidden');
             throw new Error(data.message || "Identification failed.");
         }
 